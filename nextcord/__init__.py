@@ -29,6 +29,7 @@ from .asset import *
 from .audit_logs import *
 from .auto_moderation import *
 from .bans import *
+from .cache import *
 from .channel import *
 from .client import *
 from .colour import *
@@ -37,6 +38,7 @@ from .embeds import *
 from .emoji import *
 from .enums import *
 from .errors import *
+from .event_pool import *
 from .file import *
 from .flags import *
 from .guild import *
@@ -56,6 +58,7 @@ from .reaction import *
 from .role import *
 from .role_connections import *
 from .scheduled_events import *
+from .session import *
 from .shard import *
 from .stage_instance import *
 from .sticker import *
@@ -0,0 +1,386 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import itertools
+import time
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    MutableMapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+__all__ = (
+    "CacheBackend",
+    "DictBackend",
+    "LRUBackend",
+    "TTLBackend",
+)
+
+V = TypeVar("V")
+
+EvictCallback = Callable[[int, Any], None]
+
+_MISSING: Any = object()
+
+
+class CacheBackend:
+    """Creates the caches the library keeps one kind of entity in, such as users or
+    the channels of a guild. Used with the ``cache_backends`` parameter of :class:`Client`.
+
+    A cache is a :class:`~collections.abc.MutableMapping` of IDs to entities, the library
+    gets, sets, deletes, iterates and counts entities through it. Subclass this and
+    override :meth:`create` to keep entities in another mapping.
+
+    A cache of users that evicts users should also have ``pin(id)`` and ``unpin(id)``
+    methods. The library pins a user once for every cached member of the user, and
+    pinned users must not be evicted, so that a cached member and :meth:`Client.get_user`
+    keep returning the same :class:`User`. A ``stats()`` method returning a :class:`dict`
+    is included in :meth:`Client.cache_stats`.
+
+    .. versionadded:: 3.0
+    """
+
+    def create(self, on_evict: Optional[EvictCallback] = None) -> MutableMapping[int, Any]:
+        """Returns a new, empty cache.
+
+        Parameters
+        ----------
+        on_evict: Optional[Callable[[:class:`int`, Any], None]]
+            Called with the ID and the entity whenever the cache drops an entity on its
+            own, rather than because it was deleted, so that the library can remove the
+            entity from its other lookups.
+        """
+        raise NotImplementedError
+
+
+class DictBackend(CacheBackend):
+    """A :class:`CacheBackend` that keeps every entity in a :class:`dict` until it is
+    deleted. This is the default for every kind of entity except private channels.
+
+    .. versionadded:: 3.0
+    """
+
+    def __repr__(self) -> str:
+        return "<DictBackend>"
+
+    def create(self, on_evict: Optional[EvictCallback] = None) -> MutableMapping[int, Any]:
+        return {}
+
+
+class LRUBackend(CacheBackend):
+    """A :class:`CacheBackend` that keeps at most ``maxsize`` entities in each cache,
+    evicting the least recently used one when it is full.
+
+    Looking an entity up marks it as used, iterating over the cache does not. Users that
+    are members of a cached guild are kept regardless, and do not count towards ``maxsize``.
+
+    .. versionadded:: 3.0
+
+    Parameters
+    ----------
+    maxsize: :class:`int`
+        How many entities each cache holds.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be greater than 0")
+        self.maxsize: int = maxsize
+
+    def __repr__(self) -> str:
+        return f"<LRUBackend maxsize={self.maxsize}>"
+
+    def create(self, on_evict: Optional[EvictCallback] = None) -> MutableMapping[int, Any]:
+        return LRUCache(self.maxsize, on_evict)
+
+
+class TTLBackend(CacheBackend):
+    """A :class:`CacheBackend` that evicts entities ``ttl`` seconds after they were
+    last stored, whether or not they were looked up since. Users that are members of
+    a cached guild are kept regardless, and do not count towards ``maxsize``.
+
+    .. versionadded:: 3.0
+
+    Parameters
+    ----------
+    ttl: :class:`float`
+        How long, in seconds, an entity is kept after it was stored.
+    maxsize: Optional[:class:`int`]
+        How many entities each cache holds, the ones stored longest ago are evicted
+        first. Defaults to ``None``, which does not limit the size.
+    """
+
+    def __init__(self, ttl: float, *, maxsize: Optional[int] = None) -> None:
+        if ttl <= 0:
+            raise ValueError("ttl must be greater than 0")
+        if maxsize is not None and maxsize <= 0:
+            raise ValueError("maxsize must be greater than 0")
+        self.ttl: float = ttl
+        self.maxsize: Optional[int] = maxsize
+
+    def __repr__(self) -> str:
+        return f"<TTLBackend ttl={self.ttl} maxsize={self.maxsize}>"
+
+    def create(self, on_evict: Optional[EvictCallback] = None) -> MutableMapping[int, Any]:
+        return TTLCache(self.ttl, self.maxsize, on_evict)
+
+
+class _BoundedCache(MutableMapping[int, V]):
+    # The pinned entities, such as the users of cached members, are moved out of the
+    # eviction order of the cache until they are no longer pinned, and do not count
+    # towards maxsize.
+
+    __slots__ = ("maxsize", "_on_evict", "_pinned", "_pins", "hits", "misses", "evictions")
+
+    def __init__(self, maxsize: Optional[int], on_evict: Optional[EvictCallback]) -> None:
+        self.maxsize: Optional[int] = maxsize
+        self._on_evict: Optional[EvictCallback] = on_evict
+        self._pinned: Dict[int, V] = {}
+        # ID: how many times it is pinned, whether or not it is cached
+        self._pins: Dict[int, int] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} maxsize={self.maxsize} len={len(self)}>"
+
+    def _take(self, key: int) -> Any:
+        # removes an entity from the eviction order, or returns _MISSING
+        raise NotImplementedError
+
+    def _evicted(self, key: int, value: V) -> None:
+        self.evictions += 1
+        if self._on_evict is not None:
+            self._on_evict(key, value)
+
+    def __getitem__(self, key: int) -> V:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __delitem__(self, key: int) -> None:
+        self.pop(key)
+
+    def pin(self, key: int) -> None:
+        """Keeps the entity with this ID, or the one stored with it later, until it is unpinned
+        as many times as it was pinned.
+        """
+        count = self._pins.get(key, 0)
+        self._pins[key] = count + 1
+        if not count:
+            value = self._take(key)
+            if value is not _MISSING:
+                self._pinned[key] = value
+
+    def unpin(self, key: int) -> None:
+        count = self._pins.get(key)
+        if count is None:
+            return
+        if count > 1:
+            self._pins[key] = count - 1
+            return
+
+        del self._pins[key]
+        value = self._pinned.pop(key, _MISSING)
+        if value is not _MISSING:
+            self[key] = value
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of cached and pinned entities, the size limit, and how many
+        lookups hit or missed and how many entities were evicted since the cache was created.
+        """
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "pinned": len(self._pinned),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class LRUCache(_BoundedCache[V]):
+    """The cache of an :class:`LRUBackend`, entities are kept least recently used first."""
+
+    __slots__ = ("_data",)
+
+    if TYPE_CHECKING:
+        maxsize: int
+
+    def __init__(self, maxsize: int, on_evict: Optional[EvictCallback] = None) -> None:
+        super().__init__(maxsize, on_evict)
+        self._data: OrderedDict[int, V] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data) + len(self._pinned)
+
+    def __iter__(self) -> Iterator[int]:
+        return itertools.chain(self._data, self._pinned)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data or key in self._pinned
+
+    def get(self, key: int, default: Any = None) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            value = self._pinned.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+        else:
+            self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key: int, value: V) -> None:
+        if key in self._pins:
+            self._pinned[key] = value
+            return
+
+        data = self._data
+        data[key] = value
+        data.move_to_end(key)
+        if len(data) > self.maxsize:
+            self._evicted(*data.popitem(last=False))
+
+    def pop(self, key: int, default: Any = _MISSING) -> Any:
+        value = self._data.pop(key, _MISSING)
+        if value is _MISSING:
+            value = self._pinned.pop(key, _MISSING)
+            if value is _MISSING:
+                if default is _MISSING:
+                    raise KeyError(key)
+                return default
+        return value
+
+    def _take(self, key: int) -> Any:
+        return self._data.pop(key, _MISSING)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._pinned.clear()
+
+    # neither marks entities as used nor looks every one of them up again
+    def values(self) -> Iterator[V]:  # type: ignore
+        return itertools.chain(self._data.values(), self._pinned.values())
+
+    def items(self) -> Iterator[Tuple[int, V]]:  # type: ignore
+        return itertools.chain(self._data.items(), self._pinned.items())
+
+
+class TTLCache(_BoundedCache[V]):
+    """The cache of a :class:`TTLBackend`, entities are kept in the order they were
+    stored in, along with when they expire.
+
+    Expired entities are evicted when they are looked up, and from the front of the
+    cache whenever it is changed, counted or iterated over.
+    """
+
+    __slots__ = ("ttl", "_data")
+
+    def __init__(
+        self, ttl: float, maxsize: Optional[int] = None, on_evict: Optional[EvictCallback] = None
+    ) -> None:
+        super().__init__(maxsize, on_evict)
+        self.ttl: float = ttl
+        # ID: (monotonic deadline, entity)
+        self._data: OrderedDict[int, Tuple[float, V]] = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f"<TTLCache ttl={self.ttl} maxsize={self.maxsize} len={len(self)}>"
+
+    def _evict(self, key: int) -> None:
+        self._evicted(key, self._data.pop(key)[1])
+
+    def _expire(self) -> None:
+        # every entity has the same ttl, so the first ones expire first
+        data = self._data
+        now = time.monotonic()
+        while data:
+            key = next(iter(data))
+            if data[key][0] > now:
+                break
+            self._evict(key)
+
+    def __len__(self) -> int:
+        self._expire()
+        return len(self._data) + len(self._pinned)
+
+    def __iter__(self) -> Iterator[int]:
+        self._expire()
+        return itertools.chain(self._data, self._pinned)
+
+    def __contains__(self, key: Any) -> bool:
+        entry = self._data.get(key)
+        if entry is None:
+            return key in self._pinned
+        return entry[0] > time.monotonic()
+
+    def get(self, key: int, default: Any = None) -> Any:
+        try:
+            deadline, value = self._data[key]
+        except KeyError:
+            value = self._pinned.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+        else:
+            if deadline <= time.monotonic():
+                self._evict(key)
+                self.misses += 1
+                return default
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key: int, value: V) -> None:
+        if key in self._pins:
+            self._pinned[key] = value
+            return
+
+        self._expire()
+        data = self._data
+        data[key] = (time.monotonic() + self.ttl, value)
+        data.move_to_end(key)
+        if self.maxsize is not None and len(data) > self.maxsize:
+            self._evict(next(iter(data)))
+
+    def pop(self, key: int, default: Any = _MISSING) -> Any:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            return entry[1]
+
+        value = self._pinned.pop(key, _MISSING)
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        return value
+
+    def _take(self, key: int) -> Any:
+        entry = self._data.pop(key, None)
+        return _MISSING if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._pinned.clear()
+
+    def values(self) -> Iterator[V]:  # type: ignore
+        self._expire()
+        return itertools.chain((value for _, value in self._data.values()), self._pinned.values())
+
+    def items(self) -> Iterator[Tuple[int, V]]:  # type: ignore
+        self._expire()
+        return itertools.chain(
+            ((key, value) for key, (_, value) in self._data.items()), self._pinned.items()
+        )
@@ -9,6 +9,7 @@ import signal
 import sys
 import traceback
 import warnings
+from functools import partial
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -31,7 +32,7 @@ from typing import (
 
 import aiohttp
 
-from . import utils
+from . import snapshot, utils
 from .activity import ActivityTypes, BaseActivity, create_activity
 from .appinfo import AppInfo
 from .application_command import message_command, slash_command, user_command
@@ -41,13 +42,16 @@ from .emoji import Emoji
 from .enums import (
     ApplicationCommandType,
     ChannelType,
+    ComponentType,
     InteractionType,
     Status,
     VoiceRegion,
 )
 from .errors import *
+from .event_pool import EventPool
 from .flags import ApplicationFlags, Intents
 from .gateway import *
+from .gateway import _check_transport_compression
 from .guild import Guild
 from .guild_preview import GuildPreview
 from .http import HTTPClient
@@ -55,7 +59,9 @@ from .interactions import Interaction
 from .invite import Invite
 from .iterators import GuildIterator
 from .mentions import AllowedMentions
+from .message import Message
 from .object import Object
+from .session import GatewaySession, SessionStore
 from .stage_instance import StageInstance
 from .state import ConnectionState
 from .sticker import GuildSticker, StandardSticker, StickerPack, _sticker_factory
@@ -76,12 +82,13 @@ if TYPE_CHECKING:
     from .abc import GuildChannel, PrivateChannel, Snowflake, SnowflakeTime
     from .application_command import BaseApplicationCommand, ClientCog, SlashApplicationSubcommand
     from .asset import Asset
+    from .cache import CacheBackend
     from .channel import DMChannel
     from .enums import Locale
     from .file import File
     from .flags import MemberCacheFlags
     from .member import Member
-    from .message import Attachment, Message
+    from .message import Attachment
     from .permissions import Permissions
     from .scheduled_events import ScheduledEvent
     from .types.interactions import ApplicationCommand as ApplicationCommandPayload
@@ -91,6 +98,74 @@ __all__ = ("Client",)
 
 Coro = TypeVar("Coro", bound=Callable[..., Coroutine[Any, Any, Any]])
 InterT = TypeVar("InterT", bound="Interaction")
+# an event handler and the name of the method it is dispatched as
+EventHandler = Tuple[Callable[..., Coroutine[Any, Any, Any]], str]
+
+# Python 3.12+, runs a task's first step immediately instead of scheduling it
+_eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+
+Waiter = Tuple[asyncio.Future, Callable[..., bool]]
+# the keys that Client.wait_for can index its waiters by
+_WAIT_FOR_KEYS = ("channel_id", "author_id", "message_id", "custom_id")
+
+
+def _wait_for_key(kind: str, args: Tuple[Any, ...]) -> Any:
+    # Resolves a wait_for key from the arguments of an event. Events pass a message,
+    # interaction, reaction, channel or raw event payload first, the key is None otherwise.
+    if not args:
+        return None
+
+    obj = args[0]
+    if kind == "custom_id":
+        data = getattr(obj, "data", None)
+        return data.get("custom_id") if isinstance(data, dict) else None
+
+    if kind == "message_id":
+        if isinstance(obj, Message):
+            return obj.id
+
+        message_id = getattr(obj, "message_id", None)
+        if message_id is not None:
+            return message_id
+
+        return getattr(getattr(obj, "message", None), "id", None)
+
+    if kind == "guild_id":
+        if isinstance(obj, Guild):
+            return obj.id
+
+        guild_id = getattr(obj, "guild_id", None)
+        if guild_id is not None:
+            return guild_id
+
+        guild = getattr(obj, "guild", None)
+        if guild is None:
+            guild = getattr(getattr(obj, "message", None), "guild", None)
+        return getattr(guild, "id", None)
+
+    if kind == "channel_id":
+        if isinstance(getattr(obj, "type", None), ChannelType):
+            return obj.id
+
+        channel_id = getattr(obj, "channel_id", None)
+        if channel_id is not None:
+            return channel_id
+
+        channel = getattr(obj, "channel", None)
+        if channel is None:
+            channel = getattr(getattr(obj, "message", None), "channel", None)
+        return getattr(channel, "id", None)
+
+    # author_id
+    user_id = getattr(obj, "user_id", None)
+    if user_id is not None:
+        return user_id
+
+    user = getattr(obj, "author", None) or getattr(obj, "user", None)
+    if user is None and len(args) > 1:
+        # reaction and typing events pass the user second
+        user = args[1]
+    return getattr(user, "id", None)
 
 
 _log = logging.getLogger(__name__)
@@ -206,6 +281,13 @@ class Client:
         sync your system clock to Google's NTP server.
 
         .. versionadded:: 1.3
+    max_global_requests: :class:`int`
+        The maximum number of HTTP requests per second to send before proactively
+        waiting, rather than running into Discord's global rate limit. Interaction
+        responses and webhook requests do not count towards this limit. Defaults to ``50``,
+        which should only be raised if Discord has granted your bot a higher global limit.
+
+        .. versionadded:: 3.0
     enable_debug_events: :class:`bool`
         Whether to enable events that are useful only for debugging gateway related information.
 
@@ -214,6 +296,111 @@ class Client:
         To enable these events, this must be set to ``True``. Defaults to ``False``.
 
         .. versionadded:: 2.0
+    loop_heartbeats: :class:`bool`
+        Whether to send gateway and voice heartbeats from a single scheduler
+        running on the event loop, instead of starting a thread per websocket. This is
+        recommended for processes running many shards or voice connections. While the event
+        loop is blocked, a single watchdog thread logs a warning with the stack of the loop
+        every 10 seconds, and the delay of every heartbeat is exposed through
+        :attr:`heartbeat_jitter`. Defaults to ``False``.
+
+        .. versionadded:: 3.0
+    gateway_compression: Optional[:class:`str`]
+        The transport compression used for the gateway connection. Can be ``"zlib-stream"``,
+        the default, ``"zstd-stream"``, which decompresses faster and requires the
+        `zstandard <https://pypi.org/project/zstandard/>`_ library, or ``None`` to disable
+        compression.
+
+        .. versionadded:: 3.0
+    gateway_encoding: :class:`str`
+        The encoding of gateway payloads, either ``"json"``, the default, or ``"etf"``
+        (Erlang term format). ETF payloads are somewhat smaller once compressed, but are
+        decoded in pure Python, which is considerably slower than JSON with ``orjson``.
+        Snowflakes in raw ETF payloads, such as those passed to
+        :func:`on_socket_raw_receive`, are :class:`int` rather than :class:`str`.
+
+        .. versionadded:: 3.0
+
+    allowed_events: Optional[Iterable[:class:`str`]]
+        The gateway events, such as ``"MESSAGE_CREATE"``, that the client should process.
+        Any other dispatch is dropped by the websocket before it is decoded, so no
+        events, models or cache updates are produced for it, including
+        :func:`on_socket_event_type`. Events required to keep the connection and
+        cache consistent (such as ``READY``, ``GUILD_CREATE`` and voice events) are always
+        processed. Cannot be combined with ``ignored_events``. Defaults to ``None``,
+        which processes every event.
+
+        .. versionadded:: 3.0
+    ignored_events: Optional[Iterable[:class:`str`]]
+        The gateway events, such as ``"PRESENCE_UPDATE"`` or ``"TYPING_START"``, that the
+        client should drop before decoding them. This behaves like ``allowed_events``, but
+        as a deny list. Cannot be combined with ``allowed_events``.
+
+        .. versionadded:: 3.0
+    inline_dispatch: :class:`bool`
+        Whether to run all the handlers of an event in a single task, one after another,
+        instead of creating a task for every handler. On Python 3.12 and later the task
+        starts running immediately, so handlers that complete without awaiting anything
+        never reach the event loop. This suits many lightweight handlers, but a slow handler
+        delays the others for the same event. Handlers of gateway events still only start
+        once the cache has been updated for the event. Defaults to ``False``.
+
+        .. versionadded:: 3.0
+    event_pool: Optional[:class:`EventPool`]
+        Runs event handlers on a bounded pool of workers, with optional concurrency limits,
+        ordering and a policy for when it is overloaded, instead of creating a task for every
+        handler. Takes precedence over ``inline_dispatch``. Defaults to ``None``.
+
+        .. versionadded:: 3.0
+    parse_slice_budget: Optional[:class:`float`]
+        When set, large ``READY``, ``GUILD_CREATE`` and ``GUILD_MEMBERS_CHUNK`` payloads are
+        parsed in slices of at most about this many seconds, yielding to the event loop in
+        between, so that the members of a very large guild do not block other shards, heartbeats
+        and interactions. The shard does not process its next event until the payload is parsed,
+        so events stay in order and :func:`on_guild_available` is only dispatched once the guild
+        is complete. Defaults to ``None``, which parses every payload at once. ``0.005`` is a
+        reasonable value.
+
+        .. versionadded:: 3.0
+    chunk_guilds_lazily: :class:`bool`
+        Whether to chunk each guild the first time a message or interaction is received
+        from it, instead of at startup or when the guild is joined. This makes :func:`on_ready`
+        fast for bots in many large guilds, at the cost of incomplete member caches for
+        inactive guilds. Takes precedence over ``chunk_guilds_at_startup`` and requires
+        :attr:`Intents.members`. Defaults to ``False``.
+
+        Chunking progress is reported through :func:`on_chunk_progress`.
+
+        .. versionadded:: 3.0
+    session_store: Optional[:class:`SessionStore`]
+        Saves the gateway session periodically and when the client is closed, so that
+        the next process can resume it instead of identifying again, which would replay
+        ``READY`` and every ``GUILD_CREATE``. Sessions are only resumed once the caches
+        were restored from a previous process, as the replayed events need state to apply
+        to, and the client is closed without ending the session. Defaults to ``None``.
+
+        .. versionadded:: 3.0
+    cache_snapshot: Optional[:class:`str`]
+        A file to restore the cached guilds, members, users, channels, threads, roles,
+        emojis, stickers and voice states from when the client connects, and to save them
+        to when it is closed, see :meth:`save_cache_snapshot`. Restored guilds can be
+        looked up before the gateway sends them again, and with a ``session_store`` the
+        sessions saved with the snapshot are resumed. The snapshot is then also saved with
+        the sessions every ``interval`` seconds of the store, so that the sessions can
+        be resumed after a crash. Defaults to ``None``.
+
+        .. versionadded:: 3.0
+    cache_backends: Optional[Dict[:class:`str`, :class:`CacheBackend`]]
+        The backends to keep kinds of entities in, instead of the defaults, keyed by
+        ``"users"``, ``"guilds"``, ``"emojis"``, ``"stickers"``, ``"private_channels"``,
+        ``"members"``, ``"channels"`` or ``"threads"``. The last three are the caches of
+        each guild. By default every kind is kept in a :class:`DictBackend`, except private
+        channels, which are kept in an :class:`LRUBackend` of 128. Entities that a bounded
+        backend evicted are no longer returned by lookups such as :meth:`get_user`.
+        A ``"members"`` backend cannot be used with :attr:`MemberCacheFlags.columnar`.
+        Messages are configured with ``max_messages`` instead. Defaults to ``None``.
+
+        .. versionadded:: 3.0
 
     lazy_load_commands: :class:`bool`
         Whether to attempt to associate an unknown incoming application command ID with an existing application command.
@@ -278,7 +465,20 @@ class Client:
         heartbeat_timeout: float = 60.0,
         guild_ready_timeout: float = 2.0,
         assume_unsync_clock: bool = True,
+        max_global_requests: int = 50,
         enable_debug_events: bool = False,
+        loop_heartbeats: bool = False,
+        gateway_compression: Optional[str] = "zlib-stream",
+        gateway_encoding: str = "json",
+        allowed_events: Optional[Iterable[str]] = None,
+        ignored_events: Optional[Iterable[str]] = None,
+        inline_dispatch: bool = False,
+        event_pool: Optional[EventPool] = None,
+        parse_slice_budget: Optional[float] = None,
+        chunk_guilds_lazily: bool = False,
+        session_store: Optional[SessionStore] = None,
+        cache_snapshot: Optional[str] = None,
+        cache_backends: Optional[Dict[str, CacheBackend]] = None,
         loop: Optional[asyncio.AbstractEventLoop] = None,
         lazy_load_commands: bool = True,
         rollout_associate_known: bool = True,
@@ -288,10 +488,25 @@ class Client:
         rollout_all_guilds: bool = False,
         default_guild_ids: Optional[List[int]] = None,
     ) -> None:
+        # event name: (coroutine, method name) pairs to run, rebuilt when handlers change
+        self._dispatch_table: Optional[Dict[str, Tuple[EventHandler, ...]]] = None
+        self._inline_dispatch: bool = inline_dispatch
+        # the inline runs of the events dispatched by the gateway event being parsed
+        self._inline_pending: Optional[
+            List[Tuple[Tuple[EventHandler, ...], str, Tuple[Any, ...], Dict[str, Any]]]
+        ] = None
+        self._event_pool: Optional[EventPool] = event_pool
+        self._session_store: Optional[SessionStore] = session_store
+        self._session_task: Optional[asyncio.Task[None]] = None
+        self._cache_snapshot: Optional[str] = cache_snapshot
         # self.ws is set in the connect method
         self.ws: DiscordWebSocket = None  # type: ignore
         self.loop: asyncio.AbstractEventLoop = asyncio.get_event_loop() if loop is None else loop
-        self._listeners: Dict[str, List[Tuple[asyncio.Future, Callable[..., bool]]]] = {}
+        self._listeners: Dict[str, List[Waiter]] = {}
+        # event: keys: key values: waiters, for wait_for calls that were given keys
+        self._keyed_listeners: Dict[
+            str, Dict[Tuple[str, ...], Dict[Tuple[Any, ...], List[Waiter]]]
+        ] = {}
 
         self.shard_id: Optional[int] = shard_id
         self.shard_count: Optional[int] = shard_count
@@ -303,6 +518,7 @@ class Client:
             unsync_clock=assume_unsync_clock,
             loop=self.loop,
             dispatch=self.dispatch,
+            max_global_requests=max_global_requests,
         )
 
         self._handlers: Dict[str, Callable] = {"ready": self._handle_ready}
@@ -322,9 +538,29 @@ class Client:
             intents=intents,
             chunk_guilds_at_startup=chunk_guilds_at_startup,
             member_cache_flags=member_cache_flags,
+            cache_backends=cache_backends,
         )
 
         self._connection.shard_count = self.shard_count
+        _check_transport_compression(gateway_compression)
+        self._connection._gateway_compression = gateway_compression
+        if gateway_encoding not in ("json", "etf"):
+            raise ValueError(f"gateway_encoding must be 'json' or 'etf', not {gateway_encoding!r}")
+        self._connection._gateway_encoding = gateway_encoding
+        self._connection._event_pool = event_pool
+        if parse_slice_budget is not None and parse_slice_budget <= 0:
+            raise ValueError("parse_slice_budget must be greater than 0")
+        self._connection._parse_slice_budget = parse_slice_budget
+        if chunk_guilds_lazily:
+            if not intents.members:
+                raise ValueError("Intents.members must be enabled to chunk guilds lazily.")
+            self._connection._chunk_lazily = True
+            self._connection._chunk_guilds = False
+        if loop_heartbeats:
+            self._connection._heartbeat_scheduler = HeartbeatScheduler(self.loop)
+        self._connection.set_event_filter(
+            allowed_events=allowed_events, ignored_events=ignored_events
+        )
         self._closed: bool = False
         self._ready: asyncio.Event = asyncio.Event()
         self._connection._get_websocket = self._get_websocket
@@ -368,6 +604,7 @@ class Client:
         intents: Intents,
         chunk_guilds_at_startup: bool,
         member_cache_flags: MemberCacheFlags,
+        cache_backends: Optional[Dict[str, CacheBackend]],
     ) -> ConnectionState:
         return ConnectionState(
             dispatch=self.dispatch,
@@ -385,6 +622,7 @@ class Client:
             intents=intents,
             chunk_guilds_at_startup=chunk_guilds_at_startup,
             member_cache_flags=member_cache_flags,
+            cache_backends=cache_backends,
         )
 
     def _handle_ready(self) -> None:
@@ -399,6 +637,18 @@ class Client:
         ws = self.ws
         return float("nan") if not ws else ws.latency
 
+    @property
+    def heartbeat_jitter(self) -> float:
+        """:class:`float`: How late, in seconds, the most recent HEARTBEAT was sent compared to
+        when it was due.
+
+        A consistently high jitter means the event loop is too busy to keep up.
+
+        .. versionadded:: 3.0
+        """
+        ws = self.ws
+        return float("nan") if not ws else ws.heartbeat_jitter
+
     def is_ws_ratelimited(self) -> bool:
         """:class:`bool`: Whether the websocket is currently rate limited.
 
@@ -519,45 +769,196 @@ class Client:
         # Schedules the task
         return asyncio.create_task(wrapped, name=f"nextcord: {event_name}")
 
+    def _invalidate_dispatch_table(self) -> None:
+        # rebuilt on the next dispatch, see _build_dispatch_table
+        self.__dict__["_dispatch_table"] = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name.startswith("on_"):
+            self._invalidate_dispatch_table()
+
+    def __delattr__(self, name: str) -> None:
+        super().__delattr__(name)
+        if name.startswith("on_"):
+            self._invalidate_dispatch_table()
+
+    def _extend_dispatch_table(self, table: Dict[str, List[EventHandler]]) -> None:
+        # hook for subclasses with event handlers that are not on_ attributes
+        pass
+
+    def _build_dispatch_table(self) -> Dict[str, Tuple[EventHandler, ...]]:
+        table: Dict[str, List[EventHandler]] = {}
+        for method in dir(self):
+            if not method.startswith("on_"):
+                continue
+
+            coro = getattr(self, method, None)
+            if callable(coro):
+                table.setdefault(method[3:], []).append((coro, method))
+
+        self._extend_dispatch_table(table)
+        # events that are only waited for still need an entry
+        for event in (*self._listeners, *self._keyed_listeners):
+            table.setdefault(event, [])
+
+        self.__dict__["_dispatch_table"] = dispatch_table = {
+            event: tuple(handlers) for event, handlers in table.items()
+        }
+        return dispatch_table
+
     def dispatch(self, event: str, *args: Any, **kwargs: Any) -> None:
         _log.debug("Dispatching event %s", event)
-        method = "on_" + event
+        table = self._dispatch_table
+        if table is None:
+            table = self._build_dispatch_table()
+
+        # events without handlers or waiters end here
+        handlers = table.get(event)
+        if handlers is None:
+            return
 
         listeners = self._listeners.get(event)
         if listeners:
-            removed = []
-            for i, (future, condition) in enumerate(listeners):
-                if future.cancelled():
-                    removed.append(i)
-                    continue
-
-                try:
-                    result = condition(*args)
-                except Exception as exc:
-                    future.set_exception(exc)
-                    removed.append(i)
-                else:
-                    if result:
-                        if len(args) == 0:
-                            future.set_result(None)
-                        elif len(args) == 1:
-                            future.set_result(args[0])
-                        else:
-                            future.set_result(args)
-                        removed.append(i)
-
-            if len(removed) == len(listeners):
+            self._resolve_waiters(listeners, args)
+            if not listeners:
                 self._listeners.pop(event)
+
+        keyed = self._keyed_listeners.get(event)
+        if keyed:
+            self._resolve_keyed_waiters(event, keyed, args)
+
+        if not handlers:
+            return
+
+        pool = self._event_pool
+        if pool is not None:
+            key = None if pool.ordering is None else _wait_for_key(pool.ordering + "_id", args)
+            for coro, method in handlers:
+                pool.submit(event, key, partial(self._run_event, coro, method, *args, **kwargs))
+            return
+
+        if self._inline_dispatch:
+            self._run_inline(handlers, event, args, kwargs)
+            return
+
+        for coro, method in handlers:
+            self._schedule_event(coro, method, *args, **kwargs)
+
+    @staticmethod
+    def _resolve_waiters(listeners: List[Waiter], args: Tuple[Any, ...]) -> None:
+        removed = []
+        for i, (future, condition) in enumerate(listeners):
+            if future.cancelled():
+                removed.append(i)
+                continue
+
+            try:
+                result = condition(*args)
+            except Exception as exc:
+                future.set_exception(exc)
+                removed.append(i)
             else:
-                for idx in reversed(removed):
-                    del listeners[idx]
+                if result:
+                    if len(args) == 0:
+                        future.set_result(None)
+                    elif len(args) == 1:
+                        future.set_result(args[0])
+                    else:
+                        future.set_result(args)
+                    removed.append(i)
 
-        try:
-            coro = getattr(self, method)
-        except AttributeError:
-            pass
+        for idx in reversed(removed):
+            del listeners[idx]
+
+    def _resolve_keyed_waiters(
+        self,
+        event: str,
+        keyed: Dict[Tuple[str, ...], Dict[Tuple[Any, ...], List[Waiter]]],
+        args: Tuple[Any, ...],
+    ) -> None:
+        # only the waiters whose keys match the event have their check called
+        resolved: Dict[str, Any] = {}
+        for kinds, by_value in list(keyed.items()):
+            for kind in kinds:
+                if kind not in resolved:
+                    resolved[kind] = _wait_for_key(kind, args)
+
+            values = tuple(resolved[kind] for kind in kinds)
+            listeners = by_value.get(values)
+            if not listeners:
+                continue
+
+            self._resolve_waiters(listeners, args)
+            if not listeners:
+                self._remove_keyed_bucket(event, kinds, values)
+
+    def _remove_keyed_bucket(
+        self, event: str, kinds: Tuple[str, ...], values: Tuple[Any, ...]
+    ) -> None:
+        keyed = self._keyed_listeners[event]
+        by_value = keyed[kinds]
+        del by_value[values]
+        if not by_value:
+            del keyed[kinds]
+            if not keyed:
+                del self._keyed_listeners[event]
+
+    def _discard_keyed_waiter(
+        self, event: str, kinds: Tuple[str, ...], values: Tuple[Any, ...], waiter: Waiter, _: Any
+    ) -> None:
+        # waiters that time out are removed right away, their keys may never match again
+        listeners = self._keyed_listeners.get(event, {}).get(kinds, {}).get(values)
+        if listeners is None or waiter not in listeners:
+            return
+
+        listeners.remove(waiter)
+        if not listeners:
+            self._remove_keyed_bucket(event, kinds, values)
+
+    async def _run_events(
+        self, handlers: Tuple[EventHandler, ...], args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> None:
+        for coro, method in handlers:
+            await self._run_event(coro, method, *args, **kwargs)
+
+    def _run_inline(
+        self,
+        handlers: Tuple[EventHandler, ...],
+        event: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        pending = self._inline_pending
+        if pending is not None:
+            pending.append((handlers, event, args, kwargs))
+            return
+
+        # every handler runs in the same task, one after another. On Python 3.12+ the task
+        # starts eagerly, so handlers that finish without suspending never get scheduled
+        wrapped = self._run_events(handlers, args, kwargs)
+        name = f"nextcord: on_{event}"
+        if _eager_task_factory is not None:
+            task = _eager_task_factory(self.loop, wrapped, name=name)
+            if task.done():
+                return
         else:
-            self._schedule_event(coro, method, *args, **kwargs)
+            task = asyncio.create_task(wrapped, name=name)
+
+        self._connection._background_tasks.add(task)
+        task.add_done_callback(self._connection._background_tasks.discard)
+
+    def _parse_inline(self, parser: Callable[[Any], None], data: Any) -> None:
+        # parsers dispatch events before they are done updating the cache, such as
+        # message_delete before the message is removed, so eagerly started handlers
+        # only run once the parser returns, as they would from a task
+        self._inline_pending = pending = []
+        try:
+            parser(data)
+        finally:
+            self._inline_pending = None
+            for handlers, event, args, kwargs in pending:
+                self._run_inline(handlers, event, args, kwargs)
 
     async def on_error(self, event_method: str, *args: Any, **kwargs: Any) -> None:
         """|coro|
@@ -619,6 +1020,10 @@ class Client:
 
         The default implementation sleeps for 5 seconds.
 
+        When using :class:`AutoShardedClient`, this may be called concurrently for
+        shards in different ``max_concurrency`` rate limit buckets, and ``initial``
+        is ``True`` for the first shard of each bucket.
+
         .. versionadded:: 1.4
 
         Parameters
@@ -696,6 +1101,18 @@ class Client:
             "initial": True,
             "shard_id": self.shard_id,
         }
+        await self._restore_cache_snapshot()
+        session = (await self._load_sessions()).get(self.shard_id)
+        if session is not None:
+            ws_params.update(
+                sequence=session.sequence,
+                gateway=session.resume_url,
+                resume=True,
+                session=session.session_id,
+            )
+            self._connection._stored_resumes.add(self.shard_id)
+
+        self._start_session_checkpoints()
         while not self.is_closed():
             try:
                 coro = DiscordWebSocket.from_client(self, format_gateway=True, **ws_params)
@@ -796,12 +1213,171 @@ class Client:
             with contextlib.suppress(Exception):
                 await voice.disconnect(force=True)
 
+        await self._stop_session_checkpoints()
         if self.ws is not None and self.ws.open:  # pyright: ignore
-            await self.ws.close(code=1000)
+            await self.ws.close(code=self._close_code)
 
         await self.http.close()
+        if self._event_pool is not None:
+            self._event_pool.close()
         self._ready.clear()
 
+    @property
+    def _close_code(self) -> int:
+        # closing with 1000 ends the session, which a session store keeps for the next process
+        return 1000 if self._session_store is None else 4000
+
+    def _gateway_sessions(self) -> List[GatewaySession]:
+        ws = self.ws
+        if ws is None or ws.session_id is None:  # pyright: ignore[reportUnnecessaryComparison]
+            return []
+
+        return [
+            GatewaySession(
+                shard_id=self.shard_id,
+                shard_count=self.shard_count,
+                session_id=ws.session_id,
+                sequence=ws.sequence,
+                resume_url=ws.resume_url,
+            )
+        ]
+
+    async def _load_sessions(self) -> Dict[Optional[int], GatewaySession]:
+        # The events replayed on resume need guilds, channels and members to apply to,
+        # so sessions are only resumed when the caches were restored.
+        store = self._session_store
+        if store is None or not self._connection._cache_restored:
+            return {}
+
+        try:
+            sessions = await store.load()
+        except Exception:
+            _log.exception("Failed to load the saved gateway sessions, identifying instead.")
+            return {}
+
+        # Sessions are resumed from where the snapshot was taken, so that the events
+        # since are replayed, and only if the snapshot was taken in the same session.
+        anchors = self._connection._snapshot_sessions
+        resumable: Dict[Optional[int], GatewaySession] = {}
+        for session in sessions:
+            anchor = anchors.get(session.shard_id)
+            if (
+                session.shard_count == self.shard_count
+                and anchor is not None
+                and anchor.session_id == session.session_id
+            ):
+                session.sequence = anchor.sequence
+                resumable[session.shard_id] = session
+        return resumable
+
+    async def _save_sessions(self) -> None:
+        # a client that never connected would replace the snapshot with empty caches
+        if self._cache_snapshot is not None and self._connection.user is not None:
+            try:
+                await self.save_cache_snapshot(self._cache_snapshot)
+            except Exception:
+                _log.exception("Failed to save the cache snapshot.")
+
+        if self._session_store is None:
+            return
+
+        try:
+            await self._session_store.save(self._gateway_sessions())
+        except Exception:
+            _log.exception("Failed to save the gateway sessions.")
+
+    async def _restore_cache_snapshot(self) -> None:
+        if self._cache_snapshot is None or self._connection._cache_restored:
+            return
+
+        try:
+            await self.load_cache_snapshot(self._cache_snapshot)
+        except Exception:
+            _log.exception("Failed to load the cache snapshot, starting with empty caches.")
+            self._connection.clear()
+
+    async def save_cache_snapshot(self, path: str) -> int:
+        """|coro|
+
+        Saves the cached guilds, with their members, channels, threads, roles, emojis,
+        stickers and voice states, and the cached users to a file, replacing it.
+        The gateway sessions are saved along with them, so that they can be resumed from
+        the same point.
+
+        The caches are encoded at once, which blocks the event loop for a while on large
+        bots, for example about four seconds for a million members. Presences and
+        messages are not saved.
+
+        .. versionadded:: 3.0
+
+        Parameters
+        ----------
+        path: :class:`str`
+            The file to save the snapshot to.
+
+        Returns
+        -------
+        :class:`int`
+            The size of the snapshot in bytes.
+        """
+        # a guild parsed in slices would be saved with some of its members, but as received
+        await self._connection._wait_for_sliced_parses()
+        records = self._connection.dump_snapshot(self._gateway_sessions())
+        await self.loop.run_in_executor(None, snapshot.write, path, records)
+        return sum(len(record) for record in records)
+
+    async def load_cache_snapshot(self, path: str) -> bool:
+        """|coro|
+
+        Restores the caches from a file written by :meth:`save_cache_snapshot`, so that
+        guilds, members and users can be looked up before the gateway sends them.
+        This must be called before the client connects.
+
+        Restored guilds are kept until the gateway sends them again, and dropped if
+        ``READY`` no longer lists them.
+
+        The snapshot is decoded at once, as the caches are restored in place, which
+        blocks the event loop for a while on large bots, for example about five seconds
+        for a million members.
+
+        .. warning::
+
+            Snapshots are pickled, only load snapshots that the bot wrote itself.
+
+        .. versionadded:: 3.0
+
+        Parameters
+        ----------
+        path: :class:`str`
+            The file to restore the snapshot from.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether the caches were restored. They are not if the file does not exist or
+            the snapshot was taken with different shards.
+        """
+        return self._connection.load_snapshot(path)
+
+    def _start_session_checkpoints(self) -> None:
+        if self._session_store is not None and self._session_task is None:
+            self._session_task = asyncio.create_task(
+                self._checkpoint_sessions(self._session_store.interval)
+            )
+
+    async def _stop_session_checkpoints(self) -> None:
+        if self._session_task is not None:
+            self._session_task.cancel()
+            self._session_task = None
+        await self._save_sessions()
+
+    async def _checkpoint_sessions(self, interval: float) -> None:
+        # A session is only resumed from the snapshot it was saved with, so that the
+        # events since are replayed onto the caches, both are saved at every checkpoint.
+        while not self.is_closed():
+            await asyncio.sleep(interval)
+            await self._save_sessions()
+
     def clear(self) -> None:
         """Clears the internal state of the bot.
 
@@ -962,6 +1538,52 @@ class Client:
         """List[:class:`~nextcord.User`]: Returns a list of all the users the bot can see."""
         return list(self._connection._users.values())
 
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the number of cached users, guilds, emojis, stickers, private channels,
+        messages, members, channels and threads, keyed by ``"users"`` and so on.
+
+        The caches of a bounded :class:`CacheBackend` also report their ``maxsize``, how
+        many users are ``pinned`` as members of a cached guild, and how many lookups were
+        ``hits`` or ``misses`` and how many entities were ``evictions`` since the cache was
+        created. Members, channels and threads are added up over every guild. See
+        :meth:`memory_report` for how much memory the caches use.
+
+        .. versionadded:: 3.0
+
+        Returns
+        -------
+        Dict[:class:`str`, Dict[:class:`str`, Any]]
+            The statistics of each cache.
+        """
+        return self._connection.cache_stats()
+
+    def memory_report(self, top: int = 10) -> Dict[str, Any]:
+        """Estimates how much memory the cached objects use.
+
+        Every kind of object is measured on a few samples, which are multiplied by the
+        number of cached objects, so the report is cheap enough to take every minute even
+        with millions of members. An object is measured with the strings, numbers and
+        containers it holds, but not with the other cached objects it references.
+
+        .. versionadded:: 3.0
+
+        Parameters
+        ----------
+        top: :class:`int`
+            How many of the guilds using the most memory to list. Defaults to ``10``.
+
+        Returns
+        -------
+        Dict[:class:`str`, Any]
+            The estimated total in bytes under ``"memory"``. Under ``"kinds"``, the ``count``
+            and estimated ``memory`` of the cached guilds, members, channels, threads,
+            roles, voice states, users, emojis, stickers, private channels, messages,
+            views, modals and application commands. Under ``"guilds"``, the ID, the number of
+            cached objects of each kind and the estimated ``memory`` of the heaviest guilds,
+            heaviest first.
+        """
+        return self._connection.memory_report(top)
+
     def get_channel(
         self, id: int, /
     ) -> Optional[Union[GuildChannel, Thread, PrivateChannel, PartialMessageable]]:
@@ -1161,6 +1783,10 @@ class Client:
         *,
         check: Optional[Callable[..., bool]] = None,
         timeout: Optional[float] = None,
+        channel_id: Optional[int] = None,
+        author_id: Optional[int] = None,
+        message_id: Optional[int] = None,
+        custom_id: Optional[str] = None,
     ) -> Any:
         """|coro|
 
@@ -1217,6 +1843,13 @@ class Client:
                     else:
                         await channel.send('\N{THUMBS UP SIGN}')
 
+        Waiting for a reply in the same channel, by the same user, without a check
+        being called for every message: ::
+
+            msg = await client.wait_for(
+                'message', channel_id=message.channel.id, author_id=message.author.id
+            )
+
 
         Parameters
         ----------
@@ -1229,6 +1862,31 @@ class Client:
         timeout: Optional[:class:`float`]
             The number of seconds to wait before timing out and raising
             :exc:`asyncio.TimeoutError`.
+        channel_id: Optional[:class:`int`]
+            Only wait for an event in the channel with this ID.
+
+            .. versionadded:: 3.0
+        author_id: Optional[:class:`int`]
+            Only wait for an event caused by the user with this ID, such as
+            the author of a message or the user of an interaction or reaction.
+
+            .. versionadded:: 3.0
+        message_id: Optional[:class:`int`]
+            Only wait for an event on the message with this ID.
+
+            .. versionadded:: 3.0
+        custom_id: Optional[:class:`str`]
+            Only wait for an interaction with this ``custom_id``.
+
+            .. versionadded:: 3.0
+
+        .. note::
+
+            Waiters given any of the above keys are stored in a hash index, so
+            ``check`` is only called for events that match all of their keys. This is much
+            cheaper than a ``check`` doing the same comparison when many waiters are pending.
+            The keys are resolved from the message, interaction, reaction, channel or
+            raw event payload passed with the event, events without one never match.
 
         Raises
         ------
@@ -1252,13 +1910,25 @@ class Client:
             check = _check
 
         ev = event.lower()
-        try:
-            listeners = self._listeners[ev]
-        except KeyError:
-            listeners = []
-            self._listeners[ev] = listeners
-
-        listeners.append((future, check))
+        if self._dispatch_table is not None:
+            self._dispatch_table.setdefault(ev, ())
+
+        keys = {
+            "channel_id": channel_id,
+            "author_id": author_id,
+            "message_id": message_id,
+            "custom_id": custom_id,
+        }
+        kinds = tuple(kind for kind in _WAIT_FOR_KEYS if keys[kind] is not None)
+        if not kinds:
+            self._listeners.setdefault(ev, []).append((future, check))
+            return asyncio.wait_for(future, timeout)
+
+        values = tuple(keys[kind] for kind in kinds)
+        waiter = (future, check)
+        keyed = self._keyed_listeners.setdefault(ev, {})
+        keyed.setdefault(kinds, {}).setdefault(values, []).append(waiter)
+        future.add_done_callback(partial(self._discard_keyed_waiter, ev, kinds, values, waiter))
         return asyncio.wait_for(future, timeout)
 
     # event registration
@@ -2037,6 +2707,100 @@ class Client:
 
         self._connection.remove_modal(modal)
 
+    def add_component_route(
+        self,
+        template: str,
+        callback: Callable[..., Coroutine[Any, Any, Any]],
+        *,
+        component_type: Optional[ComponentType] = None,
+        auto_defer: bool = True,
+    ) -> None:
+        """Routes component interactions whose ``custom_id`` matches a template to a callback.
+
+        Unlike persistent views, routes do not keep anything for each message that their
+        components are sent in, so they are suited to components on very many messages.
+        Routes are checked before views. See :class:`~nextcord.ui.ComponentRouter` for the
+        template syntax.
+
+        .. versionadded:: 3.0
+
+        Example
+        -------
+
+        .. code-block:: python3
+
+            async def on_role_button(interaction, role_id: int, action: str):
+                ...
+
+            client.add_component_route("role:{role_id:int}:{action}", on_role_button)
+
+        Parameters
+        ----------
+        template: :class:`str`
+            The ``custom_id`` template to route, such as ``role:{role_id:int}:{action}``.
+        callback
+            The coroutine to call with the interaction and the parameters of the
+            template as keyword arguments.
+        component_type: Optional[:class:`ComponentType`]
+            The type of component to route. If ``None`` then all component types are routed.
+        auto_defer: :class:`bool`
+            Whether or not to defer the interaction when the callback completes without
+            responding to it. Defaults to ``True``.
+
+        Raises
+        ------
+        TypeError
+            The callback is not a coroutine function.
+        ValueError
+            The template is malformed.
+        """
+        self._connection._component_router.add_route(
+            template, callback, component_type=component_type, auto_defer=auto_defer
+        )
+
+    def remove_component_route(self, template: str) -> None:
+        """Removes the route of a ``custom_id`` template added with
+        :meth:`add_component_route`, if there is one.
+
+        .. versionadded:: 3.0
+
+        Parameters
+        ----------
+        template: :class:`str`
+            The template of the route to remove.
+        """
+        self._connection._component_router.remove_route(template)
+
+    def component_route(
+        self,
+        template: str,
+        *,
+        component_type: Optional[ComponentType] = None,
+        auto_defer: bool = True,
+    ) -> Callable[[Coro], Coro]:
+        """A decorator that routes component interactions to the decorated coroutine,
+        see :meth:`add_component_route` for the parameters.
+
+        .. versionadded:: 3.0
+
+        Example
+        -------
+
+        .. code-block:: python3
+
+            @client.component_route("role:{role_id:int}:{action}")
+            async def on_role_button(interaction, role_id: int, action: str):
+                ...
+        """
+
+        def decorator(func: Coro) -> Coro:
+            self.add_component_route(
+                template, func, component_type=component_type, auto_defer=auto_defer
+            )
+            return func
+
+        return decorator
+
     @property
     def all_views(self) -> List[View]:
         """List[:class:`.View`] A sequence of all views added to the client.
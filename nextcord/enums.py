@@ -2039,6 +2039,17 @@ class ForumLayoutType(IntEnum):
 
 T = TypeVar("T")
 
+# value -> member for every enum try_enum was used with, including the proxies
+# of unknown values, so that neither Enum.__call__ nor an exception is needed
+_enum_values: Dict[type, Dict[Any, Any]] = {}
+# how many unknown values are remembered for each enum
+_MAX_UNKNOWN_VALUES = 256
+
+
+def _enum_table(cls: type) -> Dict[Any, Any]:
+    table = _enum_values[cls] = dict(cls._value2member_map_)  # type: ignore
+    return table
+
 
 def try_enum(cls: Type[T], val: Any) -> T:
     """A function that tries to turn the value into enum ``cls``.
@@ -2046,7 +2057,27 @@ def try_enum(cls: Type[T], val: Any) -> T:
     If it fails it returns a proxy invalid value instead.
     """
 
+    table = _enum_values.get(cls)
+    if table is None:
+        table = _enum_table(cls)
+
     try:
-        return cls(val)
-    except ValueError:
-        return UnknownEnumValue(name=f"unknown_{val}", value=val)  # type: ignore
+        value = table.get(val)
+    except TypeError:
+        # unhashable, let the enum decide
+        hashable = False
+        value = None
+    else:
+        hashable = True
+
+    if value is None:
+        # members themselves, or values only known to _missing_
+        try:
+            value = cls(val)
+        except ValueError:
+            value = UnknownEnumValue(name=f"unknown_{val}", value=val)
+
+        if hashable and len(table) < len(cls._value2member_map_) + _MAX_UNKNOWN_VALUES:  # type: ignore
+            table[val] = value
+
+    return value
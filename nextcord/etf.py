@@ -0,0 +1,213 @@
+# SPDX-License-Identifier: MIT
+
+"""Encoding and decoding of the Erlang term format (ETF) used by the gateway.
+
+Only the subset of terms that Discord sends and accepts is supported. Decoded
+payloads have the same shape as their JSON counterparts: binaries become
+:class:`str`, the ``true``, ``false`` and ``nil`` atoms become :class:`bool` and
+``None``, and other atoms become :class:`str`. Snowflakes, however, arrive as
+:class:`int` rather than :class:`str`.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from typing import Any, Dict, List, Tuple
+
+__all__ = (
+    "pack",
+    "unpack",
+)
+
+FORMAT_VERSION = 131
+
+NEW_FLOAT_EXT = 70
+COMPRESSED = 80
+SMALL_INTEGER_EXT = 97
+INTEGER_EXT = 98
+FLOAT_EXT = 99
+ATOM_EXT = 100
+SMALL_TUPLE_EXT = 104
+LARGE_TUPLE_EXT = 105
+NIL_EXT = 106
+STRING_EXT = 107
+LIST_EXT = 108
+BINARY_EXT = 109
+SMALL_BIG_EXT = 110
+LARGE_BIG_EXT = 111
+SMALL_ATOM_EXT = 115
+MAP_EXT = 116
+ATOM_UTF8_EXT = 118
+SMALL_ATOM_UTF8_EXT = 119
+
+_ATOMS: Dict[str, Any] = {"true": True, "false": False, "nil": None, "null": None}
+
+_uint16 = struct.Struct(">H").unpack_from
+_uint32 = struct.Struct(">I").unpack_from
+_int32 = struct.Struct(">i").unpack_from
+_float64 = struct.Struct(">d").unpack_from
+
+
+def _atom(name: str) -> Any:
+    return _ATOMS.get(name, name)
+
+
+def _decode(data: bytes, offset: int) -> Tuple[Any, int]:
+    tag = data[offset]
+    offset += 1
+
+    # ordered roughly by how often each term appears in gateway payloads
+    if tag == BINARY_EXT:
+        end = offset + 4 + _uint32(data, offset)[0]
+        return data[offset + 4 : end].decode("utf-8"), end
+
+    if tag == SMALL_INTEGER_EXT:
+        return data[offset], offset + 1
+
+    if tag == MAP_EXT:
+        (arity,) = _uint32(data, offset)
+        offset += 4
+        result = {}
+        for _ in range(arity):
+            # keys are almost always atoms or binaries, decode those inline
+            tag = data[offset]
+            if tag in (SMALL_ATOM_UTF8_EXT, SMALL_ATOM_EXT):
+                end = offset + 2 + data[offset + 1]
+                key = data[offset + 2 : end].decode("utf-8")
+                offset = end
+            elif tag == BINARY_EXT:
+                end = offset + 5 + _uint32(data, offset + 1)[0]
+                key = data[offset + 5 : end].decode("utf-8")
+                offset = end
+            else:
+                key, offset = _decode(data, offset)
+
+            result[key], offset = _decode(data, offset)
+        return result, offset
+
+    if tag in (SMALL_ATOM_UTF8_EXT, SMALL_ATOM_EXT):
+        end = offset + 1 + data[offset]
+        return _atom(data[offset + 1 : end].decode("utf-8")), end
+
+    if tag == SMALL_BIG_EXT:
+        end = offset + 2 + data[offset]
+        value = int.from_bytes(data[offset + 2 : end], "little")
+        return (-value if data[offset + 1] else value), end
+
+    if tag == INTEGER_EXT:
+        return _int32(data, offset)[0], offset + 4
+
+    if tag == LIST_EXT:
+        (length,) = _uint32(data, offset)
+        offset += 4
+        items = []
+        append = items.append
+        for _ in range(length):
+            item, offset = _decode(data, offset)
+            append(item)
+        # proper lists end with an empty list as their tail
+        _, offset = _decode(data, offset)
+        return items, offset
+
+    if tag == NIL_EXT:
+        return [], offset
+
+    if tag == NEW_FLOAT_EXT:
+        return _float64(data, offset)[0], offset + 8
+
+    if tag in (ATOM_EXT, ATOM_UTF8_EXT):
+        end = offset + 2 + _uint16(data, offset)[0]
+        return _atom(data[offset + 2 : end].decode("utf-8")), end
+
+    if tag == STRING_EXT:
+        # a list of integers that each fit in a byte
+        end = offset + 2 + _uint16(data, offset)[0]
+        return list(data[offset + 2 : end]), end
+
+    if tag in (SMALL_TUPLE_EXT, LARGE_TUPLE_EXT):
+        if tag == SMALL_TUPLE_EXT:
+            arity = data[offset]
+            offset += 1
+        else:
+            (arity,) = _uint32(data, offset)
+            offset += 4
+        items = []
+        for _ in range(arity):
+            item, offset = _decode(data, offset)
+            items.append(item)
+        return tuple(items), offset
+
+    if tag == LARGE_BIG_EXT:
+        end = offset + 5 + _uint32(data, offset)[0]
+        value = int.from_bytes(data[offset + 5 : end], "little")
+        return (-value if data[offset + 4] else value), end
+
+    if tag == FLOAT_EXT:
+        end = offset + 31
+        return float(data[offset:end].rstrip(b"\x00")), end
+
+    raise ValueError(f"Unsupported ETF term with tag {tag} at offset {offset - 1}")
+
+
+def unpack(data: bytes) -> Any:
+    """Decodes an ETF payload into the Python objects its JSON counterpart would decode to."""
+    if data[0] != FORMAT_VERSION:
+        raise ValueError(f"Unknown ETF version {data[0]}")
+
+    if data[1] == COMPRESSED:
+        # the uncompressed size is not needed by zlib
+        data = bytes((FORMAT_VERSION,)) + zlib.decompress(data[6:])
+
+    value, _ = _decode(data, 1)
+    return value
+
+
+def _encode(obj: Any, out: List[bytes]) -> None:
+    if obj is None:
+        out.append(b"s\x03nil")
+    elif obj is True:
+        out.append(b"s\x04true")
+    elif obj is False:
+        out.append(b"s\x05false")
+    elif isinstance(obj, int):
+        if 0 <= obj <= 255:
+            out.append(struct.pack(">BB", SMALL_INTEGER_EXT, obj))
+        elif -(2**31) <= obj < 2**31:
+            out.append(struct.pack(">Bi", INTEGER_EXT, obj))
+        else:
+            magnitude = abs(obj)
+            digits = magnitude.to_bytes((magnitude.bit_length() + 7) // 8, "little")
+            if len(digits) > 255:
+                raise ValueError("int too large to be encoded as ETF")
+            out.append(struct.pack(">BBB", SMALL_BIG_EXT, len(digits), obj < 0))
+            out.append(digits)
+    elif isinstance(obj, float):
+        out.append(struct.pack(">Bd", NEW_FLOAT_EXT, obj))
+    elif isinstance(obj, str):
+        encoded = obj.encode("utf-8")
+        out.append(struct.pack(">BI", BINARY_EXT, len(encoded)))
+        out.append(encoded)
+    elif isinstance(obj, bytes):
+        out.append(struct.pack(">BI", BINARY_EXT, len(obj)))
+        out.append(obj)
+    elif isinstance(obj, dict):
+        out.append(struct.pack(">BI", MAP_EXT, len(obj)))
+        for key, value in obj.items():
+            _encode(key, out)
+            _encode(value, out)
+    elif isinstance(obj, (list, tuple)):
+        if obj:
+            out.append(struct.pack(">BI", LIST_EXT, len(obj)))
+            for item in obj:
+                _encode(item, out)
+        out.append(b"j")
+    else:
+        raise TypeError(f"Object of type {obj.__class__.__name__} is not ETF serializable")
+
+
+def pack(obj: Any) -> bytes:
+    """Encodes a payload as ETF, sending :class:`str` as binaries and ``None`` as ``nil``."""
+    out = [b"\x83"]
+    _encode(obj, out)
+    return b"".join(out)
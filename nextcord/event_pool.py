@@ -0,0 +1,329 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Deque,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+)
+
+__all__ = ("EventPool",)
+
+_log = logging.getLogger(__name__)
+
+OverflowPolicy = Literal["block", "drop_oldest", "shed"]
+
+
+class _Job:
+    __slots__ = ("event", "key", "run", "queued_at")
+
+    def __init__(
+        self,
+        event: str,
+        key: Optional[Hashable],
+        run: Callable[[], Coroutine[Any, Any, Any]],
+    ) -> None:
+        self.event: str = event
+        self.key: Optional[Hashable] = key
+        self.run: Callable[[], Coroutine[Any, Any, Any]] = run
+        self.queued_at: float = time.perf_counter()
+
+
+class _EventMetrics:
+    __slots__ = ("handled", "dropped", "busy", "max_busy", "waited")
+
+    def __init__(self) -> None:
+        self.handled: int = 0
+        self.dropped: int = 0
+        # seconds spent running handlers, and waiting in the queue
+        self.busy: float = 0.0
+        self.max_busy: float = 0.0
+        self.waited: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        handled = self.handled or 1
+        return {
+            "handled": self.handled,
+            "dropped": self.dropped,
+            "mean_latency": self.busy / handled,
+            "max_latency": self.max_busy,
+            "mean_queue_time": self.waited / handled,
+        }
+
+
+class EventPool:
+    """A bounded pool of workers that runs event handlers, for use with the
+    ``event_pool`` parameter of :class:`Client`.
+
+    By default every handler invocation is its own task, so a burst of events, such as a
+    raid, can create any number of tasks and runs handlers in no particular order.
+    With a pool, handlers are queued and run by a fixed number of workers instead.
+
+    .. versionadded:: 3.0
+
+    Parameters
+    ----------
+    workers: :class:`int`
+        The number of handlers that can run at once. Defaults to ``64``.
+    max_queue: :class:`int`
+        The number of handlers that can be queued before ``overflow`` applies.
+        Defaults to ``10000``.
+    concurrency: Optional[Mapping[:class:`str`, :class:`int`]]
+        The number of handlers of an event, such as ``"message"``, that can run at once.
+        Events that are not given are only limited by ``workers``.
+    ordering: Optional[:class:`str`]
+        Either ``"guild"`` or ``"channel"`` to run the handlers of events in the same guild
+        or channel one at a time, in the order the events were received. Events without a
+        guild or channel are not ordered. Defaults to ``None``, which does not order events.
+    overflow: :class:`str`
+        What to do when the queue is full:
+
+        - ``"block"``, the default, stops reading from the gateway until the queue has
+          room again. Gateway heartbeats are not acknowledged while reading is paused,
+          so a queue that stays full leads to a reconnect.
+        - ``"drop_oldest"`` drops the handler that was queued first.
+        - ``"shed"`` drops the handlers of the events given in ``shed_events`` and queues
+          any other handler regardless.
+    shed_events: Optional[Iterable[:class:`str`]]
+        The events, such as ``"typing"`` or ``"presence_update"``, that are dropped
+        when ``overflow`` is ``"shed"``.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 64,
+        max_queue: int = 10000,
+        concurrency: Optional[Mapping[str, int]] = None,
+        ordering: Optional[Literal["guild", "channel"]] = None,
+        overflow: OverflowPolicy = "block",
+        shed_events: Optional[Iterable[str]] = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        if ordering not in (None, "guild", "channel"):
+            raise ValueError(f"ordering must be None, 'guild' or 'channel', not {ordering!r}")
+        if overflow not in ("block", "drop_oldest", "shed"):
+            raise ValueError(f"overflow must be 'block', 'drop_oldest' or 'shed', not {overflow!r}")
+
+        self.workers: int = workers
+        self.max_queue: int = max_queue
+        self.ordering: Optional[str] = ordering
+        self.overflow: OverflowPolicy = overflow
+        self._limits: Dict[str, int] = dict(concurrency or {})
+        self._shed_events: FrozenSet[str] = frozenset(shed_events or ())
+
+        # jobs that a worker can start, in order
+        self._ready: Deque[_Job] = deque()
+        # ordering key: jobs waiting for the job with that key that is queued or running
+        self._ordered: Dict[Hashable, Deque[_Job]] = {}
+        # event: jobs waiting for the concurrency limit of the event
+        self._parked: Dict[str, Deque[_Job]] = {}
+        self._queued: int = 0
+        self._running: Dict[str, int] = {}
+        self._metrics: Dict[str, _EventMetrics] = {}
+
+        self._tasks: List[asyncio.Task[None]] = []
+        # bumped by close, so that workers that are still finishing a handler stop
+        self._generation: int = 0
+        self._idle: Deque[asyncio.Future[None]] = deque()
+        self._space_waiters: Deque[asyncio.Future[None]] = deque()
+
+    def __repr__(self) -> str:
+        return (
+            f"<EventPool workers={self.workers} queued={self._queued} "
+            f"running={sum(self._running.values())} overflow={self.overflow!r}>"
+        )
+
+    def is_full(self) -> bool:
+        """:class:`bool`: Whether the queue holds ``max_queue`` handlers or more."""
+        return self._queued >= self.max_queue
+
+    def submit(
+        self,
+        event: str,
+        key: Optional[Hashable],
+        run: Callable[[], Coroutine[Any, Any, Any]],
+    ) -> bool:
+        # Queues a handler, returns False if it was dropped instead. key is the guild or
+        # channel ID when events are ordered.
+        if self._queued >= self.max_queue:
+            if self.overflow == "shed":
+                if event in self._shed_events:
+                    self._metrics_for(event).dropped += 1
+                    return False
+            elif self.overflow == "drop_oldest" and not self._drop_oldest():
+                self._metrics_for(event).dropped += 1
+                return False
+
+        if not self._tasks:
+            self._start()
+
+        job = _Job(event, key, run)
+        self._queued += 1
+        if key is not None:
+            waiting = self._ordered.get(key)
+            if waiting is not None:
+                waiting.append(job)
+                return True
+            self._ordered[key] = deque()
+
+        self._ready.append(job)
+        self._wake()
+        return True
+
+    async def wait_for_capacity(self) -> None:
+        """|coro|
+
+        Waits until the queue has room for another handler.
+        """
+        loop = asyncio.get_running_loop()
+        while self._queued >= self.max_queue:
+            future = loop.create_future()
+            self._space_waiters.append(future)
+            await future
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the queue depths of the pool, and the number of handlers that were run
+        and dropped and their latencies in seconds for each event.
+        """
+        return {
+            "workers": self.workers,
+            "queued": self._queued,
+            "ready": len(self._ready),
+            "ordered_keys": len(self._ordered),
+            "parked": {event: len(jobs) for event, jobs in self._parked.items() if jobs},
+            "running": {event: count for event, count in self._running.items() if count},
+            "events": {event: metrics.to_dict() for event, metrics in self._metrics.items()},
+        }
+
+    def close(self) -> None:
+        """Stops the workers and drops every queued handler."""
+        self._generation += 1
+        for task in self._tasks:
+            task.cancel()
+
+        self._tasks.clear()
+        self._ready.clear()
+        self._ordered.clear()
+        self._parked.clear()
+        self._queued = 0
+        self._running.clear()
+        self._idle.clear()
+        while self._space_waiters:
+            future = self._space_waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+
+    def _metrics_for(self, event: str) -> _EventMetrics:
+        metrics = self._metrics.get(event)
+        if metrics is None:
+            metrics = self._metrics[event] = _EventMetrics()
+        return metrics
+
+    def _start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"nextcord: event pool worker {index}")
+            for index in range(self.workers)
+        ]
+
+    def _wake(self) -> None:
+        while self._idle:
+            future = self._idle.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+
+    def _release_key(self, key: Hashable) -> None:
+        # the next job with this key, if any, can now run
+        waiting = self._ordered[key]
+        if waiting:
+            self._ready.append(waiting.popleft())
+            self._wake()
+        else:
+            del self._ordered[key]
+
+    def _drop_oldest(self) -> bool:
+        if not self._ready:
+            return False
+
+        job = self._ready.popleft()
+        self._queued -= 1
+        self._metrics_for(job.event).dropped += 1
+        if job.key is not None:
+            self._release_key(job.key)
+        return True
+
+    def _take(self) -> Optional[_Job]:
+        ready = self._ready
+        while ready:
+            job = ready.popleft()
+            limit = self._limits.get(job.event)
+            if limit is not None and self._running.get(job.event, 0) >= limit:
+                self._parked.setdefault(job.event, deque()).append(job)
+                continue
+
+            self._queued -= 1
+            if self._space_waiters and self._queued < self.max_queue:
+                future = self._space_waiters.popleft()
+                if not future.done():
+                    future.set_result(None)
+            return job
+
+        return None
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        generation = self._generation
+        while True:
+            job = self._take()
+            if job is None:
+                future = loop.create_future()
+                self._idle.append(future)
+                await future
+                continue
+
+            self._running[job.event] = self._running.get(job.event, 0) + 1
+            started = time.perf_counter()
+            try:
+                await job.run()
+            except Exception:
+                # handlers report their own errors, this should not happen
+                _log.exception("Ignoring exception in event pool job for %s", job.event)
+
+            if generation != self._generation:
+                return
+            self._finish(job, started)
+
+    def _finish(self, job: _Job, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        metrics = self._metrics_for(job.event)
+        metrics.handled += 1
+        metrics.busy += elapsed
+        metrics.waited += started - job.queued_at
+        if elapsed > metrics.max_busy:
+            metrics.max_busy = elapsed
+
+        self._running[job.event] -= 1
+        parked = self._parked.get(job.event)
+        if parked:
+            self._ready.appendleft(parked.popleft())
+            self._wake()
+        if job.key is not None:
+            self._release_key(job.key)
@@ -26,6 +26,7 @@ from typing import (
     Mapping,
     Optional,
     Sequence,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -46,10 +47,13 @@ if TYPE_CHECKING:
     import aiohttp
 
     from nextcord.activity import BaseActivity
+    from nextcord.cache import CacheBackend
     from nextcord.enums import Status
+    from nextcord.event_pool import EventPool
     from nextcord.flags import MemberCacheFlags
     from nextcord.mentions import AllowedMentions
     from nextcord.message import Message
+    from nextcord.session import SessionStore
 
     from ._types import Check, CoroFunc
 
@@ -210,12 +214,13 @@ class BotBase(GroupMixin):
 
     # internal helpers
 
-    def dispatch(self, event_name: str, *args: Any, **kwargs: Any) -> None:
+    def _extend_dispatch_table(self, table: Dict[str, List[Tuple[CoroFunc, str]]]) -> None:
         # super() will resolve to Client
-        super().dispatch(event_name, *args, **kwargs)  # type: ignore
-        ev = "on_" + event_name
-        for event in self.extra_events.get(ev, []):
-            self._schedule_event(event, ev, *args, **kwargs)  # type: ignore
+        super()._extend_dispatch_table(table)  # type: ignore
+        # listeners run after the on_ method of the bot itself
+        for ev, listeners in self.extra_events.items():
+            if listeners and ev.startswith("on_"):
+                table.setdefault(ev[3:], []).extend((listener, ev) for listener in listeners)
 
     @nextcord.utils.copy_doc(nextcord.Client.close)
     async def close(self) -> None:
@@ -478,6 +483,13 @@ class BotBase(GroupMixin):
     def add_listener(self, func: CoroFunc, name: str = MISSING) -> None:
         """The non decorator alternative to :meth:`.listen`.
 
+        .. note::
+
+            The handlers of every event are looked up once and reused until a listener
+            or an ``on_`` attribute changes. Listeners must be added and removed with
+            :meth:`.add_listener`, :meth:`.remove_listener` and :meth:`.listen`, as
+            changes made directly to ``extra_events`` are not picked up until then.
+
         Parameters
         ----------
         func: :ref:`coroutine <coroutine>`
@@ -506,6 +518,7 @@ class BotBase(GroupMixin):
             self.extra_events[name].append(func)
         else:
             self.extra_events[name] = [func]
+        self._invalidate_dispatch_table()  # type: ignore
 
     def remove_listener(self, func: CoroFunc, name: str = MISSING) -> None:
         """Removes a listener from the pool of listeners.
@@ -524,6 +537,7 @@ class BotBase(GroupMixin):
         if name in self.extra_events:
             with contextlib.suppress(ValueError):
                 self.extra_events[name].remove(func)
+            self._invalidate_dispatch_table()  # type: ignore
 
     def listen(self, name: str = MISSING) -> Callable[[CFT], CFT]:
         """A decorator that registers another function as an external
@@ -698,6 +712,7 @@ class BotBase(GroupMixin):
 
             for index in reversed(remove):
                 del event_list[index]
+        self._invalidate_dispatch_table()  # type: ignore
 
     def _call_module_finalizers(self, lib: types.ModuleType, key: str) -> None:
         try:
@@ -1516,7 +1531,8 @@ class Bot(BotBase, nextcord.Client):
         .. versionadded:: 1.7
     """
 
-    def __init__(
+    # every Client option is repeated as a keyword, so that it is documented and type checked
+    def __init__(  # noqa: PLR0913
         self,
         command_prefix: Union[
             _NonCallablePrefix,
@@ -1553,6 +1569,19 @@ class Bot(BotBase, nextcord.Client):
         rollout_update_known: bool = True,
         rollout_all_guilds: bool = False,
         default_guild_ids: Optional[List[int]] = None,
+        max_global_requests: int = 50,
+        loop_heartbeats: bool = False,
+        allowed_events: Optional[Iterable[str]] = None,
+        ignored_events: Optional[Iterable[str]] = None,
+        gateway_compression: Optional[str] = "zlib-stream",
+        gateway_encoding: str = "json",
+        inline_dispatch: bool = False,
+        event_pool: Optional[EventPool] = None,
+        parse_slice_budget: Optional[float] = None,
+        chunk_guilds_lazily: bool = False,
+        session_store: Optional[SessionStore] = None,
+        cache_snapshot: Optional[str] = None,
+        cache_backends: Optional[Dict[str, CacheBackend]] = None,
         owner_id: Optional[int] = None,
         owner_ids: Optional[Iterable[int]] = None,
         strip_after_prefix: bool = False,
@@ -1585,6 +1614,19 @@ class Bot(BotBase, nextcord.Client):
             rollout_update_known=rollout_update_known,
             rollout_all_guilds=rollout_all_guilds,
             default_guild_ids=default_guild_ids,
+            max_global_requests=max_global_requests,
+            loop_heartbeats=loop_heartbeats,
+            allowed_events=allowed_events,
+            ignored_events=ignored_events,
+            gateway_compression=gateway_compression,
+            gateway_encoding=gateway_encoding,
+            inline_dispatch=inline_dispatch,
+            event_pool=event_pool,
+            parse_slice_budget=parse_slice_budget,
+            chunk_guilds_lazily=chunk_guilds_lazily,
+            session_store=session_store,
+            cache_snapshot=cache_snapshot,
+            cache_backends=cache_backends,
         )
 
         BotBase.__init__(
@@ -1604,7 +1646,8 @@ class AutoShardedBot(BotBase, nextcord.AutoShardedClient):
     :class:`nextcord.AutoShardedClient` instead.
     """
 
-    def __init__(
+    # the options are repeated as in Bot.__init__
+    def __init__(  # noqa: PLR0913
         self,
         command_prefix: Union[
             _NonCallablePrefix,
@@ -1642,6 +1685,19 @@ class AutoShardedBot(BotBase, nextcord.AutoShardedClient):
         rollout_update_known: bool = True,
         rollout_all_guilds: bool = False,
         default_guild_ids: Optional[List[int]] = None,
+        max_global_requests: int = 50,
+        loop_heartbeats: bool = False,
+        allowed_events: Optional[Iterable[str]] = None,
+        ignored_events: Optional[Iterable[str]] = None,
+        gateway_compression: Optional[str] = "zlib-stream",
+        gateway_encoding: str = "json",
+        inline_dispatch: bool = False,
+        event_pool: Optional[EventPool] = None,
+        parse_slice_budget: Optional[float] = None,
+        chunk_guilds_lazily: bool = False,
+        session_store: Optional[SessionStore] = None,
+        cache_snapshot: Optional[str] = None,
+        cache_backends: Optional[Dict[str, CacheBackend]] = None,
         owner_id: Optional[int] = None,
         owner_ids: Optional[Iterable[int]] = None,
         strip_after_prefix: bool = False,
@@ -1675,6 +1731,19 @@ class AutoShardedBot(BotBase, nextcord.AutoShardedClient):
             rollout_update_known=rollout_update_known,
             rollout_all_guilds=rollout_all_guilds,
             default_guild_ids=default_guild_ids,
+            max_global_requests=max_global_requests,
+            loop_heartbeats=loop_heartbeats,
+            allowed_events=allowed_events,
+            ignored_events=ignored_events,
+            gateway_compression=gateway_compression,
+            gateway_encoding=gateway_encoding,
+            inline_dispatch=inline_dispatch,
+            event_pool=event_pool,
+            parse_slice_budget=parse_slice_budget,
+            chunk_guilds_lazily=chunk_guilds_lazily,
+            session_store=session_store,
+            cache_snapshot=cache_snapshot,
+            cache_backends=cache_backends,
         )
 
         BotBase.__init__(
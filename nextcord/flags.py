@@ -1132,7 +1132,7 @@ class MemberCacheFlags(BaseFlags):
     To construct an object you can pass keyword arguments denoting the flags
     to enable or disable.
 
-    The default value is all flags enabled.
+    The default value is all flags enabled, except :attr:`columnar`.
 
     .. versionadded:: 1.5
 
@@ -1162,20 +1162,25 @@ class MemberCacheFlags(BaseFlags):
     __slots__ = ()
 
     def __init__(self, **kwargs: bool) -> None:
-        bits = max(self.VALID_FLAGS.values()).bit_length()
-        self.value = (1 << bits) - 1
+        self.value = self._all_value()
         for key, value in kwargs.items():
             if key not in self.VALID_FLAGS:
                 raise TypeError(f"{key!r} is not a valid flag name.")
             setattr(self, key, value)
 
     @classmethod
-    def all(cls) -> Self:
-        """A factory method that creates a :class:`MemberCacheFlags` with everything enabled."""
+    def _all_value(cls) -> int:
+        # columnar changes how members are stored rather than which are, so it is opt-in
         bits = max(cls.VALID_FLAGS.values()).bit_length()
-        value = (1 << bits) - 1
+        return ((1 << bits) - 1) & ~cls.columnar.flag
+
+    @classmethod
+    def all(cls) -> Self:
+        """A factory method that creates a :class:`MemberCacheFlags` with everything enabled,
+        except :attr:`columnar`.
+        """
         self = cls.__new__(cls)
-        self.value = value
+        self.value = cls._all_value()
         return self
 
     @classmethod
@@ -1187,7 +1192,12 @@ class MemberCacheFlags(BaseFlags):
 
     @property
     def _empty(self):
-        return self.value == self.DEFAULT_VALUE
+        return self._policy == self.DEFAULT_VALUE
+
+    @property
+    def _policy(self) -> int:
+        # the flags that decide which members are cached
+        return self.value & ~self.__class__.columnar.flag
 
     @flag_value
     def voice(self) -> int:
@@ -1210,6 +1220,23 @@ class MemberCacheFlags(BaseFlags):
         """
         return 2
 
+    @flag_value
+    def columnar(self) -> int:
+        """:class:`bool`: Whether to store the members of each guild in columns of arrays,
+        rather than as a :class:`Member` object each.
+
+        This takes a fraction of the memory for large guilds, at the cost of building
+        a :class:`Member` each time one is accessed, such as through :meth:`Guild.get_member`
+        or :attr:`Guild.members`. A :class:`Member` built this way is a copy of the member
+        at that time and does not see later updates, get the member again to see them.
+        Presences are only kept for members that are not offline.
+
+        This is not enabled by :meth:`all` or by default.
+
+        .. versionadded:: 3.0
+        """
+        return 4
+
     @classmethod
     def from_intents(cls, intents: Intents) -> Self:
         """A factory method that creates a :class:`MemberCacheFlags` based on
@@ -1243,7 +1270,7 @@ class MemberCacheFlags(BaseFlags):
 
     @property
     def _voice_only(self):
-        return self.value == 1
+        return self._policy == 1
 
 
 @fill_with_flags()
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 import asyncio
 import concurrent.futures
+import heapq
+import itertools
 import logging
+import re
 import struct
 import sys
 import threading
@@ -12,15 +15,24 @@ import time
 import traceback
 import zlib
 from collections import deque, namedtuple
-from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
 
 import aiohttp
 
-from . import utils
+from . import etf, utils
 from .activity import BaseActivity
 from .enums import SpeakingState
 from .errors import ConnectionClosed, InvalidArgument
 
+has_zstd: bool
+
+try:
+    import zstandard
+
+    has_zstd = True
+except ImportError:
+    has_zstd = False
+
 if TYPE_CHECKING:
     from typing import Any, Protocol
 
@@ -40,6 +52,9 @@ __all__ = (
     "DiscordWebSocket",
     "KeepAliveHandler",
     "VoiceKeepAliveHandler",
+    "HeartbeatScheduler",
+    "LoopKeepAliveHandler",
+    "VoiceLoopKeepAliveHandler",
     "DiscordVoiceWebSocket",
     "ReconnectWebSocket",
 )
@@ -60,6 +75,84 @@ class WebSocketClosure(Exception):
 
 EventListener = namedtuple("EventListener", "predicate event result future")  # type: ignore
 
+# Events that keep the connection and cache consistent, these are never filtered out.
+_REQUIRED_EVENTS = frozenset(
+    {
+        "READY",
+        "RESUMED",
+        "GUILD_CREATE",
+        "GUILD_DELETE",
+        "GUILD_MEMBERS_CHUNK",
+        "VOICE_STATE_UPDATE",
+        "VOICE_SERVER_UPDATE",
+    }
+)
+# Matches the envelope keys that Discord sends before "d", e.g. {"t":"TYPING_START","s":42,"op":0,
+_ENVELOPE_EVENT = re.compile(rb'"t":"([A-Z_]+)"')
+_ENVELOPE_SEQUENCE = re.compile(rb'"s":(\d+)')
+_ENVELOPE_DISPATCH = re.compile(rb'"op":0\b')
+# Every complete zlib-stream payload ends with a Z_SYNC_FLUSH marker
+_ZLIB_SUFFIX = b"\x00\x00\xff\xff"
+
+
+class _ZlibStreamDecompressor:
+    """Inflates a ``zlib-stream`` connection, buffering payloads split over several frames."""
+
+    __slots__ = ("_zlib", "_buffer")
+
+    def __init__(self) -> None:
+        self._zlib = zlib.decompressobj()
+        self._buffer: bytearray = bytearray()
+
+    def decompress(self, data: bytes, /) -> Optional[bytes]:
+        if not data.endswith(_ZLIB_SUFFIX):
+            self._buffer.extend(data)
+            return None
+
+        if self._buffer:
+            self._buffer.extend(data)
+            data = self._zlib.decompress(self._buffer)
+            # reuse the same buffer for the next fragmented payload
+            del self._buffer[:]
+            return data
+
+        # payloads that fit in a single frame skip the buffer entirely
+        return self._zlib.decompress(data)
+
+
+class _ZstdStreamDecompressor:
+    """Decompresses a ``zstd-stream`` connection.
+
+    The whole connection is a single zstd frame that Discord flushes after every
+    payload, so each websocket message decompresses to exactly one payload.
+    """
+
+    __slots__ = ("_zstd",)
+
+    def __init__(self) -> None:
+        self._zstd = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data: bytes, /) -> Optional[bytes]:
+        return self._zstd.decompress(data) or None
+
+
+_TRANSPORT_DECOMPRESSORS: Dict[str, Any] = {
+    "zlib-stream": _ZlibStreamDecompressor,
+    "zstd-stream": _ZstdStreamDecompressor,
+}
+
+
+def _check_transport_compression(compress: Optional[str]) -> None:
+    if compress is None:
+        return
+    if compress not in _TRANSPORT_DECOMPRESSORS:
+        raise ValueError(
+            f"gateway_compression must be one of {', '.join(map(repr, _TRANSPORT_DECOMPRESSORS))} "
+            f"or None, not {compress!r}"
+        )
+    if compress == "zstd-stream" and not has_zstd:
+        raise RuntimeError("zstandard library needed in order to use zstd-stream compression")
+
 
 class GatewayRatelimiter:
     def __init__(self, count: int = 110, per: float = 60.0) -> None:
@@ -77,6 +170,15 @@ class GatewayRatelimiter:
             return False
         return self.remaining == 0
 
+    def available(self) -> int:
+        # the sends left in the current window, without using one
+        if time.time() > self.window + self.per:
+            return self.max
+        return self.remaining
+
+    def reset_after(self) -> float:
+        return max(self.window + self.per - time.time(), 0.0)
+
     def get_delay(self) -> float:
         current = time.time()
 
@@ -126,10 +228,13 @@ class KeepAliveHandler(threading.Thread):
         self._last_send: float = time.perf_counter()
         self._last_recv: float = time.perf_counter()
         self.latency: float = float("inf")
+        # seconds between a heartbeat being due and it actually being sent
+        self.jitter: float = 0.0
         self.heartbeat_timeout: float = ws._max_heartbeat_timeout
 
     def run(self) -> None:
         while not self._stop_ev.wait(self.interval):
+            due = time.perf_counter()
             if self._last_recv + self.heartbeat_timeout < time.perf_counter():
                 _log.warning(
                     "Shard ID %s has stopped responding to the gateway. Closing and restarting.",
@@ -172,6 +277,7 @@ class KeepAliveHandler(threading.Thread):
                 self.stop()
             else:
                 self._last_send = time.perf_counter()
+                self.jitter = self._last_send - due
 
     def get_payload(self) -> Dict[str, Any]:
         return {"op": self.ws.HEARTBEAT, "d": self.ws.sequence}
@@ -209,6 +315,302 @@ class VoiceKeepAliveHandler(KeepAliveHandler):
         self.recent_ack_latencies.append(self.latency)
 
 
+class HeartbeatScheduler:
+    """Drives the heartbeats of many websockets from the event loop.
+
+    This replaces one :class:`KeepAliveHandler` thread per websocket with a single
+    timer on the event loop that sends every due heartbeat in one callback.
+    A watchdog timer on the loop records when it last ran, and a single
+    :class:`LoopWatchdog` thread shared by every websocket warns, with the stack of
+    the loop thread, for as long as the loop is blocked.
+
+    Parameters
+    ----------
+    loop: :class:`asyncio.AbstractEventLoop`
+        The event loop the heartbeats are sent from.
+    watchdog_interval: :class:`float`
+        How often to check whether the event loop is blocked.
+    block_threshold: :class:`float`
+        How many seconds the event loop may be late before a warning is logged.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        *,
+        watchdog_interval: float = 1.0,
+        block_threshold: float = 10.0,
+    ) -> None:
+        self.loop: asyncio.AbstractEventLoop = loop
+        self.watchdog_interval: float = watchdog_interval
+        self.block_threshold: float = block_threshold
+        self._heap: List[Tuple[float, int, LoopKeepAliveHandler]] = []
+        self._counter = itertools.count()
+        self._handlers: Dict[int, LoopKeepAliveHandler] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_when: float = float("inf")
+        self._watchdog: Optional[asyncio.TimerHandle] = None
+        self._watchdog_thread: Optional[LoopWatchdog] = None
+        # time.perf_counter() of the last run of the watchdog timer, read by the watchdog thread
+        self._last_tick: float = time.perf_counter()
+        self.loop_lag: float = 0.0
+
+    @property
+    def handlers(self) -> List[LoopKeepAliveHandler]:
+        return list(self._handlers.values())
+
+    def jitters(self) -> Dict[Optional[int], float]:
+        """Maps the shard ID of every running gateway heartbeat to its latest jitter."""
+        return {
+            handler.shard_id: handler.jitter
+            for handler in self._handlers.values()
+            if not isinstance(handler, VoiceLoopKeepAliveHandler)
+        }
+
+    def register(self, handler: LoopKeepAliveHandler) -> None:
+        self._handlers[id(handler)] = handler
+        if self._watchdog is None:
+            self._last_tick = time.perf_counter()
+            when = self.loop.time() + self.watchdog_interval
+            self._watchdog = self.loop.call_at(when, self._check_lag, when)
+            # handlers are started from the loop thread
+            self._watchdog_thread = LoopWatchdog(self, threading.get_ident())
+            self._watchdog_thread.start()
+
+    def unregister(self, handler: LoopKeepAliveHandler) -> None:
+        # stale heap entries are skipped when they come due
+        self._handlers.pop(id(handler), None)
+        if not self._handlers:
+            if self._watchdog is not None:
+                self._watchdog.cancel()
+                self._watchdog = None
+            if self._watchdog_thread is not None:
+                self._watchdog_thread.stop()
+                self._watchdog_thread = None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+                self._timer_when = float("inf")
+            self._heap.clear()
+
+    def schedule(self, handler: LoopKeepAliveHandler, when: float) -> None:
+        heapq.heappush(self._heap, (when, next(self._counter), handler))
+        if when < self._timer_when:
+            self._arm(when)
+
+    def _arm(self, when: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_when = when
+        self._timer = self.loop.call_at(when, self._run)
+
+    def _run(self) -> None:
+        self._timer = None
+        self._timer_when = float("inf")
+        now = self.loop.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            when, _, handler = heapq.heappop(heap)
+            if handler._deadline != when or id(handler) not in self._handlers:
+                continue
+            handler._beat(when)
+
+        if heap:
+            self._arm(heap[0][0])
+
+    def _check_lag(self, expected: float) -> None:
+        self._last_tick = time.perf_counter()
+        now = self.loop.time()
+        self.loop_lag = lag = now - expected
+        if lag > self.block_threshold:
+            _log.warning(
+                "Can't keep up, the event loop was blocked for %.1fs. "
+                "Heartbeats for %d websockets were delayed.",
+                lag,
+                len(self._handlers),
+            )
+
+        when = now + self.watchdog_interval
+        self._watchdog = self.loop.call_at(when, self._check_lag, when)
+
+
+class LoopWatchdog(threading.Thread):
+    """The thread of a :class:`HeartbeatScheduler` that watches its event loop.
+
+    While the watchdog timer of the scheduler has not run for more than
+    ``block_threshold`` seconds, a warning with the stack of the loop thread is logged
+    every ``block_threshold`` seconds, so that the code blocking the loop can be found
+    while it still is.
+    """
+
+    def __init__(self, scheduler: HeartbeatScheduler, thread_id: int) -> None:
+        threading.Thread.__init__(self, name="nextcord-loop-watchdog", daemon=True)
+        self.scheduler: HeartbeatScheduler = scheduler
+        self.thread_id: int = thread_id
+        self.block_msg: str = (
+            "The event loop has been blocked for more than %.1f seconds. "
+            "Heartbeats for %d websockets are delayed."
+        )
+        self._stop_ev: threading.Event = threading.Event()
+
+    def run(self) -> None:
+        scheduler = self.scheduler
+        # how long the current block had lasted when it was last reported
+        reported = 0.0
+        while not self._stop_ev.wait(scheduler.watchdog_interval):
+            # the watchdog timer is due watchdog_interval seconds after its last run
+            blocked = time.perf_counter() - scheduler._last_tick - scheduler.watchdog_interval
+            if blocked < scheduler.block_threshold:
+                reported = 0.0
+                continue
+            if blocked - reported < scheduler.block_threshold:
+                continue
+
+            reported = blocked
+            try:
+                frame = sys._current_frames()[self.thread_id]
+            except KeyError:
+                _log.warning(self.block_msg, blocked, len(scheduler._handlers))
+            else:
+                stack = "".join(traceback.format_stack(frame))
+                _log.warning(
+                    "%s\nLoop thread traceback (most recent call last):\n%s",
+                    self.block_msg % (blocked, len(scheduler._handlers)),
+                    stack,
+                )
+
+    def stop(self) -> None:
+        self._stop_ev.set()
+
+
+class LoopKeepAliveHandler:
+    """A keep alive handler driven by a :class:`HeartbeatScheduler` instead of a thread.
+
+    It has the same interface as :class:`KeepAliveHandler`.
+    """
+
+    def __init__(
+        self,
+        *,
+        ws: Union[DiscordWebSocket, DiscordVoiceWebSocket],
+        interval: float,
+        scheduler: HeartbeatScheduler,
+        shard_id: Optional[int] = None,
+    ) -> None:
+        self.ws = ws
+        self.interval: float = interval
+        self.shard_id: Optional[int] = shard_id
+        self.scheduler: HeartbeatScheduler = scheduler
+        self.msg: str = "Keeping shard ID %s websocket alive with sequence %s."
+        self.block_msg: str = "Shard ID %s heartbeat blocked for more than %s seconds."
+        self.behind_msg: str = "Can't keep up, shard ID %s websocket is %.1fs behind."
+        self._deadline: float = 0.0
+        self._stopped: bool = False
+        self._task: Optional[asyncio.Task] = None
+        self._last_ack: float = time.perf_counter()
+        self._last_send: float = time.perf_counter()
+        self._last_recv: float = time.perf_counter()
+        self.latency: float = float("inf")
+        # seconds between a heartbeat being due and it actually being sent
+        self.jitter: float = 0.0
+        self.recent_jitters: Deque[float] = deque(maxlen=20)
+        self.heartbeat_timeout: float = ws._max_heartbeat_timeout
+
+    @property
+    def average_jitter(self) -> float:
+        if not self.recent_jitters:
+            return 0.0
+        return sum(self.recent_jitters) / len(self.recent_jitters)
+
+    def start(self) -> None:
+        self.scheduler.register(self)
+        self._deadline = self.scheduler.loop.time() + self.interval
+        self.scheduler.schedule(self, self._deadline)
+
+    def is_alive(self) -> bool:
+        return not self._stopped
+
+    def _beat(self, deadline: float) -> None:
+        if self._last_recv + self.heartbeat_timeout < time.perf_counter():
+            _log.warning(
+                "Shard ID %s has stopped responding to the gateway. Closing and restarting.",
+                self.shard_id,
+            )
+            self.stop()
+            self._task = asyncio.create_task(self._close())
+            return
+
+        # schedule the next beat off the previous deadline to avoid drift,
+        # unless we are so far behind that a beat would be skipped anyway
+        now = self.scheduler.loop.time()
+        next_deadline = deadline + self.interval
+        if next_deadline <= now:
+            next_deadline = now + self.interval
+        self._deadline = next_deadline
+        self.scheduler.schedule(self, next_deadline)
+
+        if self._task is not None and not self._task.done():
+            # the previous heartbeat still has not been sent
+            _log.warning(self.block_msg, self.shard_id, now - deadline)
+            return
+
+        data = self.get_payload()
+        _log.debug(self.msg, self.shard_id, data["d"])
+        self._task = asyncio.create_task(self._send(data, deadline))
+
+    async def _send(self, data: Dict[str, Any], deadline: float) -> None:
+        try:
+            await self.ws.send_heartbeat(data)
+        except Exception:
+            self.stop()
+        else:
+            self._last_send = time.perf_counter()
+            self.jitter = jitter = self.scheduler.loop.time() - deadline
+            self.recent_jitters.append(jitter)
+
+    async def _close(self) -> None:
+        try:
+            await self.ws.close(4000)
+        except Exception:
+            _log.exception("An error occurred while stopping the gateway. Ignoring.")
+
+    def get_payload(self) -> Dict[str, Any]:
+        return {"op": self.ws.HEARTBEAT, "d": self.ws.sequence}  # type: ignore
+
+    def stop(self) -> None:
+        self._stopped = True
+        self.scheduler.unregister(self)
+
+    def tick(self) -> None:
+        self._last_recv = time.perf_counter()
+
+    def ack(self) -> None:
+        ack_time = time.perf_counter()
+        self._last_ack = ack_time
+        self.latency = ack_time - self._last_send
+        if self.latency > 10:
+            _log.warning(self.behind_msg, self.shard_id, self.latency)
+
+
+class VoiceLoopKeepAliveHandler(LoopKeepAliveHandler):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.recent_ack_latencies = deque(maxlen=20)
+        self.msg = "Keeping shard ID %s voice websocket alive with timestamp %s."
+        self.block_msg = "Shard ID %s voice heartbeat blocked for more than %s seconds"
+        self.behind_msg = "High socket latency, shard ID %s heartbeat is %.1fs behind"
+
+    def get_payload(self) -> Dict[str, int]:
+        return {"op": self.ws.HEARTBEAT, "d": int(time.time() * 1000)}
+
+    def ack(self) -> None:
+        ack_time = time.perf_counter()
+        self._last_ack = ack_time
+        self._last_recv = ack_time
+        self.latency = ack_time - self._last_send
+        self.recent_ack_latencies.append(self.latency)
+
+
 class DiscordClientWebSocketResponse(aiohttp.ClientWebSocketResponse):
     async def close(self, *, code: int = 4000, message: bytes = b"") -> bool:
         return await super().close(code=code, message=message)
@@ -281,27 +683,47 @@ class DiscordWebSocket:
         _max_heartbeat_timeout: float
 
     def __init__(
-        self, socket: aiohttp.ClientWebSocketResponse, *, loop: asyncio.AbstractEventLoop
+        self,
+        socket: aiohttp.ClientWebSocketResponse,
+        *,
+        loop: asyncio.AbstractEventLoop,
+        compress: Optional[str] = "zlib-stream",
+        encoding: str = "json",
     ) -> None:
         self.socket: aiohttp.ClientWebSocketResponse = socket
         self.loop: asyncio.AbstractEventLoop = loop
 
         # an empty dispatcher to prevent crashes
         self._dispatch: VariadicArgNone = lambda *_args: None
+        # runs a parser with the data of an event, when parsers are not called directly
+        self._parse_event: Optional[Callable[[Callable[[Any], None], Any], None]] = None
         # generic event listeners
-        self._dispatch_listeners: List[EventListener] = []
+        # event name: listeners waiting for it
+        self._dispatch_listeners: Dict[str, List[EventListener]] = {}
         # the keep alive
-        self._keep_alive: Optional[KeepAliveHandler] = None
+        self._keep_alive: Optional[Union[KeepAliveHandler, LoopKeepAliveHandler]] = None
         self.thread_id: int = threading.get_ident()
 
         # ws related stuff
         self.session_id: Optional[str] = None
         self.resume_url: Optional[str] = None
         self.sequence: Optional[int] = None
-        self._zlib = zlib.decompressobj()
-        self._buffer: bytearray = bytearray()
+        self._compress: Optional[str] = compress
+        self._decompressor: Optional[Union[_ZlibStreamDecompressor, _ZstdStreamDecompressor]] = (
+            _TRANSPORT_DECOMPRESSORS[compress]() if compress is not None else None
+        )
+        self._encoding: str = encoding
+        if encoding == "etf":
+            self._encode: Callable[[Any], Union[str, bytes]] = etf.pack
+            self._decode: Callable[[Union[str, bytes]], Any] = etf.unpack
+        else:
+            self._encode = utils.to_json
+            self._decode = utils.from_json
         self._close_code: Optional[int] = None
         self._rate_limiter: GatewayRatelimiter = GatewayRatelimiter()
+        # JSON frames are filtered by scanning their envelope, ETF frames once decoded
+        self._filter_events: bool = False
+        self._filter_decoded: bool = False
 
     @property
     def open(self) -> bool:
@@ -311,6 +733,8 @@ class DiscordWebSocket:
         return self._rate_limiter.is_ratelimited()
 
     def debug_log_receive(self, data: Any, /) -> None:
+        if type(data) is bytes and self._encoding == "json":
+            data = data.decode("utf-8")
         self._dispatch("socket_raw_receive", data)
 
     def log_receive(self, _, /) -> None:
@@ -333,19 +757,25 @@ class DiscordWebSocket:
 
         This is for internal use only.
         """
+        compress = client._connection._gateway_compression
+        encoding = client._connection._gateway_encoding
+        # only the unformatted URL can be formatted again for the next resume
+        resume_url = gateway if format_gateway else None
         if not gateway:
-            gateway = await client.http.get_gateway()
+            gateway = await client.http.get_gateway(encoding=encoding, compress=compress)
         elif format_gateway:
-            gateway = client.http.format_websocket_url(gateway)
+            gateway = client.http.format_websocket_url(gateway, encoding, compress)
 
         socket = await client.http.ws_connect(gateway)
-        ws = cls(socket, loop=client.loop)
+        ws = cls(socket, loop=client.loop, compress=compress, encoding=encoding)
 
         # dynamically add attributes needed
         ws.token = client.http.token  # type: ignore
         ws._connection = client._connection
         ws._discord_parsers = client._connection.parsers
         ws._dispatch = client.dispatch
+        if client._inline_dispatch and client._event_pool is None:
+            ws._parse_event = client._parse_inline
         ws.gateway = gateway
         ws.call_hooks = client._connection.call_hooks
         ws._initial_identify = initial
@@ -355,6 +785,8 @@ class DiscordWebSocket:
         ws.session_id = session
         ws.sequence = sequence
         ws._max_heartbeat_timeout = client._connection.heartbeat_timeout
+        ws._filter_events = client._connection._filters_events and encoding == "json"
+        ws._filter_decoded = client._connection._filters_events and encoding == "etf"
 
         if client._enable_debug_events:
             ws.send = ws.debug_send
@@ -371,6 +803,9 @@ class DiscordWebSocket:
             await ws.identify()
             return ws
 
+        # RESUMED does not send the URL again, so it is kept for the next resume
+        if resume_url:
+            ws.resume_url = resume_url
         await ws.resume()
         return ws
 
@@ -398,7 +833,7 @@ class DiscordWebSocket:
 
         future = self.loop.create_future()
         entry = EventListener(event=event, predicate=predicate, result=result, future=future)
-        self._dispatch_listeners.append(entry)
+        self._dispatch_listeners.setdefault(event, []).append(entry)
         return future
 
     async def identify(self) -> None:
@@ -414,7 +849,8 @@ class DiscordWebSocket:
                     "browser": "nextcord",
                     "device": "nextcord",
                 },
-                "compress": True,
+                # payload compression is only understood alongside zlib-stream
+                "compress": self._compress == "zlib-stream",
                 "large_threshold": 250,
                 "intents": state._intents.value,
             },
@@ -446,21 +882,34 @@ class DiscordWebSocket:
         _log.info("Shard ID %s has sent the RESUME payload.", self.shard_id)
 
     async def received_message(self, msg: Union[str, bytes], /) -> None:
-        if type(msg) is bytes:
-            self._buffer.extend(msg)
-
-            if len(msg) < 4 or msg[-4:] != b"\x00\x00\xff\xff":
+        if type(msg) is bytes and self._decompressor is not None:
+            data = self._decompressor.decompress(msg)
+            if data is None:
+                # the rest of a fragmented payload is still to come
                 return
-            msg = self._zlib.decompress(self._buffer)
-            msg = msg.decode("utf-8")
-            self._buffer = bytearray()
+            msg = data
+
+            # the decoders take the bytes as they are,
+            # so no intermediate str is created here
 
         self.log_receive(msg)
-        message: Dict[str, Any] = utils.from_json(msg)
+        if self._filter_events and self._drop_unwanted(msg):
+            return
 
-        _log.debug("For Shard ID %s: WebSocket Event: %s", self.shard_id, msg)
+        message: Dict[str, Any] = self._decode(msg)
+
+        if _log.isEnabledFor(logging.DEBUG):
+            if self._encoding == "etf":
+                logged = message
+            else:
+                logged = msg.decode("utf-8") if type(msg) is bytes else msg
+            _log.debug("For Shard ID %s: WebSocket Event: %s", self.shard_id, logged)
         event = message.get("t")
         if event:
+            if self._filter_decoded and self._is_unwanted(event):
+                self._skip_dispatch(message["s"])
+                return
+
             self._dispatch("socket_event_type", event)
 
         op: int = message["op"]
@@ -494,9 +943,15 @@ class DiscordWebSocket:
 
             if op == self.HELLO:
                 interval = data["heartbeat_interval"] / 1000.0
-                self._keep_alive = KeepAliveHandler(
-                    ws=self, interval=interval, shard_id=self.shard_id
-                )
+                scheduler = self._connection._heartbeat_scheduler
+                if scheduler is not None:
+                    self._keep_alive = LoopKeepAliveHandler(
+                        ws=self, interval=interval, scheduler=scheduler, shard_id=self.shard_id
+                    )
+                else:
+                    self._keep_alive = KeepAliveHandler(
+                        ws=self, interval=interval, shard_id=self.shard_id
+                    )
                 # send a heartbeat immediately
                 await self.send_as_json(self._keep_alive.get_payload())
                 self._keep_alive.start()
@@ -547,14 +1002,30 @@ class DiscordWebSocket:
         except KeyError:
             _log.debug("Unknown event %s.", event)
         else:
-            func(data)
+            parse = self._parse_event
+            if parse is None:
+                func(data)
+            else:
+                parse(func, data)
+
+        task = self._connection._parse_task
+        if task is not None:
+            # the payload is being parsed in slices, later events must wait for it
+            self._connection._parse_task = None
+            await task
+
+        pool = self._connection._event_pool
+        if pool is not None and pool.overflow == "block" and pool.is_full():
+            # stop reading until handlers catch up
+            await pool.wait_for_capacity()
+
+        listeners = self._dispatch_listeners.get(event)
+        if not listeners:
+            return
 
         # remove the dispatched listeners
         removed = []
-        for index, entry in enumerate(self._dispatch_listeners):
-            if entry.event != event:
-                continue
-
+        for index, entry in enumerate(listeners):
             future = entry.future
             if future.cancelled():
                 removed.append(index)
@@ -572,7 +1043,43 @@ class DiscordWebSocket:
                     removed.append(index)
 
         for index in reversed(removed):
-            del self._dispatch_listeners[index]
+            del listeners[index]
+        if not listeners:
+            del self._dispatch_listeners[event]
+
+    def _drop_unwanted(self, msg: Union[str, bytes]) -> bool:
+        # Only the envelope before "d" is inspected, so nested "t" or "s" keys
+        # can never match. If Discord sends "d" first, the frame is parsed as usual.
+        is_bytes = type(msg) is bytes
+        end = msg.find(b'"d":' if is_bytes else '"d":')  # type: ignore
+        if end == -1:
+            return False
+
+        envelope = msg[:end] if is_bytes else msg[:end].encode()  # type: ignore
+        match = _ENVELOPE_EVENT.search(envelope)
+        if match is None or _ENVELOPE_DISPATCH.search(envelope) is None:
+            return False
+
+        if not self._is_unwanted(match.group(1).decode()):
+            return False
+
+        seq = _ENVELOPE_SEQUENCE.search(envelope)
+        self._skip_dispatch(None if seq is None else int(seq.group(1)))
+        return True
+
+    def _is_unwanted(self, event: str) -> bool:
+        if event in _REQUIRED_EVENTS or self._connection._is_event_wanted(event):
+            return False
+
+        return event not in self._dispatch_listeners
+
+    def _skip_dispatch(self, seq: Optional[int]) -> None:
+        # the dispatch is dropped, but the sequence must still be tracked for RESUME
+        if seq is not None:
+            self.sequence = seq
+
+        if self._keep_alive:
+            self._keep_alive.tick()
 
     @property
     def latency(self) -> float:
@@ -580,6 +1087,12 @@ class DiscordWebSocket:
         heartbeat = self._keep_alive
         return float("inf") if heartbeat is None else heartbeat.latency
 
+    @property
+    def heartbeat_jitter(self) -> float:
+        """:class:`float`: How late, in seconds, the most recent HEARTBEAT was sent compared to when it was due."""
+        heartbeat = self._keep_alive
+        return float("nan") if heartbeat is None else heartbeat.jitter
+
     def _can_handle_close(self) -> bool:
         code = self._close_code or self.socket.close_code
         return code not in (1000, 4004, 4010, 4011, 4012, 4013, 4014)
@@ -624,18 +1137,25 @@ class DiscordWebSocket:
             _log.info("Websocket closed with %s, cannot reconnect.", code)
             raise ConnectionClosed(self.socket, shard_id=self.shard_id, code=code) from None
 
+    async def _send_frame(self, data: Union[str, bytes], /) -> None:
+        if type(data) is bytes:
+            await self.socket.send_bytes(data)
+        else:
+            await self.socket.send_str(data)  # type: ignore
+
     async def debug_send(self, data: Any, /) -> None:
         await self._rate_limiter.block()
         self._dispatch("socket_raw_send", data)
-        await self.socket.send_str(data)
+        await self._send_frame(data)
 
     async def send(self, data: Any, /) -> None:
         await self._rate_limiter.block()
-        await self.socket.send_str(data)
+        await self._send_frame(data)
 
     async def send_as_json(self, data: Any) -> None:
+        # sends in the gateway encoding, which is JSON unless ETF was requested
         try:
-            await self.send(utils.to_json(data))
+            await self.send(self._encode(data))
         except RuntimeError as exc:
             if not self._can_handle_close():
                 raise ConnectionClosed(self.socket, shard_id=self.shard_id) from exc
@@ -643,7 +1163,7 @@ class DiscordWebSocket:
     async def send_heartbeat(self, data: Any) -> None:
         # This bypasses the rate limit handling code since it has a higher priority
         try:
-            await self.socket.send_str(utils.to_json(data))
+            await self._send_frame(self._encode(data))
         except RuntimeError as exc:
             if not self._can_handle_close():
                 raise ConnectionClosed(self.socket, shard_id=self.shard_id) from exc
@@ -670,9 +1190,8 @@ class DiscordWebSocket:
             "d": {"activities": activities, "afk": False, "since": since, "status": status},
         }
 
-        sent = utils.to_json(payload)
-        _log.debug('Sending "%s" to change status', sent)
-        await self.send(sent)
+        _log.debug('Sending "%s" to change status', payload)
+        await self.send(self._encode(payload))
 
     async def request_chunks(
         self,
@@ -788,7 +1307,7 @@ class DiscordVoiceWebSocket:
     ) -> None:
         self.ws: DiscordClientWebSocketResponse = socket
         self.loop: asyncio.AbstractEventLoop = loop
-        self._keep_alive: Optional[VoiceKeepAliveHandler] = None
+        self._keep_alive: Optional[Union[VoiceKeepAliveHandler, VoiceLoopKeepAliveHandler]] = None
         self._close_code: Optional[int] = None
         self.secret_key: Optional[List[int]] = None
         self._hook: Optional[Callable[..., Awaitable[None]]] = (
@@ -896,7 +1415,13 @@ class DiscordVoiceWebSocket:
             await self.load_secret_key(data)
         elif op == self.HELLO:
             interval = data["heartbeat_interval"] / 1000.0
-            self._keep_alive = VoiceKeepAliveHandler(ws=self, interval=min(interval, 5.0))
+            scheduler = self._connection._state._heartbeat_scheduler
+            if scheduler is not None:
+                self._keep_alive = VoiceLoopKeepAliveHandler(
+                    ws=self, interval=min(interval, 5.0), scheduler=scheduler
+                )
+            else:
+                self._keep_alive = VoiceKeepAliveHandler(ws=self, interval=min(interval, 5.0))
             self._keep_alive.start()
 
         if self._hook is not None:
@@ -15,6 +15,7 @@ from typing import (
     Dict,
     List,
     Literal,
+    MutableMapping,
     NamedTuple,
     Optional,
     Sequence,
@@ -60,6 +61,7 @@ from .integrations import Integration, _integration_factory
 from .invite import Invite
 from .iterators import AuditLogIterator, BanIterator, MemberIterator, ScheduledEventIterator
 from .member import Member, VoiceState
+from .member_store import ColumnarMemberStore
 from .mixins import Hashable
 from .partial_emoji import PartialEmoji
 from .permissions import PermissionOverwrite
@@ -89,6 +91,7 @@ if TYPE_CHECKING:
     from .permissions import Permissions
     from .state import ConnectionState
     from .template import Template
+    from .types.activity import PartialPresenceUpdate
     from .types.auto_moderation import AutoModerationRuleCreate
     from .types.channel import GuildChannel as GuildChannelPayload
     from .types.guild import (
@@ -100,6 +103,7 @@ if TYPE_CHECKING:
     )
     from .types.integration import IntegrationType
     from .types.interactions import ApplicationCommand as ApplicationCommandPayload
+    from .types.member import MemberWithUser as MemberWithUserPayload
     from .types.scheduled_events import ScheduledEvent as ScheduledEventPayload
     from .types.snowflake import SnowflakeList
     from .types.sticker import CreateGuildSticker
@@ -317,48 +321,79 @@ class Guild(Hashable):
     }
 
     def __init__(self, *, data: GuildPayload, state: ConnectionState) -> None:
-        self._channels: Dict[int, GuildChannel] = {}
-        self._members: Dict[int, Member] = {}
+        self._state: ConnectionState = state
+        self._new_caches()
         self._scheduled_events: Dict[int, ScheduledEvent] = {}
         self._voice_states: Dict[int, VoiceState] = {}
-        self._threads: Dict[int, Thread] = {}
         self._application_commands: Dict[int, BaseApplicationCommand] = {}
-        self._state: ConnectionState = state
         self._from_data(data)
 
+    def _new_caches(self) -> None:
+        state = self._state
+        self._channels: MutableMapping[int, GuildChannel] = state._new_cache(
+            "channels", self._evict_channel
+        )
+        self._members: MutableMapping[int, Member] = self._new_member_store()
+        self._threads: MutableMapping[int, Thread] = state._new_cache(
+            "threads", self._evict_channel
+        )
+
+    def _new_member_store(self) -> MutableMapping[int, Member]:
+        if self._state.member_cache_flags.columnar:
+            return ColumnarMemberStore(self)
+        return self._state._new_cache("members", self._evict_member)
+
+    def _evict_member(self, user_id: int, member: Member) -> None:
+        if self._state._pin_users:
+            self._state._users.unpin(user_id)  # type: ignore
+
+    def _evict_channel(self, channel_id: int, channel: Union[GuildChannel, Thread]) -> None:
+        self._state._unindex_channel(channel_id)
+
     def _add_channel(self, channel: GuildChannel, /) -> None:
         self._channels[channel.id] = channel
+        self._state._index_channel(self.id, channel.id)
 
     def _remove_channel(self, channel: Snowflake, /) -> None:
         self._channels.pop(channel.id, None)
+        self._state._unindex_channel(channel.id)
 
     def _voice_state_for(self, user_id: int, /) -> Optional[VoiceState]:
         return self._voice_states.get(user_id)
 
     def _add_member(self, member: Member, /) -> None:
-        self._members[member.id] = member
+        members = self._members
+        if self._state._pin_users and member.id not in members:
+            self._state._users.pin(member.id)  # type: ignore
+        members[member.id] = member
 
     def _store_thread(self, payload: ThreadPayload, /) -> Thread:
         thread = Thread(guild=self, state=self._state, data=payload)
-        self._threads[thread.id] = thread
+        self._add_thread(thread)
         return thread
 
     def _remove_member(self, member: Snowflake, /) -> None:
-        self._members.pop(member.id, None)
+        if self._members.pop(member.id, None) is not None and self._state._pin_users:
+            self._state._users.unpin(member.id)  # type: ignore
 
     def _add_thread(self, thread: Thread, /) -> None:
         self._threads[thread.id] = thread
+        self._state._index_channel(self.id, thread.id)
 
     def _remove_thread(self, thread: Snowflake, /) -> None:
         self._threads.pop(thread.id, None)
+        self._state._unindex_channel(thread.id)
 
     def _clear_threads(self) -> None:
+        for k in self._threads:
+            self._state._unindex_channel(k)
         self._threads.clear()
 
     def _remove_threads_by_channel(self, channel_id: int) -> None:
         to_remove = [k for k, t in self._threads.items() if t.parent_id == channel_id]
         for k in to_remove:
             del self._threads[k]
+            self._state._unindex_channel(k)
 
     def _filter_threads(self, channel_ids: Set[int]) -> Dict[int, Thread]:
         to_remove: Dict[int, Thread] = {
@@ -366,17 +401,20 @@ class Guild(Hashable):
         }
         for k in to_remove:
             del self._threads[k]
+            self._state._unindex_channel(k)
         return to_remove
 
     def _add_scheduled_event(self, event: ScheduledEvent) -> None:
         self._scheduled_events[event.id] = event
+        self._state._index_scheduled_event(self.id, event.id)
 
     def _remove_scheduled_event(self, event: int) -> None:
         self._scheduled_events.pop(event, None)
+        self._state._unindex_scheduled_event(event)
 
     def _store_scheduled_event(self, payload: ScheduledEventPayload) -> ScheduledEvent:
         event = ScheduledEvent(guild=self, state=self._state, data=payload)
-        self._scheduled_events[event.id] = event
+        self._add_scheduled_event(event)
         return event
 
     def __str__(self) -> str:
@@ -509,13 +547,7 @@ class Guild(Hashable):
             stage_instance = StageInstance(guild=self, data=s, state=state)
             self._stage_instances[stage_instance.id] = stage_instance
 
-        cache_joined = self._state.member_cache_flags.joined
-        self_id = self._state.self_id
-        for mdata in guild.get("members", []):
-            member = Member(data=mdata, guild=self, state=state)  # type: ignore
-            if cache_joined or member.id == self_id:
-                self._add_member(member)
-
+        self._add_members_from_data(guild.get("members", []))
         self._sync(guild)
         self._large: Optional[bool] = None if member_count is None else self._member_count >= 250
 
@@ -536,18 +568,31 @@ class Guild(Hashable):
             guild, "safety_alerts_channel_id"
         )
 
-    # TODO: refactor/remove?
-    def _sync(self, data: GuildPayload) -> None:
-        with contextlib.suppress(KeyError):
-            self._large = data["large"]
+    # these are also called by the state with slices of a large GUILD_CREATE
+    def _add_members_from_data(self, members: List[MemberWithUserPayload]) -> None:
+        state = self._state
+        cache_joined = state.member_cache_flags.joined
+        self_id = state.self_id
+        for mdata in members:
+            member = Member(data=mdata, guild=self, state=state)
+            if cache_joined or member.id == self_id:
+                self._add_member(member)
 
+    def _update_presences(self, presences: List[PartialPresenceUpdate]) -> None:
         empty_tuple = ()
-        for presence in data.get("presences", []):
+        for presence in presences:
             user_id = int(presence["user"]["id"])
             member = self.get_member(user_id)
             if member is not None:
                 member._presence_update(presence, empty_tuple)  # type: ignore
 
+    # TODO: refactor/remove?
+    def _sync(self, data: GuildPayload) -> None:
+        with contextlib.suppress(KeyError):
+            self._large = data["large"]
+
+        self._update_presences(data.get("presences", []))
+
         if "channels" in data:
             channels = data["channels"]
             for c in channels:
@@ -1260,7 +1305,7 @@ class Guild(Hashable):
         # payload *should* contain all text channel info
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     async def create_voice_channel(
@@ -1353,7 +1398,7 @@ class Guild(Hashable):
         # payload *should* contain all voice channel info
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     async def create_stage_channel(
@@ -1466,7 +1511,7 @@ class Guild(Hashable):
         # payload *should* contain all stage channel info
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     async def create_category(
@@ -1511,7 +1556,7 @@ class Guild(Hashable):
         # payload *should* contain all category channel info
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     async def create_forum_channel(
@@ -1640,7 +1685,7 @@ class Guild(Hashable):
         # payload *should* contain all forum channel info
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     create_category_channel = create_category
@@ -3358,6 +3403,11 @@ class Guild(Hashable):
 
             .. versionadded:: 1.4
 
+            .. versionchanged:: 3.0
+                Concurrent lookups by user ID without presences are merged into requests
+                of up to 100 IDs, and IDs that were not found are not requested again for
+                a few seconds, unless the member joins in the meantime.
+
 
         Raises
         ------
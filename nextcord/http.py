@@ -3,15 +3,17 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
 import sys
-import weakref
+from collections import deque
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     ClassVar,
     Coroutine,
+    Deque,
     Dict,
     Iterable,
     List,
@@ -19,7 +21,6 @@ from typing import (
     Optional,
     Sequence,
     Tuple,
-    Type,
     TypeVar,
     Union,
 )
@@ -44,10 +45,6 @@ from .utils import MISSING
 _log = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
-    from types import TracebackType
-
-    from typing_extensions import Self
-
     from .enums import AuditLogAction, InteractionResponseType
     from .types import (
         appinfo,
@@ -57,6 +54,7 @@ if TYPE_CHECKING:
         components,
         embed,
         emoji,
+        gateway,
         guild,
         integration,
         interactions,
@@ -76,7 +74,6 @@ if TYPE_CHECKING:
     from .types.snowflake import Snowflake, SnowflakeList
 
     T = TypeVar("T")
-    BE = TypeVar("BE", bound=BaseException)
     Response = Coroutine[Any, Any, T]
 
 
@@ -123,26 +120,167 @@ class Route:
         # the bucket is just method + path w/ major parameters
         return f"{self.channel_id}:{self.guild_id}:{self.path}"
 
+    @property
+    def key(self) -> str:
+        # routes sharing a method and path are given the same bucket hash by Discord
+        return f"{self.method} {self.path}"
 
-class MaybeUnlock:
-    def __init__(self, lock: asyncio.Lock) -> None:
-        self.lock: asyncio.Lock = lock
-        self._unlock: bool = True
-
-    def __enter__(self) -> Self:
-        return self
-
-    def defer(self) -> None:
-        self._unlock = False
+    @property
+    def major_parameters(self) -> str:
+        return f"{self.channel_id}:{self.guild_id}:{self.webhook_id}:{self.webhook_token}"
 
-    def __exit__(
-        self,
-        exc_type: Optional[Type[BE]],
-        exc: Optional[BE],
-        traceback: Optional[TracebackType],
-    ) -> None:
-        if self._unlock:
-            self.lock.release()
+    @property
+    def global_exempt(self) -> bool:
+        # interaction callbacks and token-authenticated webhook routes do not
+        # count towards the global rate limit
+        return self.webhook_token is not None or self.path.startswith("/interactions/")
+
+
+class Ratelimit:
+    """Tracks a single rate limit bucket.
+
+    Up to ``remaining`` requests are allowed in flight at once. Once the bucket is
+    known to be depleted, requests wait for its reset window to pass instead of
+    running into a 429. Until the first response tells us the real limit, the
+    bucket behaves like a lock.
+    """
+
+    __slots__ = ("limit", "remaining", "reset_at", "_in_flight", "_waiters", "_loop")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.limit: int = 1
+        self.remaining: int = 1
+        # loop time at which the current window resets, 0.0 if no window is known
+        self.reset_at: float = 0.0
+        self._in_flight: int = 0
+        self._waiters: Deque[asyncio.Future[bool]] = deque()
+        self._loop: asyncio.AbstractEventLoop = loop
+
+    def __repr__(self) -> str:
+        return (
+            f"<Ratelimit limit={self.limit} remaining={self.remaining} "
+            f"in_flight={self._in_flight} reset_at={self.reset_at}>"
+        )
+
+    def _available(self) -> int:
+        if self.reset_at and self._loop.time() >= self.reset_at:
+            # the window has passed, so the bucket is full again
+            self.remaining = self.limit
+            self.reset_at = 0.0
+        return self.remaining - self._in_flight
+
+    def is_inactive(self) -> bool:
+        return not self._in_flight and not self._waiters and self._available() >= self.limit
+
+    async def acquire(self) -> None:
+        while self._available() <= 0:
+            if not self._in_flight and self.reset_at:
+                # nothing will report back before the window resets, so sleep it out
+                try:
+                    await asyncio.sleep(self.reset_at - self._loop.time())
+                except asyncio.CancelledError:
+                    # let the next waiter sleep it out instead
+                    self._wake()
+                    raise
+                continue
+
+            future: asyncio.Future[bool] = self._loop.create_future()
+            self._waiters.append(future)
+            try:
+                handed = await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # we were woken right before the cancellation, pass the slot
+                    # or the wake up on to the next waiter
+                    if future.result():
+                        self.release()
+                    else:
+                        self._wake()
+                raise
+            finally:
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(future)
+
+            if handed:
+                return
+
+        self._in_flight += 1
+        self._wake()
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        # every free slot is handed straight to the next waiter, so no more waiters
+        # are woken than can run, and newcomers cannot take the slot in between
+        waiters = self._waiters
+        available = self._available()
+        while waiters and available > 0:
+            future = waiters.popleft()
+            if not future.done():
+                self._in_flight += 1
+                available -= 1
+                future.set_result(True)
+
+        if waiters and not self._in_flight and self.reset_at:
+            # the bucket is depleted and nothing will release it before the window
+            # resets, so the next waiter sleeps the window out and wakes the rest
+            while waiters:
+                future = waiters.popleft()
+                if not future.done():
+                    future.set_result(False)
+                    break
+
+    def update(self, response: aiohttp.ClientResponse, *, use_clock: bool = False) -> None:
+        headers = response.headers
+        limit = headers.get("X-RateLimit-Limit")
+        remaining = headers.get("X-RateLimit-Remaining")
+        if limit is None or remaining is None:
+            return
+
+        reset_at = self._loop.time() + utils.parse_ratelimit_header(response, use_clock=use_clock)
+        self.limit = int(limit)
+        remaining = int(remaining)
+        # responses can arrive out of order, so within a window only ever move
+        # towards an emptier bucket
+        if not self.reset_at or remaining < self.remaining:
+            self.remaining = remaining
+            self.reset_at = max(self.reset_at, reset_at)
+
+    def exhaust(self, retry_after: float) -> None:
+        self.remaining = 0
+        self.reset_at = max(self.reset_at, self._loop.time() + retry_after)
+
+
+class GlobalRatelimit:
+    """Proactively keeps requests under the global rate limit.
+
+    Requests are counted in fixed windows of ``per`` seconds, and any request
+    beyond ``rate`` within a window waits for the next one.
+    """
+
+    __slots__ = ("rate", "per", "_count", "_window_end", "_loop")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, rate: int = 50, per: float = 1.0) -> None:
+        self.rate: int = rate
+        self.per: float = per
+        self._count: int = 0
+        self._window_end: float = 0.0
+        self._loop: asyncio.AbstractEventLoop = loop
+
+    async def acquire(self) -> None:
+        while True:
+            now = self._loop.time()
+            if now >= self._window_end:
+                self._window_end = now + self.per
+                self._count = 0
+
+            if self._count < self.rate:
+                self._count += 1
+                return
+
+            await asyncio.sleep(self._window_end - now)
 
 
 # For some reason, the Discord voice websocket expects this header to be
@@ -162,13 +300,21 @@ class HTTPClient:
         loop: Optional[asyncio.AbstractEventLoop] = None,
         unsync_clock: bool = True,
         dispatch: Callable,
+        max_global_requests: int = 50,
     ) -> None:
         self.loop: asyncio.AbstractEventLoop = asyncio.get_event_loop() if loop is None else loop
         self.connector = connector
         self.__session: aiohttp.ClientSession = MISSING  # filled in static_login
-        self._locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        # Route.key -> X-RateLimit-Bucket hash reported by Discord
+        self._bucket_hashes: Dict[str, str] = {}
+        # bucket hash (or Route.bucket until the hash is known) + major parameters -> Ratelimit
+        self._ratelimits: Dict[str, Ratelimit] = {}
+        self._ratelimit_prune_size: int = 256
+        self._global_ratelimit: GlobalRatelimit = GlobalRatelimit(self.loop, max_global_requests)
         self._global_over: asyncio.Event = asyncio.Event()
         self._global_over.set()
+        # loop time at which the latest global rate limit ends
+        self._global_reset_at: float = 0.0
         self.token: Optional[str] = None
         self.bot_token: bool = False
         self.proxy: Optional[str] = proxy
@@ -204,6 +350,41 @@ class HTTPClient:
 
         return await self.__session.ws_connect(url, **kwargs)
 
+    def _ratelimit_key(self, route: Route) -> str:
+        bucket_hash = self._bucket_hashes.get(route.key)
+        if bucket_hash is None:
+            return route.bucket
+        return f"{bucket_hash}:{route.major_parameters}"
+
+    def _get_ratelimit(self, route: Route) -> Ratelimit:
+        key = self._ratelimit_key(route)
+        try:
+            return self._ratelimits[key]
+        except KeyError:
+            pass
+
+        if len(self._ratelimits) >= self._ratelimit_prune_size:
+            self._prune_ratelimits()
+
+        self._ratelimits[key] = ratelimit = Ratelimit(self.loop)
+        return ratelimit
+
+    def _prune_ratelimits(self) -> None:
+        inactive = [key for key, ratelimit in self._ratelimits.items() if ratelimit.is_inactive()]
+        for key in inactive:
+            del self._ratelimits[key]
+
+        self._ratelimit_prune_size = max(256, len(self._ratelimits) * 2)
+
+    def _set_bucket_hash(self, route: Route, bucket_hash: str, ratelimit: Ratelimit) -> None:
+        if self._bucket_hashes.get(route.key) == bucket_hash:
+            return
+
+        self._bucket_hashes[route.key] = bucket_hash
+        # carry the state we already know over to the shared bucket,
+        # unless another route has already discovered it
+        self._ratelimits.setdefault(f"{bucket_hash}:{route.major_parameters}", ratelimit)
+
     async def request(
         self,
         route: Route,
@@ -212,15 +393,9 @@ class HTTPClient:
         form: Optional[Iterable[Dict[str, Any]]] = None,
         **kwargs: Any,
     ) -> Any:
-        bucket = route.bucket
         method = route.method
         url = route.url
 
-        lock = self._locks.get(bucket)
-        if lock is None:
-            lock = asyncio.Lock()
-            self._locks[bucket] = lock
-
         # header creation
         # user agent is provided by our aiohttp client already
         headers: Dict[str, str] = {}
@@ -248,143 +423,166 @@ class HTTPClient:
         if self.proxy_auth is not None:
             kwargs["proxy_auth"] = self.proxy_auth
 
-        if not self._global_over.is_set():
-            # wait until the global lock is complete
-            await self._global_over.wait()
-
         response: Optional[aiohttp.ClientResponse] = None
         data: Optional[Union[Dict[str, Any], str]] = None
-        await lock.acquire()
-        with MaybeUnlock(lock) as maybe_lock:
-            for tries in range(5):
-                if files:
-                    for f in files:
-                        f.reset(seek=tries)
-
-                if form:
-                    form_data = aiohttp.FormData(quote_fields=False)
-                    for params in form:
-                        form_data.add_field(**params)
-                    kwargs["data"] = form_data
-
-                try:
-                    async with self.__session.request(method, url, **kwargs) as response:
+        for tries in range(5):
+            if files:
+                for f in files:
+                    f.reset(seek=tries)
+
+            if form:
+                form_data = aiohttp.FormData(quote_fields=False)
+                for params in form:
+                    form_data.add_field(**params)
+                kwargs["data"] = form_data
+
+            if not route.global_exempt and not self._global_over.is_set():
+                # wait until the global lock is complete before taking a slot of the bucket
+                await self._global_over.wait()
+
+            # the bucket is looked up on every attempt, as the previous
+            # response may have told us which shared bucket this route is in
+            ratelimit = self._get_ratelimit(route)
+            await ratelimit.acquire()
+            try:
+                if not route.global_exempt:
+                    if not self._global_over.is_set():
+                        # the global lock was taken while we waited for the bucket
+                        await self._global_over.wait()
+
+                    await self._global_ratelimit.acquire()
+
+                async with self.__session.request(method, url, **kwargs) as response:
+                    _log.debug(
+                        "%s %s with %s has returned %s",
+                        method,
+                        url,
+                        kwargs.get("data"),
+                        response.status,
+                    )
+
+                    # even errors have text involved in them so this is safe to call
+                    data = await json_or_text(response)
+
+                    # check if we have rate limit header information
+                    is_global = bool(response.headers.get("X-RateLimit-Global", False))
+
+                    limit = response.headers.get("X-RateLimit-Limit", "")
+                    remaining = response.headers.get("X-Ratelimit-Remaining", "")
+
+                    bucket = response.headers.get("X-RateLimit-Bucket")
+                    if bucket is not None:
+                        self._set_bucket_hash(route, bucket, ratelimit)
+
+                    if response.status != 429:
+                        ratelimit.update(response, use_clock=self.use_clock)
+
+                    if remaining == "0" and response.status != 429:
+                        # we've depleted our current bucket
+                        delta = utils.parse_ratelimit_header(response, use_clock=self.use_clock)
                         _log.debug(
-                            "%s %s with %s has returned %s",
-                            method,
-                            url,
-                            kwargs.get("data"),
-                            response.status,
+                            "A rate limit bucket has been exhausted (bucket: %s, retry: %s).",
+                            bucket,
+                            delta,
+                        )
+                        self._dispatch(
+                            "http_ratelimit",
+                            int(limit),
+                            int(remaining),
+                            delta,
+                            bucket,
+                            response.headers.get("X-RateLimit-Scope"),
                         )
 
-                        # even errors have text involved in them so this is safe to call
-                        data = await json_or_text(response)
+                    # the request was successful so just return the text/json
+                    if 300 > response.status >= 200:
+                        _log.debug("%s %s has received %s", method, url, data)
+                        return data
 
-                        # check if we have rate limit header information
-                        is_global = bool(response.headers.get("X-RateLimit-Global", False))
+                    # we are being rate limited
+                    if response.status == 429:
+                        if not response.headers.get("Via") or isinstance(data, str):
+                            # Banned by Cloudflare more than likely.
+                            raise HTTPException(response, data)
 
-                        limit = response.headers.get("X-RateLimit-Limit", "")
-                        remaining = response.headers.get("X-Ratelimit-Remaining", "")
+                        fmt = 'We are being rate limited. Retrying in %.2f seconds. Handled under the bucket "%s"'
 
-                        bucket = response.headers.get("X-RateLimit-Bucket")
-                        if remaining == "0" and response.status != 429:
-                            # we've depleted our current bucket
-                            delta = utils.parse_ratelimit_header(response, use_clock=self.use_clock)
-                            _log.debug(
-                                "A rate limit bucket has been exhausted (bucket: %s, retry: %s).",
-                                bucket,
-                                delta,
+                        retry_after: float = data["retry_after"]
+                        _log.warning(fmt, retry_after, bucket)
+
+                        # check if it's a global rate limit
+                        if is_global:
+                            _log.warning(
+                                "Global rate limit has been hit. Retrying in %.2f seconds.",
+                                retry_after,
                             )
+                            self._dispatch(
+                                "global_http_ratelimit",
+                                retry_after,
+                            )
+                            # the slot of the bucket is released rather than held while
+                            # the global lock is taken, and the next attempt waits for it
+                            self._global_over.clear()
+                            reset_at = self.loop.time() + retry_after
+                            if reset_at > self._global_reset_at:
+                                self._global_reset_at = reset_at
+                                self.loop.call_at(reset_at, self._end_global_ratelimit, reset_at)
+                        else:
                             self._dispatch(
                                 "http_ratelimit",
                                 int(limit),
                                 int(remaining),
-                                delta,
+                                retry_after,
                                 bucket,
                                 response.headers.get("X-RateLimit-Scope"),
                             )
-                            maybe_lock.defer()
-                            self.loop.call_later(delta, lock.release)
-
-                        # the request was successful so just return the text/json
-                        if 300 > response.status >= 200:
-                            _log.debug("%s %s has received %s", method, url, data)
-                            return data
-
-                        # we are being rate limited
-                        if response.status == 429:
-                            if not response.headers.get("Via") or isinstance(data, str):
-                                # Banned by Cloudflare more than likely.
-                                raise HTTPException(response, data)
-
-                            fmt = 'We are being rate limited. Retrying in %.2f seconds. Handled under the bucket "%s"'
-
-                            # sleep a bit
-                            retry_after: float = data["retry_after"]
-                            _log.warning(fmt, retry_after, bucket)
-
-                            # check if it's a global rate limit
-                            if is_global:
-                                _log.warning(
-                                    "Global rate limit has been hit. Retrying in %.2f seconds.",
-                                    retry_after,
-                                )
-                                self._dispatch(
-                                    "global_http_ratelimit",
-                                    retry_after,
-                                )
-                                self._global_over.clear()
-                            else:
-                                self._dispatch(
-                                    "http_ratelimit",
-                                    int(limit),
-                                    int(remaining),
-                                    retry_after,
-                                    bucket,
-                                    response.headers.get("X-RateLimit-Scope"),
-                                )
-
-                            await asyncio.sleep(retry_after)
-                            _log.debug("Done sleeping for the rate limit. Retrying...")
-
-                            # release the global lock now that the
-                            # global rate limit has passed
-                            if is_global:
-                                self._global_over.set()
-                                _log.debug("Global rate limit is now over.")
-
-                            continue
-
-                        # we've received a 500, 502, or 504, unconditional retry
-                        if response.status in {500, 502, 504}:
-                            await asyncio.sleep(1 + tries * 2)
-                            continue
-
-                        # the usual error cases
-                        if response.status == 403:
-                            raise Forbidden(response, data)
-                        if response.status == 404:
-                            raise NotFound(response, data)
-                        if response.status >= 500:
-                            raise DiscordServerError(response, data)
-                        raise HTTPException(response, data)
-
-                # This is handling exceptions from the request
-                except OSError as e:
-                    # Connection reset by peer
-                    if tries < 4 and e.errno in (54, 10054):
-                        await asyncio.sleep(1 + tries * 2)
-                        continue
-                    raise
+                            # the bucket waits out the window for us and every
+                            # other request queued behind it
+                            ratelimit.exhaust(retry_after)
 
-            if response is not None:
-                # We've run out of retries, raise.
-                if response.status >= 500:
-                    raise DiscordServerError(response, data)
+                        continue
 
-                raise HTTPException(response, data)
+                    # we've received a 500, 502, or 504, unconditional retry
+                    if response.status in {500, 502, 504}:
+                        await asyncio.sleep(1 + tries * 2)
+                        continue
 
-            raise RuntimeError("Unreachable code in HTTP handling")
+                    # the usual error cases
+                    if response.status == 403:
+                        raise Forbidden(response, data)
+                    if response.status == 404:
+                        raise NotFound(response, data)
+                    if response.status >= 500:
+                        raise DiscordServerError(response, data)
+                    raise HTTPException(response, data)
+
+            # This is handling exceptions from the request
+            except OSError as e:
+                # Connection reset by peer
+                if tries < 4 and e.errno in (54, 10054):
+                    await asyncio.sleep(1 + tries * 2)
+                    continue
+                raise
+            finally:
+                ratelimit.release()
+
+        if response is not None:
+            # We've run out of retries, raise.
+            if response.status >= 500:
+                raise DiscordServerError(response, data)
+
+            raise HTTPException(response, data)
+
+        raise RuntimeError("Unreachable code in HTTP handling")
+
+    def _end_global_ratelimit(self, reset_at: float) -> None:
+        if reset_at != self._global_reset_at:
+            # a later global rate limit is still running
+            return
+
+        # release the global lock now that the global rate limit has passed
+        self._global_over.set()
+        _log.debug("Global rate limit is now over.")
 
     async def get_from_cdn(self, url: str) -> bytes:
         async with self.__session.get(url) as resp:
@@ -2381,30 +2579,38 @@ class HTTPClient:
         return self.request(Route("GET", "/oauth2/applications/@me"))
 
     @staticmethod
-    def format_websocket_url(url: str, encoding: str = "json", zlib: bool = True) -> str:
-        if zlib:
-            value = "{url}?encoding={encoding}&v={version}&compress=zlib-stream"
+    def format_websocket_url(
+        url: str, encoding: str = "json", compress: Optional[str] = "zlib-stream"
+    ) -> str:
+        if compress:
+            value = "{url}?encoding={encoding}&v={version}&compress={compress}"
         else:
             value = "{url}?encoding={encoding}&v={version}"
-        return value.format(url=url, encoding=encoding, version=_API_VERSION)
+        return value.format(url=url, encoding=encoding, version=_API_VERSION, compress=compress)
 
-    async def get_gateway(self, *, encoding: str = "json", zlib: bool = True) -> str:
+    async def get_gateway(
+        self, *, encoding: str = "json", compress: Optional[str] = "zlib-stream"
+    ) -> str:
         try:
             data = await self.request(Route("GET", "/gateway"))
         except HTTPException as exc:
             raise GatewayNotFound from exc
 
-        return self.format_websocket_url(data["url"], encoding, zlib)
+        return self.format_websocket_url(data["url"], encoding, compress)
 
     async def get_bot_gateway(
-        self, *, encoding: str = "json", zlib: bool = True
-    ) -> Tuple[int, str]:
+        self, *, encoding: str = "json", compress: Optional[str] = "zlib-stream"
+    ) -> Tuple[int, str, gateway.SessionStartLimit]:
         try:
-            data = await self.request(Route("GET", "/gateway/bot"))
+            data: gateway.GatewayBot = await self.request(Route("GET", "/gateway/bot"))
         except HTTPException as exc:
             raise GatewayNotFound from exc
 
-        return data["shards"], self.format_websocket_url(data["url"], encoding, zlib)
+        return (
+            data["shards"],
+            self.format_websocket_url(data["url"], encoding, compress),
+            data["session_start_limit"],
+        )
 
     def get_user(self, user_id: Snowflake) -> Response[user.User]:
         return self.request(Route("GET", "/users/{user_id}", user_id=user_id))
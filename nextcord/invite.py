@@ -11,7 +11,7 @@ from .asset import Asset
 from .enums import ChannelType, InviteTarget, VerificationLevel, try_enum
 from .mixins import Hashable
 from .object import Object
-from .utils import get_as_snowflake, parse_time, snowflake_time
+from .utils import get_as_snowflake, lazy_slot_property, parse_time, snowflake_time
 
 __all__ = (
     "PartialInviteChannel",
@@ -302,19 +302,19 @@ class Invite(Hashable):
         "code",
         "guild",
         "revoked",
-        "created_at",
+        "_created_at",
         "uses",
         "temporary",
         "max_uses",
         "inviter",
         "channel",
         "target_user",
-        "target_type",
+        "_target_type",
         "_state",
         "approximate_member_count",
         "approximate_presence_count",
         "target_application",
-        "expires_at",
+        "_expires_at",
     )
 
     BASE = "https://discord.gg"
@@ -332,17 +332,14 @@ class Invite(Hashable):
         self.code: Optional[str] = data.get("code")
         self.guild: Optional[InviteGuildType] = self._resolve_guild(data.get("guild"), guild)
         self.revoked: Optional[bool] = data.get("revoked")
-        self.created_at: Optional[datetime.datetime] = parse_time(data.get("created_at"))
+        self._created_at: Optional[str] = data.get("created_at")
         self.temporary: Optional[bool] = data.get("temporary")
         self.uses: Optional[int] = data.get("uses")
         self.max_uses: Optional[int] = data.get("max_uses")
         self.approximate_presence_count: Optional[int] = data.get("approximate_presence_count")
         self.approximate_member_count: Optional[int] = data.get("approximate_member_count")
 
-        expires_at = data.get("expires_at", None)
-        self.expires_at: Optional[datetime.datetime] = (
-            parse_time(expires_at) if expires_at else None
-        )
+        self._expires_at: Optional[str] = data.get("expires_at")
 
         inviter_data = data.get("inviter")
         self.inviter: Optional[User] = (
@@ -358,13 +355,25 @@ class Invite(Hashable):
             None if target_user_data is None else self._state.create_user(target_user_data)
         )
 
-        self.target_type: InviteTarget = try_enum(InviteTarget, data.get("target_type", 0))
+        self._target_type: int = data.get("target_type", 0)
 
         application = data.get("target_application")
         self.target_application: Optional[PartialAppInfo] = (
             PartialAppInfo(data=application, state=state) if application else None
         )
 
+    @lazy_slot_property("_created_at")
+    def created_at(self, value: str) -> Optional[datetime.datetime]:
+        return parse_time(value)
+
+    @lazy_slot_property("_expires_at")
+    def expires_at(self, value: str) -> Optional[datetime.datetime]:
+        return parse_time(value)
+
+    @lazy_slot_property("_target_type")
+    def target_type(self, value: int) -> InviteTarget:
+        return try_enum(InviteTarget, value)
+
     @classmethod
     def from_incomplete(cls, *, state: ConnectionState, data: InvitePayload) -> Self:
         guild: Optional[Union[Guild, PartialInviteGuild]]
@@ -101,7 +101,7 @@ class VoiceState:
         "self_deaf",
         "afk",
         "channel",
-        "requested_to_speak_at",
+        "_requested_to_speak_at",
         "suppress",
     )
 
@@ -120,11 +120,13 @@ class VoiceState:
         self.mute: bool = data.get("mute", False)
         self.deaf: bool = data.get("deaf", False)
         self.suppress: bool = data.get("suppress", False)
-        self.requested_to_speak_at: Optional[datetime.datetime] = utils.parse_time(
-            data.get("request_to_speak_timestamp")
-        )
+        self._requested_to_speak_at: Optional[str] = data.get("request_to_speak_timestamp")
         self.channel: Optional[VocalGuildChannel] = channel
 
+    @utils.lazy_slot_property("_requested_to_speak_at")
+    def requested_to_speak_at(self, value: str) -> Optional[datetime.datetime]:
+        return utils.parse_time(value)
+
     def __repr__(self) -> str:
         attrs = [
             ("self_mute", self.self_mute),
@@ -235,8 +237,8 @@ class Member(abc.Messageable, _UserTag):
 
     __slots__ = (
         "_roles",
-        "joined_at",
-        "premium_since",
+        "_joined_at",
+        "_premium_since",
         "activities",
         "guild",
         "pending",
@@ -245,7 +247,7 @@ class Member(abc.Messageable, _UserTag):
         "_user",
         "_state",
         "_avatar",
-        "_timeout",
+        "_communication_disabled_until",
         "_flags",
     )
 
@@ -273,19 +275,16 @@ class Member(abc.Messageable, _UserTag):
         self._state: ConnectionState = state
         self._user: User = state.store_user(data["user"])
         self.guild: Guild = guild
-        self.joined_at: Optional[datetime.datetime] = utils.parse_time(data.get("joined_at"))
-        self.premium_since: Optional[datetime.datetime] = utils.parse_time(
-            data.get("premium_since")
-        )
+        # timestamps are kept as sent until they are read, see the properties below
+        self._joined_at: Optional[str] = data.get("joined_at")
+        self._premium_since: Optional[str] = data.get("premium_since")
         self._roles: utils.SnowflakeList = utils.SnowflakeList(map(int, data["roles"]))
         self._client_status: Dict[Optional[str], str] = {None: "offline"}
         self.activities: Tuple[ActivityTypes, ...] = ()
         self.nick: Optional[str] = data.get("nick", None)
         self.pending: bool = data.get("pending", False)
         self._avatar: Optional[str] = data.get("avatar")
-        self._timeout: Optional[datetime.datetime] = utils.parse_time(
-            data.get("communication_disabled_until")
-        )
+        self._communication_disabled_until: Optional[str] = data.get("communication_disabled_until")
         self._flags: int = data.get("flags", 0)
 
     def __str__(self) -> str:
@@ -314,12 +313,12 @@ class Member(abc.Messageable, _UserTag):
         return cls(data=data, guild=message.guild, state=message._state)  # type: ignore
 
     def _update_from_message(self, data: MemberPayload) -> None:
-        self.joined_at = utils.parse_time(data.get("joined_at"))
-        self.premium_since = utils.parse_time(data.get("premium_since"))
+        self._joined_at = data.get("joined_at")
+        self._premium_since = data.get("premium_since")
         self._roles = utils.SnowflakeList(map(int, data["roles"]))
         self.nick = data.get("nick", None)
         self.pending = data.get("pending", False)
-        self._timeout = utils.parse_time(data.get("communication_disabled_until"))
+        self._communication_disabled_until = data.get("communication_disabled_until")
         self._flags = data.get("flags", 0)
 
     @classmethod
@@ -340,8 +339,9 @@ class Member(abc.Messageable, _UserTag):
         self = cls.__new__(cls)  # to bypass __init__
 
         self._roles = utils.SnowflakeList(member._roles, is_sorted=True)
-        self.joined_at = member.joined_at
-        self.premium_since = member.premium_since
+        # copied whether they were decoded yet or not
+        self._joined_at = member._joined_at
+        self._premium_since = member._premium_since
         self._client_status = member._client_status.copy()
         self.guild = member.guild
         self.nick = member.nick
@@ -349,7 +349,7 @@ class Member(abc.Messageable, _UserTag):
         self.activities = member.activities
         self._state = member._state
         self._avatar = member._avatar
-        self._timeout = member._timeout
+        self._communication_disabled_until = member._communication_disabled_until
         self._flags = member._flags
 
         # Reference will not be copied unless necessary by PRESENCE_UPDATE
@@ -360,6 +360,18 @@ class Member(abc.Messageable, _UserTag):
     async def _get_channel(self):
         return await self.create_dm()
 
+    @utils.lazy_slot_property("_joined_at")
+    def joined_at(self, value: str) -> Optional[datetime.datetime]:
+        return utils.parse_time(value)
+
+    @utils.lazy_slot_property("_premium_since")
+    def premium_since(self, value: str) -> Optional[datetime.datetime]:
+        return utils.parse_time(value)
+
+    @utils.lazy_slot_property("_communication_disabled_until")
+    def _timeout(self, value: str) -> Optional[datetime.datetime]:
+        return utils.parse_time(value)
+
     def _update(self, data: MemberPayload) -> None:
         # the nickname change is optional,
         # if it isn't in the payload then it didn't change
@@ -369,10 +381,10 @@ class Member(abc.Messageable, _UserTag):
         with contextlib.suppress(KeyError):
             self.pending = data["pending"]
 
-        self.premium_since = utils.parse_time(data.get("premium_since"))
+        self._premium_since = data.get("premium_since")
         self._roles = utils.SnowflakeList(map(int, data["roles"]))
         self._avatar = data.get("avatar")
-        self._timeout = utils.parse_time(data.get("communication_disabled_until"))
+        self._communication_disabled_until = data.get("communication_disabled_until")
         self._flags = data.get("flags", 0)
 
     def _presence_update(
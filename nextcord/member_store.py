@@ -0,0 +1,298 @@
+# SPDX-License-Identifier: MIT
+
+"""Columnar storage for the members of a guild, see :attr:`MemberCacheFlags.columnar`.
+
+Every member is a row across arrays of IDs, join timestamps, flags and role IDs,
+and lists of nicknames and avatar hashes. The few values that are usually unset,
+such as when a member started boosting, and presences of members that are not
+offline, are kept in dictionaries keyed by user ID instead.
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, MutableMapping, Optional, Tuple
+
+from .member import Member
+from .utils import SnowflakeList
+
+if TYPE_CHECKING:
+    from .activity import ActivityTypes
+    from .enums import Status
+    from .guild import Guild
+    from .types.activity import PartialPresenceUpdate
+    from .types.member import Member as MemberPayload
+    from .types.user import User as UserPayload
+    from .user import User
+
+__all__ = ()
+
+_utc = datetime.timezone.utc
+_new_array = array.__new__
+
+# removed rows and replaced role IDs are only reclaimed once there are at least this many
+_COMPACT_THRESHOLD = 1024
+
+
+class _StoredMember(Member):
+    # A member built from a row of a ColumnarMemberStore, that writes the updates
+    # the library makes to it back to its row.
+
+    __slots__ = ()
+
+    def _write_back(self) -> None:
+        store = self.guild._members
+        if isinstance(store, ColumnarMemberStore):
+            store._write(self)
+
+    def _update(self, data: MemberPayload) -> None:
+        super()._update(data)
+        self._write_back()
+
+    def _update_from_message(self, data: MemberPayload) -> None:
+        super()._update_from_message(data)
+        self._write_back()
+
+    def _presence_update(
+        self, data: PartialPresenceUpdate, user: UserPayload
+    ) -> Optional[Tuple[User, User]]:
+        result = super()._presence_update(data, user)
+        self._write_back()
+        return result
+
+    @Member.status.setter
+    def status(self, value: Status) -> None:
+        # internal use only
+        self._client_status[None] = str(value)
+        self._write_back()
+
+
+class ColumnarMemberStore(MutableMapping[int, Member]):
+    """Stores the members of a guild in columns, and builds a :class:`Member`
+    from them each time one is accessed.
+    """
+
+    __slots__ = (
+        "_guild",
+        "_index",
+        "_ids",
+        "_users",
+        "_joined",
+        "_flags",
+        "_pending",
+        "_nicks",
+        "_avatars",
+        "_role_start",
+        "_role_count",
+        "_role_ids",
+        "_premium",
+        "_timeouts",
+        "_presences",
+        "_dead",
+        "_dead_roles",
+    )
+
+    def __init__(self, guild: Guild) -> None:
+        self._guild: Guild = guild
+        self._clear()
+
+    def _clear(self) -> None:
+        # user ID -> row
+        self._index: Dict[int, int] = {}
+        self._ids: array[int] = array("Q")
+        # None for rows that were removed
+        self._users: List[Optional[User]] = []
+        # NaN for members without a join date
+        self._joined: array[float] = array("d")
+        self._flags: array[int] = array("I")
+        self._pending: array[int] = array("b")
+        self._nicks: List[Optional[str]] = []
+        self._avatars: List[Optional[str]] = []
+        # the roles of a row are _role_ids[start:start + count]
+        self._role_start: array[int] = array("I")
+        self._role_count: array[int] = array("H")
+        self._role_ids: array[int] = array("Q")
+        self._premium: Dict[int, datetime.datetime] = {}
+        self._timeouts: Dict[int, datetime.datetime] = {}
+        # (client status, activities) of members that are not offline
+        self._presences: Dict[int, Tuple[Dict[Optional[str], str], Tuple[ActivityTypes, ...]]] = {}
+        self._dead: int = 0
+        self._dead_roles: int = 0
+
+    def __repr__(self) -> str:
+        return f"<ColumnarMemberStore guild_id={self._guild.id} members={len(self._index)}>"
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._index)
+
+    def __contains__(self, user_id: Any) -> bool:
+        return user_id in self._index
+
+    def __getitem__(self, user_id: int) -> Member:
+        return self._member(self._index[user_id])
+
+    def get(self, user_id: int, default: Any = None) -> Any:
+        row = self._index.get(user_id)
+        return default if row is None else self._member(row)
+
+    def __setitem__(self, user_id: int, member: Member) -> None:
+        row = self._index.get(user_id)
+        if row is None:
+            self._append(member)
+        else:
+            self._set_row(row, member)
+
+    def __delitem__(self, user_id: int) -> None:
+        row = self._index.pop(user_id)
+        self._users[row] = None
+        self._nicks[row] = None
+        self._avatars[row] = None
+        self._dead_roles += self._role_count[row]
+        self._role_count[row] = 0
+        self._set_sparse(user_id, None)
+        self._dead += 1
+        self._maybe_compact()
+
+    def clear(self) -> None:
+        self._clear()
+
+    def values(self) -> Iterator[Member]:  # type: ignore
+        """Builds every member, in the order they were added."""
+        member = self._member
+        for row, user in enumerate(self._users):
+            if user is not None:
+                yield member(row)
+
+    def _write(self, member: Member) -> None:
+        # members that were removed in the meantime are not added back
+        row = self._index.get(member._user.id)
+        if row is not None:
+            self._set_row(row, member)
+
+    def _member(self, row: int) -> Member:
+        user: User = self._users[row]  # type: ignore
+        user_id = user.id
+        guild = self._guild
+
+        member = _StoredMember.__new__(_StoredMember)
+        member._state = guild._state
+        member._user = user
+        member.guild = guild
+        joined = self._joined[row]
+        member.joined_at = (
+            None if math.isnan(joined) else datetime.datetime.fromtimestamp(joined, _utc)
+        )
+        member.premium_since = self._premium.get(user_id)
+        member._timeout = self._timeouts.get(user_id)
+        start = self._role_start[row]
+        # the role IDs of a row are already sorted, skip SnowflakeList.__new__
+        member._roles = _new_array(
+            SnowflakeList, "Q", self._role_ids[start : start + self._role_count[row]]
+        )
+        member.nick = self._nicks[row]
+        member._avatar = self._avatars[row]
+        member.pending = bool(self._pending[row])
+        member._flags = self._flags[row]
+
+        presence = self._presences.get(user_id)
+        if presence is None:
+            member._client_status = {None: "offline"}
+            member.activities = ()
+        else:
+            member._client_status, member.activities = presence
+        return member
+
+    def _append(self, member: Member) -> None:
+        user = member._user
+        # the ID of the user is used as the key, rather than an equal int of its own
+        self._index[user.id] = len(self._users)
+        self._ids.append(user.id)
+        self._users.append(user)
+        joined = member.joined_at
+        self._joined.append(math.nan if joined is None else joined.timestamp())
+        self._flags.append(member._flags)
+        self._pending.append(member.pending)
+        self._nicks.append(member.nick)
+        self._avatars.append(member._avatar)
+        roles = member._roles
+        self._role_start.append(len(self._role_ids))
+        self._role_count.append(len(roles))
+        self._role_ids.extend(roles)
+        self._set_sparse(user.id, member)
+
+    def _set_row(self, row: int, member: Member) -> None:
+        self._users[row] = member._user
+        joined = member.joined_at
+        self._joined[row] = math.nan if joined is None else joined.timestamp()
+        self._flags[row] = member._flags
+        self._pending[row] = member.pending
+        self._nicks[row] = member.nick
+        self._avatars[row] = member._avatar
+
+        roles = member._roles
+        count = self._role_count[row]
+        if len(roles) == count:
+            start = self._role_start[row]
+            self._role_ids[start : start + count] = roles
+        else:
+            # the old role IDs stay in place until the store is compacted
+            self._role_start[row] = len(self._role_ids)
+            self._role_count[row] = len(roles)
+            self._role_ids.extend(roles)
+            self._dead_roles += count
+
+        self._set_sparse(member._user.id, member)
+        self._maybe_compact()
+
+    def _set_sparse(self, user_id: int, member: Optional[Member]) -> None:
+        for values, value in (
+            (self._premium, member and member.premium_since),
+            (self._timeouts, member and member._timeout),
+        ):
+            if value is None:
+                values.pop(user_id, None)
+            else:
+                values[user_id] = value
+
+        status = member and member._client_status
+        if member is None or (
+            not member.activities and len(status) == 1 and status.get(None) == "offline"  # type: ignore
+        ):
+            self._presences.pop(user_id, None)
+        else:
+            self._presences[user_id] = (status, member.activities)  # type: ignore
+
+    def _maybe_compact(self) -> None:
+        if (self._dead > _COMPACT_THRESHOLD and self._dead * 2 > len(self._users)) or (
+            self._dead_roles > _COMPACT_THRESHOLD and self._dead_roles * 2 > len(self._role_ids)
+        ):
+            self._compact()
+
+    def _compact(self) -> None:
+        # rebuilds every column without the rows that were removed
+        rows = [row for row, user in enumerate(self._users) if user is not None]
+        role_start, role_count, role_ids = self._role_start, self._role_count, self._role_ids
+
+        self._ids = array("Q", map(self._ids.__getitem__, rows))
+        self._users = list(map(self._users.__getitem__, rows))
+        self._joined = array("d", map(self._joined.__getitem__, rows))
+        self._flags = array("I", map(self._flags.__getitem__, rows))
+        self._pending = array("b", map(self._pending.__getitem__, rows))
+        self._nicks = list(map(self._nicks.__getitem__, rows))
+        self._avatars = list(map(self._avatars.__getitem__, rows))
+        self._role_count = array("H", map(role_count.__getitem__, rows))
+        self._role_start = array("I")
+        self._role_ids = array("Q")
+        for row in rows:
+            start = role_start[row]
+            self._role_start.append(len(self._role_ids))
+            self._role_ids.extend(role_ids[start : start + role_count[row]])
+
+        self._index = {user.id: row for row, user in enumerate(self._users)}  # type: ignore
+        self._dead = 0
+        self._dead_roles = 0
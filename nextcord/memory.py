@@ -0,0 +1,195 @@
+# SPDX-License-Identifier: MIT
+
+"""Estimates of the memory used by the caches of a :class:`ConnectionState`, see
+:meth:`Client.memory_report`.
+
+Measuring every cached object would take as long as walking the heap, so the size of
+each kind of object is averaged over a few samples and multiplied by the length of its
+cache. An object is measured with the strings, numbers, timestamps and containers it
+holds in its slots or ``__dict__``. Other cached objects it references, such as the
+user of a member, are measured with their own kind instead.
+"""
+
+from __future__ import annotations
+
+import datetime
+import heapq
+import itertools
+import sys
+from array import array
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple
+
+from .member_store import ColumnarMemberStore
+from .utils import SnowflakeList, get_slots
+
+if TYPE_CHECKING:
+    from .guild import Guild
+    from .state import ConnectionState
+
+__all__ = ()
+
+# how many objects of each kind are measured
+SAMPLE_SIZE = 16
+
+# the caches of a guild, which are measured with their own kind rather than the guild
+GUILD_CACHES: Tuple[str, ...] = ("members", "channels", "threads", "roles", "voice_states")
+
+# the values an object is assumed to own, rather than share with other objects
+_OWNED = frozenset(
+    {
+        str,
+        bytes,
+        int,
+        float,
+        tuple,
+        list,
+        dict,
+        set,
+        frozenset,
+        array,
+        SnowflakeList,
+        OrderedDict,
+        datetime.datetime,
+    }
+)
+
+_fields: Dict[type, Tuple[str, ...]] = {}
+
+
+def _is_interned(value: Any) -> bool:
+    # small ints, empty tuples and strings of at most one character are shared by the interpreter
+    cls = value.__class__
+    if cls is int:
+        return -5 <= value <= 256
+    if cls is str:
+        return len(value) <= 1
+    return cls is tuple and not value
+
+
+def _fields_of(cls: type) -> Tuple[str, ...]:
+    try:
+        return _fields[cls]
+    except KeyError:
+        # __weakref__ and __dict__ are not values of the object
+        names = dict.fromkeys(name for name in get_slots(cls) if not name.startswith("__"))
+        fields = _fields[cls] = tuple(names)
+        return fields
+
+
+def sizeof(obj: Any, *, skip: Tuple[str, ...] = ()) -> int:
+    """Returns the size of an object and of the values it owns, without the slots in ``skip``."""
+    size = sys.getsizeof(obj)
+    values: List[Any] = [
+        getattr(obj, name, None) for name in _fields_of(obj.__class__) if name not in skip
+    ]
+    attrs = getattr(obj, "__dict__", None)
+    if attrs is not None:
+        size += sys.getsizeof(attrs)
+        values.extend(attrs.values())
+
+    for value in values:
+        if value.__class__ in _OWNED and not _is_interned(value):
+            size += sys.getsizeof(value)
+    return size
+
+
+def average(objects: Iterable[Any], *, skip: Tuple[str, ...] = ()) -> float:
+    sizes = [sizeof(obj, skip=skip) for obj in itertools.islice(objects, SAMPLE_SIZE)]
+    return sum(sizes) / len(sizes) if sizes else 0.0
+
+
+def _sample(guilds: List[Guild], name: str) -> Iterable[Any]:
+    # a few objects from each guild, rather than all of them from the first one
+    return itertools.chain.from_iterable(
+        itertools.islice(getattr(guild, name).values(), 2) for guild in guilds
+    )
+
+
+def report(state: ConnectionState, top: int = 10) -> Dict[str, Any]:
+    """Returns the counts and estimated sizes of every kind of cached object, and the
+    ``top`` guilds using the most memory.
+    """
+    guilds = list(state._guilds.values())
+    caches = tuple(f"_{kind}" for kind in GUILD_CACHES)
+
+    kinds: Dict[str, Dict[str, Any]] = {}
+
+    def add(kind: str, count: int, memory: float) -> None:
+        kinds[kind] = {"count": count, "memory": int(memory)}
+
+    guild_size = average(guilds, skip=caches)
+    sizes = {kind: average(_sample(guilds, f"_{kind}")) for kind in GUILD_CACHES}
+    emoji_size = average(state._emojis.values())
+    sticker_size = average(state._stickers.values())
+
+    counts = dict.fromkeys(GUILD_CACHES, 0)
+    memory = dict.fromkeys(GUILD_CACHES, 0.0)
+    # the tables of the caches of every guild
+    tables = 0
+    # (memory, guild ID, counts) of every guild
+    weights: List[Tuple[float, int, Dict[str, int]]] = []
+    for guild in guilds:
+        guild_counts: Dict[str, int] = {}
+        # the guild itself, and the tables of its caches
+        weight = guild_size
+        for kind, name in zip(GUILD_CACHES, caches):
+            cache = getattr(guild, name)
+            count = guild_counts[kind] = len(cache)
+            counts[kind] += count
+            if cache.__class__ is ColumnarMemberStore:
+                # members are only built when they are looked up, the columns are what is kept
+                used = sizeof(cache)
+            else:
+                used = count * sizes[kind]
+                table = sys.getsizeof(cache) if cache.__class__ is dict else sizeof(cache)
+                tables += table
+                weight += table
+            memory[kind] += used
+            weight += used
+
+        guild_counts["emojis"] = len(guild.emojis)
+        guild_counts["stickers"] = len(guild.stickers)
+        weight += guild_counts["emojis"] * emoji_size + guild_counts["stickers"] * sticker_size
+        weights.append((weight, guild.id, guild_counts))
+
+    add("guilds", len(guilds), len(guilds) * guild_size + tables)
+    for kind in GUILD_CACHES:
+        add(kind, counts[kind], memory[kind])
+
+    for kind, cache in (
+        ("users", state._users),
+        ("emojis", state._emojis),
+        ("stickers", state._stickers),
+        ("private_channels", state._private_channels),
+    ):
+        add(kind, len(cache), len(cache) * average(cache.values()) + sizeof(cache))
+
+    messages = state._messages
+    if messages is None:
+        add("messages", 0, 0)
+    else:
+        add(
+            "messages",
+            len(messages),
+            len(messages) * average(reversed(messages)) + sizeof(messages),
+        )
+
+    views = state._view_store
+    count = len(views._registered_views)
+    add("views", count, count * average(views._registered_views.values()) + views.stats()["memory"])
+    modals = state._modal_store
+    count = len(modals._modal_keys)
+    add("modals", count, count * average(modals._modals.values()) + modals.stats()["memory"])
+    commands = state._application_commands
+    add("application_commands", len(commands), len(commands) * average(commands))
+
+    heaviest = heapq.nlargest(top, weights, key=lambda entry: entry[0])
+    return {
+        "memory": sum(entry["memory"] for entry in kinds.values()),
+        "kinds": kinds,
+        "guilds": [
+            {"id": guild_id, **guild_counts, "memory": int(weight)}
+            for weight, guild_id, guild_counts in heaviest
+        ],
+    }
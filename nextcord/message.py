@@ -762,7 +762,7 @@ class Message(Hashable):
         "nonce",
         "pinned",
         "role_mentions",
-        "type",
+        "_type",
         "flags",
         "reactions",
         "reference",
@@ -803,10 +803,9 @@ class Message(Hashable):
         self.application: Optional[MessageApplicationPayload] = data.get("application")
         self.activity: Optional[MessageActivityPayload] = data.get("activity")
         self.channel: MessageableChannel = channel
-        self._edited_timestamp: Optional[datetime.datetime] = utils.parse_time(
-            data["edited_timestamp"]
-        )
-        self.type: MessageType = try_enum(MessageType, data["type"])
+        # decoded when first read, see edited_at and type
+        self._edited_timestamp: Optional[str] = data["edited_timestamp"]
+        self._type: int = data["type"]
         self.pinned: bool = data["pinned"]
         self.flags: MessageFlags = MessageFlags._from_value(data.get("flags", 0))
         self.mention_everyone: bool = data["mention_everyone"]
@@ -954,7 +953,7 @@ class Message(Hashable):
                 delattr(self, attr)
 
     def _handle_edited_timestamp(self, value: str) -> None:
-        self._edited_timestamp = utils.parse_time(value)
+        self._edited_timestamp = value
 
     def _handle_pinned(self, value: bool) -> None:
         self.pinned = value
@@ -975,7 +974,7 @@ class Message(Hashable):
         self.tts = value
 
     def _handle_type(self, value: int) -> None:
-        self.type = try_enum(MessageType, value)
+        self._type = value
 
     def _handle_content(self, value: str) -> None:
         self.content = value
@@ -1131,10 +1130,14 @@ class Message(Hashable):
         """:class:`datetime.datetime`: The message's creation time in UTC."""
         return utils.snowflake_time(self.id)
 
-    @property
-    def edited_at(self) -> Optional[datetime.datetime]:
+    @utils.lazy_slot_property("_edited_timestamp")
+    def edited_at(self, value: str) -> Optional[datetime.datetime]:
         """Optional[:class:`datetime.datetime`]: An aware UTC datetime object containing the edited time of the message."""
-        return self._edited_timestamp
+        return utils.parse_time(value)
+
+    @utils.lazy_slot_property("_type")
+    def type(self, value: int) -> MessageType:
+        return try_enum(MessageType, value)
 
     @property
     def jump_url(self) -> str:
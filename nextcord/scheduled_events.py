@@ -6,10 +6,10 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 from .abc import Snowflake
 from .asset import Asset
-from .enums import ScheduledEventPrivacyLevel
+from .enums import ScheduledEventPrivacyLevel, try_enum
 from .iterators import ScheduledEventUserIterator
 from .mixins import Hashable
-from .utils import MISSING, obj_to_base64_data, parse_time
+from .utils import MISSING, lazy_slot_property, obj_to_base64_data, parse_time
 
 __all__: Tuple[str, ...] = (
     "EntityMetadata",
@@ -191,13 +191,13 @@ class ScheduledEvent(Hashable):
         "channel_id",
         "creator",
         "description",
-        "end_time",
+        "_end_time",
         "guild",
         "id",
         "metadata",
         "name",
-        "privacy_level",
-        "start_time",
+        "_privacy_level",
+        "_start_time",
         "user_count",
         "_state",
         "_users",
@@ -219,11 +219,9 @@ class ScheduledEvent(Hashable):
             self.creator: Optional[User] = None
         self.name: str = data["name"]
         self.description: str = data.get("description") or ""
-        self.start_time: datetime = parse_time(data["scheduled_start_time"])
-        self.end_time: Optional[datetime] = parse_time(data.get("scheduled_end_time"))
-        self.privacy_level: ScheduledEventPrivacyLevel = ScheduledEventPrivacyLevel(
-            data["privacy_level"]
-        )
+        self._start_time: str = data["scheduled_start_time"]
+        self._end_time: Optional[str] = data.get("scheduled_end_time")
+        self._privacy_level: int = data["privacy_level"]
         self.metadata: EntityMetadata = EntityMetadata(**(data["entity_metadata"] or {}))
         self.user_count: int = data.get("user_count", 0)
         self.channel: Optional[GuildChannel] = self._state.get_channel(  # type: ignore # who knows
@@ -241,6 +239,18 @@ class ScheduledEvent(Hashable):
         else:
             self.image: Optional[Asset] = None
 
+    @lazy_slot_property("_start_time")
+    def start_time(self, value: str) -> datetime:
+        return parse_time(value)
+
+    @lazy_slot_property("_end_time")
+    def end_time(self, value: str) -> Optional[datetime]:
+        return parse_time(value)
+
+    @lazy_slot_property("_privacy_level")
+    def privacy_level(self, value: int) -> ScheduledEventPrivacyLevel:
+        return try_enum(ScheduledEventPrivacyLevel, value)
+
     def _update_users(self, data: List[ScheduledEventUserPayload]) -> None:
         for user in data:
             self._users[int(user["user"]["id"])] = ScheduledEventUser(
@@ -0,0 +1,165 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Union
+
+__all__ = (
+    "GatewaySession",
+    "SessionStore",
+    "FileSessionStore",
+)
+
+_log = logging.getLogger(__name__)
+
+
+class GatewaySession:
+    """The state a shard needs to resume its gateway session, as saved by a
+    :class:`SessionStore`.
+
+    .. versionadded:: 3.0
+
+    Attributes
+    ----------
+    shard_id: Optional[:class:`int`]
+        The shard ID of the session, or ``None`` if the client is not sharded.
+    shard_count: Optional[:class:`int`]
+        The shard count the session was started with.
+    session_id: :class:`str`
+        The ID of the session.
+    sequence: Optional[:class:`int`]
+        The sequence number of the last event that was received.
+    resume_url: Optional[:class:`str`]
+        The gateway URL to resume the session on.
+    saved_at: :class:`float`
+        When the session was saved, as a UNIX timestamp.
+    """
+
+    __slots__ = ("shard_id", "shard_count", "session_id", "sequence", "resume_url", "saved_at")
+
+    def __init__(
+        self,
+        *,
+        shard_id: Optional[int],
+        shard_count: Optional[int],
+        session_id: str,
+        sequence: Optional[int],
+        resume_url: Optional[str],
+        saved_at: Optional[float] = None,
+    ) -> None:
+        self.shard_id: Optional[int] = shard_id
+        self.shard_count: Optional[int] = shard_count
+        self.session_id: str = session_id
+        self.sequence: Optional[int] = sequence
+        self.resume_url: Optional[str] = resume_url
+        self.saved_at: float = time.time() if saved_at is None else saved_at
+
+    def __repr__(self) -> str:
+        return (
+            f"<GatewaySession shard_id={self.shard_id} session_id={self.session_id!r} "
+            f"sequence={self.sequence}>"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> GatewaySession:
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+
+class SessionStore:
+    """Saves the gateway sessions of a client, so that they can be resumed after
+    the process restarts instead of identifying again. Used with the ``session_store``
+    parameter of :class:`Client`.
+
+    Subclass this and override :meth:`load` and :meth:`save` to keep sessions
+    somewhere other than a file, see :class:`FileSessionStore`.
+
+    .. versionadded:: 3.0
+
+    Parameters
+    ----------
+    interval: :class:`float`
+        How often, in seconds, the sessions are saved while the client is connected.
+        They are also saved when the client is closed. With a ``cache_snapshot`` the
+        snapshot is saved along with them, which blocks the event loop while the caches
+        are encoded, so large bots may want a longer interval. Defaults to ``30.0``.
+    """
+
+    def __init__(self, *, interval: float = 30.0) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be greater than 0")
+        self.interval: float = interval
+
+    async def load(self) -> List[GatewaySession]:
+        """|coro|
+
+        Returns the sessions that were saved last, or an empty list.
+        """
+        raise NotImplementedError
+
+    async def save(self, sessions: List[GatewaySession]) -> None:
+        """|coro|
+
+        Replaces the saved sessions.
+
+        Parameters
+        ----------
+        sessions: List[:class:`GatewaySession`]
+            The sessions of the shards that are connected.
+        """
+        raise NotImplementedError
+
+
+class FileSessionStore(SessionStore):
+    """A :class:`SessionStore` that keeps sessions in a JSON file.
+
+    The file is replaced atomically, so a crash while saving leaves the previous
+    sessions in place.
+
+    .. versionadded:: 3.0
+
+    Parameters
+    ----------
+    path: Union[:class:`str`, :class:`os.PathLike`]
+        The file to keep sessions in.
+    interval: :class:`float`
+        How often, in seconds, the sessions are saved. Defaults to ``30.0``.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], *, interval: float = 30.0) -> None:
+        super().__init__(interval=interval)
+        self.path: str = os.fspath(path)
+
+    async def load(self) -> List[GatewaySession]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._read)
+
+    async def save(self, sessions: List[GatewaySession]) -> None:
+        data = {"sessions": [session.to_dict() for session in sessions]}
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write, data)
+
+    def _read(self) -> List[GatewaySession]:
+        try:
+            with open(self.path, encoding="utf-8") as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            return []
+        except ValueError:
+            _log.warning("Ignoring the malformed session file %s.", self.path)
+            return []
+
+        return [GatewaySession.from_dict(session) for session in data.get("sessions", [])]
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as fp:
+            json.dump(data, fp)
+        os.replace(temporary, self.path)
@@ -5,7 +5,7 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import logging
-from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Type
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple, Type
 
 import aiohttp
 
@@ -21,6 +21,7 @@ from .errors import (
 )
 from .flags import Intents
 from .gateway import *
+from .session import GatewaySession, SessionStore
 from .state import AutoShardedConnectionState
 from .utils import MISSING
 
@@ -28,6 +29,8 @@ if TYPE_CHECKING:
     from typing_extensions import Self
 
     from .activity import BaseActivity
+    from .cache import CacheBackend
+    from .event_pool import EventPool
     from .flags import MemberCacheFlags
     from .gateway import DiscordWebSocket
     from .mentions import AllowedMentions
@@ -108,9 +111,9 @@ class Shard:
         if self._task is not None and not self._task.done():
             self._task.cancel()
 
-    async def close(self) -> None:
+    async def close(self, code: int = 1000) -> None:
         self._cancel_task()
-        await self.ws.close(code=1000)
+        await self.ws.close(code=code)
 
     async def disconnect(self) -> None:
         await self.close()
@@ -266,6 +269,15 @@ class ShardInfo:
         """:class:`float`: Measures latency between a HEARTBEAT and a HEARTBEAT_ACK in seconds for this shard."""
         return self._parent.ws.latency
 
+    @property
+    def heartbeat_jitter(self) -> float:
+        """:class:`float`: How late, in seconds, this shard's most recent HEARTBEAT was sent
+        compared to when it was due.
+
+        .. versionadded:: 3.0
+        """
+        return self._parent.ws.heartbeat_jitter
+
     def is_ws_ratelimited(self) -> bool:
         """:class:`bool`: Whether the websocket is currently rate limited.
 
@@ -298,6 +310,16 @@ class AutoShardedClient(Client):
     if this is used. By default, when omitted, the client will launch shards from
     0 to ``shard_count - 1``.
 
+    Shards are identified concurrently according to the ``max_concurrency``
+    Discord reports for the bot: shards in different rate limit buckets
+    (``shard_id % max_concurrency``) IDENTIFY in parallel, while shards sharing a
+    bucket are spaced out by :meth:`~Client.before_identify_hook`. The first shard of
+    each bucket is launched with ``initial=True``. :func:`on_shard_launch` is
+    dispatched as each shard finishes launching.
+
+    .. versionchanged:: 3.0
+        Shards are launched concurrently, honouring ``max_concurrency``.
+
     Attributes
     ----------
     shard_ids: Optional[List[:class:`int`]]
@@ -327,7 +349,20 @@ class AutoShardedClient(Client):
         heartbeat_timeout: float = 60.0,
         guild_ready_timeout: float = 2.0,
         assume_unsync_clock: bool = True,
+        max_global_requests: int = 50,
         enable_debug_events: bool = False,
+        loop_heartbeats: bool = False,
+        gateway_compression: Optional[str] = "zlib-stream",
+        gateway_encoding: str = "json",
+        allowed_events: Optional[Iterable[str]] = None,
+        ignored_events: Optional[Iterable[str]] = None,
+        inline_dispatch: bool = False,
+        event_pool: Optional[EventPool] = None,
+        parse_slice_budget: Optional[float] = None,
+        chunk_guilds_lazily: bool = False,
+        session_store: Optional[SessionStore] = None,
+        cache_snapshot: Optional[str] = None,
+        cache_backends: Optional[Dict[str, CacheBackend]] = None,
         loop: Optional[asyncio.AbstractEventLoop] = None,
         lazy_load_commands: bool = True,
         rollout_associate_known: bool = True,
@@ -355,7 +390,20 @@ class AutoShardedClient(Client):
             heartbeat_timeout=heartbeat_timeout,
             guild_ready_timeout=guild_ready_timeout,
             assume_unsync_clock=assume_unsync_clock,
+            max_global_requests=max_global_requests,
             enable_debug_events=enable_debug_events,
+            loop_heartbeats=loop_heartbeats,
+            gateway_compression=gateway_compression,
+            gateway_encoding=gateway_encoding,
+            allowed_events=allowed_events,
+            ignored_events=ignored_events,
+            inline_dispatch=inline_dispatch,
+            event_pool=event_pool,
+            parse_slice_budget=parse_slice_budget,
+            chunk_guilds_lazily=chunk_guilds_lazily,
+            session_store=session_store,
+            cache_snapshot=cache_snapshot,
+            cache_backends=cache_backends,
             loop=loop,
             lazy_load_commands=lazy_load_commands,
             rollout_associate_known=rollout_associate_known,
@@ -402,6 +450,7 @@ class AutoShardedClient(Client):
         intents: Intents,
         chunk_guilds_at_startup: bool,
         member_cache_flags: MemberCacheFlags,
+        cache_backends: Optional[Dict[str, CacheBackend]],
     ) -> AutoShardedConnectionState:
         return AutoShardedConnectionState(
             dispatch=self.dispatch,
@@ -419,6 +468,7 @@ class AutoShardedClient(Client):
             intents=intents,
             chunk_guilds_at_startup=chunk_guilds_at_startup,
             member_cache_flags=member_cache_flags,
+            cache_backends=cache_backends,
         )
 
     @property
@@ -441,6 +491,32 @@ class AutoShardedClient(Client):
         """
         return [(shard_id, shard.ws.latency) for shard_id, shard in self.__shards.items()]
 
+    @property
+    def heartbeat_jitter(self) -> float:
+        """:class:`float`: How late, in seconds, the most recent HEARTBEAT was sent compared to
+        when it was due.
+
+        This operates similarly to :meth:`Client.heartbeat_jitter` except it uses the highest
+        jitter of every shard. To get a list of shard jitters, check the
+        :attr:`heartbeat_jitters` property. Returns ``nan`` if there are no shards ready.
+
+        .. versionadded:: 3.0
+        """
+        if not self.__shards:
+            return float("nan")
+        return max(jitter for _, jitter in self.heartbeat_jitters)
+
+    @property
+    def heartbeat_jitters(self) -> List[Tuple[int, float]]:
+        """List[Tuple[:class:`int`, :class:`float`]]: A list of how late, in seconds, each shard's
+        most recent HEARTBEAT was sent.
+
+        This returns a list of tuples with elements ``(shard_id, jitter)``.
+
+        .. versionadded:: 3.0
+        """
+        return [(shard_id, shard.ws.heartbeat_jitter) for shard_id, shard in self.__shards.items()]
+
     def get_shard(self, shard_id: int) -> Optional[ShardInfo]:
         """Optional[:class:`ShardInfo`]: Gets the shard information at a given shard ID or ``None`` if not found."""
         try:
@@ -458,14 +534,33 @@ class AutoShardedClient(Client):
             for shard_id, parent in self.__shards.items()
         }
 
-    async def launch_shard(self, gateway: str, shard_id: int, *, initial: bool = False) -> None:
+    async def launch_shard(
+        self,
+        gateway: str,
+        shard_id: int,
+        *,
+        initial: bool = False,
+        session: Optional[GatewaySession] = None,
+    ) -> None:
         try:
-            coro = DiscordWebSocket.from_client(
-                self, initial=initial, gateway=gateway, shard_id=shard_id
-            )
+            if session is not None:
+                coro = DiscordWebSocket.from_client(
+                    self,
+                    gateway=session.resume_url or gateway,
+                    format_gateway=session.resume_url is not None,
+                    shard_id=shard_id,
+                    session=session.session_id,
+                    sequence=session.sequence,
+                    resume=True,
+                )
+            else:
+                coro = DiscordWebSocket.from_client(
+                    self, initial=initial, gateway=gateway, shard_id=shard_id
+                )
             ws = await asyncio.wait_for(coro, timeout=180.0)
         except Exception:
             _log.exception("Failed to connect for shard_id: %s. Retrying...", shard_id)
+            self._connection._stored_resumes.discard(shard_id)
             await asyncio.sleep(5.0)
             return await self.launch_shard(gateway, shard_id)
 
@@ -474,20 +569,72 @@ class AutoShardedClient(Client):
         ret.launch()
         return None
 
+    def _gateway_sessions(self) -> List[GatewaySession]:
+        return [
+            GatewaySession(
+                shard_id=shard_id,
+                shard_count=self.shard_count,
+                session_id=shard.ws.session_id,
+                sequence=shard.ws.sequence,
+                resume_url=shard.ws.resume_url,
+            )
+            for shard_id, shard in self.__shards.items()
+            if shard.ws.session_id is not None
+        ]
+
     async def launch_shards(self) -> None:
+        shard_count, gateway, session_start_limit = await self.http.get_bot_gateway(
+            encoding=self._connection._gateway_encoding,
+            compress=self._connection._gateway_compression,
+        )
         if self.shard_count is None:
-            self.shard_count, gateway = await self.http.get_bot_gateway()
-        else:
-            gateway = await self.http.get_gateway()
+            self.shard_count = shard_count
 
         self._connection.shard_count = self.shard_count
 
         shard_ids = self.shard_ids or range(self.shard_count)
         self._connection.shard_ids = shard_ids
 
+        total = len(shard_ids)
+        if session_start_limit["remaining"] < total:
+            _log.warning(
+                "Only %d of %d session starts remain, resetting in %.2f seconds. "
+                "Some of the %d shards may fail to IDENTIFY.",
+                session_start_limit["remaining"],
+                session_start_limit["total"],
+                session_start_limit["reset_after"] / 1000,
+                total,
+            )
+
+        # Shards in different rate limit buckets (shard_id % max_concurrency)
+        # may IDENTIFY at the same time, shards within a bucket one after another.
+        max_concurrency = max(session_start_limit["max_concurrency"], 1)
+        buckets: Dict[int, List[int]] = {}
         for shard_id in shard_ids:
-            initial = shard_id == shard_ids[0]
-            await self.launch_shard(gateway, shard_id, initial=initial)
+            buckets.setdefault(shard_id % max_concurrency, []).append(shard_id)
+
+        # Saved sessions are only resumed if every shard has one, as otherwise the
+        # shards were probably launched differently by the previous process.
+        await self._restore_cache_snapshot()
+        sessions = await self._load_sessions()
+        if not all(shard_id in sessions for shard_id in shard_ids):
+            sessions = {}
+        self._connection._stored_resumes.update(sessions)
+        self._start_session_checkpoints()
+
+        _log.info("Launching %d shards in %d concurrent identify buckets.", total, len(buckets))
+        launched = 0
+
+        async def launch_bucket(bucket: List[int]) -> None:
+            nonlocal launched
+            for index, shard_id in enumerate(bucket):
+                await self.launch_shard(
+                    gateway, shard_id, initial=index == 0, session=sessions.get(shard_id)
+                )
+                launched += 1
+                self.dispatch("shard_launch", shard_id, launched, total)
+
+        await asyncio.gather(*(launch_bucket(bucket) for bucket in buckets.values()))
 
         self._connection.shards_launched.set()
 
@@ -529,8 +676,10 @@ class AutoShardedClient(Client):
             with contextlib.suppress(Exception):
                 await vc.disconnect(force=True)
 
+        await self._stop_session_checkpoints()
         to_close = [
-            asyncio.ensure_future(shard.close(), loop=self.loop) for shard in self.__shards.values()
+            asyncio.ensure_future(shard.close(self._close_code), loop=self.loop)
+            for shard in self.__shards.values()
         ]
         if to_close:
             await asyncio.wait(to_close)
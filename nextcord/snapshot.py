@@ -0,0 +1,309 @@
+# SPDX-License-Identifier: MIT
+
+"""Snapshots of the caches of a :class:`ConnectionState`, see
+:meth:`Client.save_cache_snapshot`.
+
+A snapshot is a file of length-prefixed records, read through a memory map so
+that only one record is decoded at a time. Members and users, which make up
+most of a snapshot, are stored as plain tuples. The rest of a guild, its channels,
+threads, roles, emojis, stickers, voice states and so on, is pickled, with the
+state and the users it references stored as references rather than copies.
+
+Snapshots are pickles, so only load snapshots that the bot wrote itself.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime
+import gc
+import io
+import mmap
+import os
+import pickle
+import struct
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from .member import Member
+from .session import GatewaySession
+from .user import ClientUser, User
+from .utils import SnowflakeList
+
+if TYPE_CHECKING:
+    from .guild import Guild
+    from .state import ConnectionState
+
+__all__ = ()
+
+MAGIC = b"NCSNAP01"
+
+RECORD_META = 1
+RECORD_USERS = 2
+RECORD_GUILD = 3
+RECORD_MEMBERS = 4
+
+# users are written in batches of this many, so no record holds every user
+USER_BATCH = 50000
+
+_header = struct.Struct(">BI")
+_utc = datetime.timezone.utc
+
+
+@contextlib.contextmanager
+def _paused_gc() -> Iterator[None]:
+    # millions of members are created or encoded at once, none of which are garbage,
+    # the collector would otherwise walk every one of them many times over
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _timestamp(value: Optional[datetime.datetime]) -> Optional[float]:
+    return None if value is None else value.timestamp()
+
+
+def _datetime(value: float) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(value, _utc)
+
+
+class _Pickler(pickle.Pickler):
+    # The state is not pickled, and users that are cached are written as their ID,
+    # so that they are shared again by everything that references them once loaded.
+    def __init__(self, file: io.BytesIO, state: ConnectionState, *, meta: bool = False) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._state = state
+        # the meta record holds the client user itself
+        self._meta = meta
+
+    def persistent_id(self, obj: Any) -> Any:
+        if obj is self._state:
+            return "state"
+        if obj.__class__ is User and self._state._users.get(obj.id) is obj:
+            return obj.id
+        if obj.__class__ is ClientUser and obj is self._state.user and not self._meta:
+            return "user"
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file: Any, state: ConnectionState, users: Dict[int, User]) -> None:
+        super().__init__(file)
+        self._state = state
+        self._users = users
+
+    def persistent_load(self, pid: Any) -> Any:
+        if pid == "state":
+            return self._state
+        if pid == "user":
+            return self._state.user
+        return self._users[pid]
+
+
+def _pickle(state: ConnectionState, obj: Any, *, meta: bool = False) -> bytes:
+    buffer = io.BytesIO()
+    _Pickler(buffer, state, meta=meta).dump(obj)
+    return buffer.getvalue()
+
+
+def _encode_user(user: User) -> Tuple[Any, ...]:
+    return (
+        user.id,
+        user.name,
+        user.discriminator,
+        user.global_name,
+        user._avatar,
+        user._banner,
+        user._accent_colour,
+        user._public_flags,
+        user.bot,
+        user.system,
+    )
+
+
+def _decode_user(state: ConnectionState, data: Tuple[Any, ...]) -> User:
+    user = User.__new__(User)
+    (
+        user.id,
+        user.name,
+        user.discriminator,
+        user.global_name,
+        user._avatar,
+        user._banner,
+        user._accent_colour,
+        user._public_flags,
+        user.bot,
+        user.system,
+    ) = data
+    user._state = state
+    # webhook authors have the discriminator 0000, which ConnectionState.store_user never
+    # caches, so they are not cached here either nor removed from the cache when deleted
+    user._stored = user.discriminator != "0000"
+    return user
+
+
+def _encode_member(member: Member) -> Tuple[Any, ...]:
+    return (
+        member._user.id,
+        member.nick,
+        member._avatar,
+        _timestamp(member.joined_at),
+        _timestamp(member.premium_since),
+        _timestamp(member._timeout),
+        tuple(member._roles),
+        member.pending,
+        member._flags,
+    )
+
+
+def _decode_member(
+    state: ConnectionState, guild: Guild, user: User, data: Tuple[Any, ...]
+) -> Member:
+    member = Member.__new__(Member)
+    _, nick, avatar, joined_at, premium_since, timeout, roles, pending, flags = data
+    member._state = state
+    member._user = user
+    member.guild = guild
+    member.nick = nick
+    member._avatar = avatar
+    # most members have never boosted or been timed out, skip the call for them
+    member.joined_at = None if joined_at is None else _datetime(joined_at)
+    member.premium_since = None if premium_since is None else _datetime(premium_since)
+    member._timeout = None if timeout is None else _datetime(timeout)
+    member._roles = SnowflakeList(roles, is_sorted=True)
+    member.pending = pending
+    member._flags = flags
+    # presences are not kept, they are sent again once the guild is available
+    member._client_status = {None: "offline"}
+    member.activities = ()
+    return member
+
+
+def dump(state: ConnectionState, sessions: List[GatewaySession]) -> List[bytes]:
+    """Returns the records of a snapshot of the state, header first.
+
+    Everything is encoded at once, as the caches must not change in between.
+    """
+    with _paused_gc():
+        return list(_dump(state, sessions))
+
+
+def _dump(state: ConnectionState, sessions: List[GatewaySession]) -> Iterator[bytes]:
+    yield MAGIC
+
+    def record(kind: int, payload: bytes) -> bytes:
+        return _header.pack(kind, len(payload)) + payload
+
+    meta = {
+        "saved_at": time.time(),
+        "application_id": state.application_id,
+        "shard_count": state.shard_count,
+        "shard_ids": list(getattr(state, "shard_ids", ())) or None,
+        "sessions": [session.to_dict() for session in sessions],
+    }
+    # the client user goes with the meta record, as everything else may reference it
+    yield record(RECORD_META, _pickle(state, (meta, state.user), meta=True))
+
+    # members of guilds can reference users that are not cached, such as deleted users
+    users: Dict[int, User] = {
+        user.id: user for user in state._users.values() if user.__class__ is User
+    }
+    for guild in state._guilds.values():
+        for member in guild._members.values():
+            user = member._user
+            if user.__class__ is User:
+                users.setdefault(user.id, user)
+
+    encoded = [_encode_user(user) for user in users.values()]
+    for index in range(0, len(encoded), USER_BATCH):
+        batch = encoded[index : index + USER_BATCH]
+        yield record(RECORD_USERS, pickle.dumps(batch, pickle.HIGHEST_PROTOCOL))
+
+    for guild in state._guilds.values():
+        # the caches of the guild are pickled as plain dicts, and made again when loaded
+        members, channels, threads = guild._members, guild._channels, guild._threads
+        guild._members = {}
+        guild._channels = dict(channels.items())
+        guild._threads = dict(threads.items())
+        try:
+            yield record(RECORD_GUILD, _pickle(state, guild))
+        finally:
+            guild._members, guild._channels, guild._threads = members, channels, threads
+
+        encoded = [_encode_member(member) for member in members.values()]
+        yield record(RECORD_MEMBERS, pickle.dumps((guild.id, encoded), pickle.HIGHEST_PROTOCOL))
+
+
+def write(path: str, records: List[bytes]) -> None:
+    """Writes the records of a snapshot to a file, replacing it atomically."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as fp:
+        fp.writelines(records)
+    os.replace(temporary, path)
+
+
+def _records(view: mmap.mmap) -> Iterator[Tuple[int, int, int]]:
+    # (kind, start, end) of every record
+    offset = len(MAGIC)
+    size = len(view)
+    while offset < size:
+        kind, length = _header.unpack_from(view, offset)
+        offset += _header.size
+        yield kind, offset, offset + length
+        offset += length
+
+
+def load(state: ConnectionState, path: str) -> Optional[Dict[str, Any]]:
+    """Restores the caches of the state from a snapshot file and returns its meta
+    record, or returns ``None`` if there is no snapshot.
+    """
+    try:
+        fp = open(path, "rb")  # noqa: SIM115
+    except FileNotFoundError:
+        return None
+
+    with fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as view, _paused_gc():
+        if view[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a snapshot written by this version")
+
+        meta: Dict[str, Any] = {}
+        # every user of the snapshot, including the users of members that are not
+        # cached, such as deleted users
+        users: Dict[int, User] = {}
+        for kind, start, end in _records(view):
+            view.seek(start)
+            if kind == RECORD_META:
+                meta, state.user = _Unpickler(view, state, users).load()
+            elif kind == RECORD_USERS:
+                for data in pickle.loads(view[start:end]):  # noqa: S301
+                    user = _decode_user(state, data)
+                    users[user.id] = user
+            elif kind == RECORD_GUILD:
+                guild = _Unpickler(view, state, users).load()
+                channels, threads = guild._channels, guild._threads
+                guild._new_caches()
+                guild._channels.update(channels)
+                guild._threads.update(threads)
+                state._add_restored_guild(guild)  # type: ignore
+            elif kind == RECORD_MEMBERS:
+                guild_id, encoded = pickle.loads(view[start:end])  # noqa: S301
+                guild = state._restored_guilds[guild_id]
+                members = guild._members
+                pin = state._users.pin if state._pin_users else None  # type: ignore
+                for data in encoded:
+                    user_id = data[0]
+                    members[user_id] = _decode_member(state, guild, users[user_id], data)
+                    if pin is not None:
+                        pin(user_id)
+
+        # cached last, so that a bounded cache keeps the users of members over the others
+        cache = state._users
+        for user_id, user in users.items():
+            if user._stored:
+                cache[user_id] = user
+
+    return meta
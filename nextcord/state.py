@@ -5,32 +5,40 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import copy
+import heapq
 import inspect
 import itertools
 import logging
 import os
+import time
 import warnings
-from collections import OrderedDict, deque
+from collections import OrderedDict
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     Coroutine,
-    Deque,
     Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
     List,
+    MutableMapping,
     Optional,
+    Sequence,
     Set,
     Tuple,
     TypeVar,
     Union,
+    overload,
 )
 
-from . import utils
+from . import memory, snapshot, utils
 from .activity import BaseActivity
 from .application_command import BaseApplicationCommand
 from .audit_logs import AuditLogEntry
 from .auto_moderation import AutoModerationActionExecution, AutoModerationRule
+from .cache import CacheBackend, DictBackend, LRUBackend
 from .channel import *
 from .channel import _channel_factory
 from .emoji import Emoji
@@ -48,10 +56,12 @@ from .partial_emoji import PartialEmoji
 from .raw_models import *
 from .role import Role
 from .scheduled_events import ScheduledEvent, ScheduledEventUser
+from .session import GatewaySession
 from .stage_instance import StageInstance
 from .sticker import GuildSticker
 from .threads import Thread, ThreadMember
 from .ui.modal import Modal, ModalStore
+from .ui.router import ComponentRouter
 from .ui.view import View, ViewStore
 from .user import ClientUser, User
 
@@ -61,7 +71,8 @@ if TYPE_CHECKING:
     from .abc import MessageableChannel, PrivateChannel
     from .application_command import SlashApplicationSubcommand
     from .client import Client
-    from .gateway import DiscordWebSocket
+    from .event_pool import EventPool
+    from .gateway import DiscordWebSocket, HeartbeatScheduler
     from .guild import GuildChannel, VocalGuildChannel
     from .http import HTTPClient
     from .types.activity import Activity as ActivityPayload
@@ -82,6 +93,9 @@ if TYPE_CHECKING:
 
 MISSING = utils.MISSING
 
+# payloads with more items than this are parsed in slices when a slice budget is set
+PARSE_SLICE_THRESHOLD = 256
+
 
 class ChunkRequest:
     def __init__(
@@ -131,8 +145,538 @@ class ChunkRequest:
                 future.set_result(self.buffer)
 
 
+class _ShardChunkQueue:
+    __slots__ = (
+        "heap",
+        "pending",
+        "in_flight",
+        "worker",
+        "slot",
+        "chunked",
+        "members",
+        "started",
+        "reported",
+    )
+
+    def __init__(self) -> None:
+        # (-priority, order, guild ID), entries whose priority is outdated are skipped
+        self.heap: List[Tuple[float, int, int]] = []
+        # guild ID: priority, for the guilds that were not requested yet
+        self.pending: Dict[int, float] = {}
+        self.in_flight: int = 0
+        self.worker: Optional[asyncio.Task[None]] = None
+        # set when a request completes, for the worker waiting for a free slot
+        self.slot: Optional[asyncio.Future[None]] = None
+        # progress since the queue was last idle
+        self.chunked: int = 0
+        self.members: int = 0
+        self.started: float = 0.0
+        self.reported: float = 0.0
+
+    def push(self, guild_id: int, priority: float, order: int) -> None:
+        self.pending[guild_id] = priority
+        heapq.heappush(self.heap, (-priority, order, guild_id))
+
+    def pop(self) -> Optional[int]:
+        heap = self.heap
+        pending = self.pending
+        while heap:
+            priority, _, guild_id = heapq.heappop(heap)
+            if pending.get(guild_id) == -priority:
+                del pending[guild_id]
+                return guild_id
+        return None
+
+
+class ChunkScheduler:
+    """Requests the members of guilds that need chunking, pipelining the requests of
+    each shard within the send budget of its websocket.
+
+    Guilds are requested in the order they were scheduled, except that guilds with recent
+    activity go first. Every guild has its own timeout, from when its request was sent,
+    and a ``chunk_progress`` event is dispatched for a shard as its guilds complete.
+    """
+
+    def __init__(
+        self,
+        state: ConnectionState,
+        *,
+        max_in_flight: int = 8,
+        reserve: int = 5,
+        timeout: float = 5.0,
+        progress_interval: float = 1.0,
+    ) -> None:
+        self._state: ConnectionState = state
+        self.max_in_flight: int = max_in_flight
+        # sends of the rate limit budget left for heartbeats, presences and voice
+        self.reserve: int = reserve
+        self.timeout: float = timeout
+        self.progress_interval: float = progress_interval
+        self._queues: Dict[int, _ShardChunkQueue] = {}
+        # guild ID: future resolved with whether the guild was chunked in time
+        self._futures: Dict[int, asyncio.Future[bool]] = {}
+        self._order: Iterator[int] = itertools.count()
+        self._tasks: Set[asyncio.Task[None]] = set()
+
+    def is_scheduled(self, guild_id: int) -> bool:
+        return guild_id in self._futures
+
+    def schedule(self, guild: Guild) -> asyncio.Future[bool]:
+        future = self._futures.get(guild.id)
+        if future is not None:
+            return future
+
+        self._futures[guild.id] = future = self._state.loop.create_future()
+        shard_id = guild.shard_id
+        queue = self._queues.get(shard_id)
+        if queue is None:
+            queue = self._queues[shard_id] = _ShardChunkQueue()
+        if not queue.pending and not queue.in_flight:
+            queue.chunked = queue.members = 0
+            queue.started = queue.reported = time.perf_counter()
+
+        queue.push(guild.id, 0.0, next(self._order))
+        if queue.worker is None:
+            queue.worker = asyncio.create_task(
+                self._run(shard_id, queue), name=f"nextcord: chunk scheduler for shard {shard_id}"
+            )
+        return future
+
+    def touch(self, guild: Guild) -> None:
+        # moves a guild that was not requested yet ahead of guilds without recent activity
+        queue = self._queues.get(guild.shard_id)
+        if queue is None:
+            return
+
+        priority = queue.pending.get(guild.id)
+        now = time.monotonic()
+        # busy guilds are only pushed again once a second, so the heap stays small
+        if priority is not None and now - priority >= 1.0:
+            queue.push(guild.id, now, next(self._order))
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of guilds waiting to be chunked, and the progress of each shard."""
+        return {
+            "scheduled": len(self._futures),
+            "shards": {
+                shard_id: {
+                    "pending": len(queue.pending),
+                    "in_flight": queue.in_flight,
+                    "chunked": queue.chunked,
+                    "members": queue.members,
+                }
+                for shard_id, queue in self._queues.items()
+            },
+        }
+
+    def clear(self) -> None:
+        for queue in self._queues.values():
+            if queue.worker is not None:
+                queue.worker.cancel()
+        for task in self._tasks:
+            task.cancel()
+
+        self._queues.clear()
+        self._tasks.clear()
+        for future in self._futures.values():
+            if not future.done():
+                future.set_result(False)
+        self._futures.clear()
+
+    async def _run(self, shard_id: int, queue: _ShardChunkQueue) -> None:
+        state = self._state
+        try:
+            while True:
+                while queue.in_flight >= self.max_in_flight:
+                    queue.slot = state.loop.create_future()
+                    await queue.slot
+
+                # popped as late as possible, so that recent activity is taken into account
+                guild_id = queue.pop()
+                if guild_id is None:
+                    return
+
+                guild = state._get_guild(guild_id)
+                if guild is None or guild.chunked:
+                    self._complete(shard_id, queue, guild_id, guild is not None)
+                    continue
+
+                await self._wait_for_budget(guild_id)
+                try:
+                    future = await state.chunk_guild(guild, wait=False)
+                except Exception:
+                    _log.exception(
+                        "Shard ID %s failed to request chunks for guild_id %s.", shard_id, guild_id
+                    )
+                    self._complete(shard_id, queue, guild_id, False)
+                    continue
+
+                queue.in_flight += 1
+                task = asyncio.create_task(self._wait_for_chunks(shard_id, queue, guild, future))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        finally:
+            queue.worker = None
+
+    async def _wait_for_budget(self, guild_id: int) -> None:
+        while True:
+            try:
+                limiter = self._state._get_websocket(guild_id)._rate_limiter
+            except (AttributeError, KeyError):
+                # not connected, requesting the chunks fails instead
+                return
+
+            if limiter.available() > self.reserve:
+                return
+            await asyncio.sleep(max(limiter.reset_after(), 0.1))
+
+    async def _wait_for_chunks(
+        self,
+        shard_id: int,
+        queue: _ShardChunkQueue,
+        guild: Guild,
+        future: asyncio.Future[List[Member]],
+    ) -> None:
+        # larger guilds are sent in more chunks, so they are given more time
+        timeout = self.timeout + (guild.member_count or 0) / 10000
+        try:
+            members = await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            _log.warning(
+                "Shard ID %s timed out waiting for chunks for guild_id %s.", shard_id, guild.id
+            )
+            chunked = False
+        else:
+            chunked = True
+            queue.members += len(members)
+
+        queue.in_flight -= 1
+        if queue.slot is not None and not queue.slot.done():
+            queue.slot.set_result(None)
+        self._complete(shard_id, queue, guild.id, chunked)
+
+    def _complete(
+        self, shard_id: int, queue: _ShardChunkQueue, guild_id: int, chunked: bool
+    ) -> None:
+        future = self._futures.pop(guild_id, None)
+        if future is not None and not future.done():
+            future.set_result(chunked)
+
+        queue.chunked += 1
+        remaining = len(queue.pending) + queue.in_flight
+        now = time.perf_counter()
+        if remaining and now - queue.reported < self.progress_interval:
+            return
+
+        queue.reported = now
+        elapsed = now - queue.started
+        rate = queue.members / elapsed if elapsed > 0 else 0.0
+        self._state.dispatch("chunk_progress", shard_id, queue.chunked, remaining, rate)
+
+
+class _MemberBatch:
+    __slots__ = ("user_ids", "waiters", "handle")
+
+    def __init__(self) -> None:
+        # dict rather than set, so that IDs are requested in the order they were asked for
+        self.user_ids: Dict[int, None] = {}
+        self.waiters: List[Tuple[List[int], asyncio.Future[List[Member]]]] = []
+        self.handle: Optional[asyncio.TimerHandle] = None
+
+
+class MemberBatcher:
+    """Merges concurrent lookups of members by user ID in the same guild into
+    requests of up to 100 IDs.
+
+    Lookups are held for ``window`` seconds, or until 100 IDs are waiting, and the
+    members that are returned are handed out to each lookup. IDs that are not
+    returned are remembered as missing for ``ttl`` seconds, unless the member joins.
+    """
+
+    MAX_USER_IDS = 100
+
+    def __init__(
+        self,
+        state: ConnectionState,
+        *,
+        window: float = 0.05,
+        ttl: float = 10.0,
+        timeout: float = 30.0,
+    ) -> None:
+        self._state: ConnectionState = state
+        self.window: float = window
+        self.ttl: float = ttl
+        self.timeout: float = timeout
+        # (guild ID, cache): lookups waiting to be sent
+        self._batches: Dict[Tuple[int, bool], _MemberBatch] = {}
+        # (guild ID, user ID): expiry, in expiry order as the TTL is the same for every ID
+        self._missing: Dict[Tuple[int, int], float] = {}
+        self._tasks: Set[asyncio.Task[None]] = set()
+
+    async def query(self, guild_id: int, user_ids: List[int], *, cache: bool) -> List[Member]:
+        self._prune(time.monotonic())
+        missing = self._missing
+        user_ids = [user_id for user_id in user_ids if (guild_id, user_id) not in missing]
+        if not user_ids:
+            return []
+
+        key = (guild_id, cache)
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _MemberBatch()
+            batch.handle = self._state.loop.call_later(self.window, self._flush, key)
+
+        future = self._state.loop.create_future()
+        batch.waiters.append((user_ids, future))
+        batch.user_ids.update(dict.fromkeys(user_ids))
+        if len(batch.user_ids) >= self.MAX_USER_IDS:
+            self._flush(key)
+        return await future
+
+    def forget(self, guild_id: int, user_id: int) -> None:
+        # the member joined, so it is no longer missing
+        self._missing.pop((guild_id, user_id), None)
+
+    def clear(self) -> None:
+        self._missing.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of lookups waiting to be sent and the number of missing IDs."""
+        return {
+            "batches": len(self._batches),
+            "waiting": sum(len(batch.waiters) for batch in self._batches.values()),
+            "missing": len(self._missing),
+        }
+
+    def _prune(self, now: float) -> None:
+        missing = self._missing
+        while missing:
+            key = next(iter(missing))
+            if missing[key] > now:
+                return
+            del missing[key]
+
+    def _flush(self, key: Tuple[int, bool]) -> None:
+        batch = self._batches.pop(key, None)
+        if batch is None:
+            return
+
+        if batch.handle is not None:
+            batch.handle.cancel()
+        task = asyncio.create_task(self._send(key[0], key[1], batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, guild_id: int, cache: bool, batch: _MemberBatch) -> None:
+        state = self._state
+        user_ids = list(batch.user_ids)
+        requests: List[ChunkRequest] = []
+        try:
+            ws = state._get_websocket(guild_id)
+            if ws is None:  # pyright: ignore[reportUnnecessaryComparison]
+                raise RuntimeError("Somehow do not have a websocket for this guild_id")
+
+            for index in range(0, len(user_ids), self.MAX_USER_IDS):
+                chunk = user_ids[index : index + self.MAX_USER_IDS]
+                request = ChunkRequest(guild_id, state.loop, state._get_guild, cache=cache)
+                state._chunk_requests[request.nonce] = request
+                requests.append(request)
+                await ws.request_chunks(
+                    guild_id, limit=len(chunk), user_ids=chunk, nonce=request.nonce
+                )
+
+            results = await asyncio.wait_for(
+                asyncio.gather(*(request.get_future() for request in requests)),
+                timeout=self.timeout,
+            )
+        except Exception as exc:
+            if isinstance(exc, asyncio.TimeoutError):
+                _log.warning(
+                    "Timed out waiting for chunks for %d user IDs for guild_id %d",
+                    len(user_ids),
+                    guild_id,
+                )
+            for request in requests:
+                state._chunk_requests.pop(request.nonce, None)
+            for _, future in batch.waiters:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        members = {member.id: member for result in results for member in result}
+        expiry = time.monotonic() + self.ttl
+        for user_id in user_ids:
+            if user_id not in members:
+                # moved to the end, so that the dict stays in expiry order
+                self._missing.pop((guild_id, user_id), None)
+                self._missing[(guild_id, user_id)] = expiry
+
+        for wanted, future in batch.waiters:
+            if not future.done():
+                future.set_result([members[user_id] for user_id in wanted if user_id in members])
+
+
+class MessageCache(Sequence[Message]):
+    """A bounded cache of messages indexed by message ID.
+
+    Messages are kept and iterated over in the order they were cached, oldest first.
+    Once ``maxlen`` is exceeded the least recently used message is evicted, which is
+    tracked separately so that looking a message up does not reorder the cache.
+    A secondary index groups messages by channel ID so that lookups, deletions and
+    per-channel or per-guild cleanups do not need to scan the whole cache.
+    """
+
+    __slots__ = ("maxlen", "_messages", "_recency", "_channels")
+
+    def __init__(self, maxlen: int) -> None:
+        self.maxlen: int = maxlen
+        self._messages: Dict[int, Message] = {}
+        # the IDs of the messages, least recently used first
+        self._recency: OrderedDict[int, None] = OrderedDict()
+        self._channels: Dict[int, Dict[int, Message]] = {}
+
+    def __repr__(self) -> str:
+        return f"<MessageCache maxlen={self.maxlen} len={len(self._messages)}>"
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(self._messages.values())
+
+    def __reversed__(self) -> Iterator[Message]:
+        return reversed(self._messages.values())
+
+    def __contains__(self, item: Any) -> bool:
+        if not isinstance(item, Message):
+            return False
+        return self._messages.get(item.id) is item
+
+    @overload
+    def __getitem__(self, idx: int) -> Message:
+        ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> List[Message]:
+        ...
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[Message, List[Message]]:
+        if isinstance(idx, slice):
+            return list(self._messages.values())[idx]
+
+        size = len(self._messages)
+        if idx < 0:
+            idx += size
+        if not 0 <= idx < size:
+            raise IndexError("message cache index out of range")
+
+        # walk from whichever end is closer
+        if idx < size // 2:
+            return next(itertools.islice(self._messages.values(), idx, None))
+        return next(itertools.islice(reversed(self._messages.values()), size - idx - 1, None))
+
+    def _unlink(self, message: Message) -> None:
+        channel_id = message.channel.id
+        try:
+            bucket = self._channels[channel_id]
+        except KeyError:
+            return
+
+        bucket.pop(message.id, None)
+        if not bucket:
+            del self._channels[channel_id]
+
+    def append(self, message: Message) -> None:
+        message_id = message.id
+        old = self._messages.pop(message_id, None)
+        if old is not None:
+            self._unlink(old)
+
+        self._messages[message_id] = message
+        recency = self._recency
+        recency[message_id] = None
+        recency.move_to_end(message_id)
+        try:
+            self._channels[message.channel.id][message_id] = message
+        except KeyError:
+            self._channels[message.channel.id] = {message_id: message}
+
+        if len(self._messages) > self.maxlen:
+            evicted_id, _ = recency.popitem(last=False)
+            self._unlink(self._messages.pop(evicted_id))
+
+    def get(self, message_id: Optional[int]) -> Optional[Message]:
+        try:
+            # the keys of self._messages are ints
+            message = self._messages[message_id]  # type: ignore
+        except KeyError:
+            return None
+        else:
+            self._recency.move_to_end(message_id)  # type: ignore
+            return message
+
+    def pop(self, message_id: Optional[int]) -> Optional[Message]:
+        # the keys of self._messages are ints
+        message = self._messages.pop(message_id, None)  # type: ignore
+        if message is not None:
+            del self._recency[message_id]  # type: ignore
+            self._unlink(message)
+        return message
+
+    def pop_many(self, message_ids: Iterable[int]) -> List[Message]:
+        messages = self._messages
+        found = [messages[message_id] for message_id in message_ids if message_id in messages]
+        # keep the oldest-first ordering the deque used to provide
+        found.sort(key=lambda m: m.id)
+        for message in found:
+            del messages[message.id]
+            del self._recency[message.id]
+            self._unlink(message)
+        return found
+
+    def channel_messages(self, channel_id: int) -> List[Message]:
+        return list(self._channels.get(channel_id, {}).values())
+
+    def remove_channel(self, channel_id: int) -> List[Message]:
+        bucket = self._channels.pop(channel_id, None)
+        if bucket is None:
+            return []
+
+        for message_id in bucket:
+            self._messages.pop(message_id, None)
+            self._recency.pop(message_id, None)
+        return list(bucket.values())
+
+    def remove_guild(self, guild: Guild) -> None:
+        # every message in a bucket shares a channel, and therefore a guild
+        channel_ids = [
+            channel_id
+            for channel_id, bucket in self._channels.items()
+            if next(iter(bucket.values())).guild == guild
+        ]
+        for channel_id in channel_ids:
+            self.remove_channel(channel_id)
+
+    def clear(self) -> None:
+        self._messages.clear()
+        self._recency.clear()
+        self._channels.clear()
+
+
 _log = logging.getLogger(__name__)
 
+# the kinds of entities whose caches the cache_backends parameter of Client configures
+CACHE_KINDS: Tuple[str, ...] = (
+    "users",
+    "guilds",
+    "emojis",
+    "stickers",
+    "private_channels",
+    "members",
+    "channels",
+    "threads",
+)
+
 
 async def logging_coroutine(coroutine: Coroutine[Any, Any, T], *, info: str) -> Optional[T]:
     try:
@@ -165,6 +709,7 @@ class ConnectionState:
         intents: Intents = Intents.default(),
         chunk_guilds_at_startup: bool = MISSING,
         member_cache_flags: MemberCacheFlags = MISSING,
+        cache_backends: Optional[Dict[str, CacheBackend]] = None,
     ) -> None:
         self.loop: asyncio.AbstractEventLoop = loop
         self.http: HTTPClient = http
@@ -190,6 +735,37 @@ class ConnectionState:
         self._chunk_requests: Dict[Union[int, str], ChunkRequest] = {}
         self._chunk_tasks: Dict[Union[int, str], asyncio.Task[None]] = {}
         self._background_tasks: Set[asyncio.Task] = set()
+        # set by the client when heartbeats are driven from the event loop
+        self._heartbeat_scheduler: Optional[HeartbeatScheduler] = None
+        self._gateway_compression: Optional[str] = "zlib-stream"
+        self._gateway_encoding: str = "json"
+        # set by the client, the websocket waits for it when it is full
+        self._event_pool: Optional[EventPool] = None
+        # when set, large payloads are parsed in slices of this many seconds by _parse_task,
+        # which the websocket awaits before it reads the next event
+        self._parse_slice_budget: Optional[float] = None
+        self._parse_task: Optional[asyncio.Task[None]] = None
+        # every parse in slices that is not done yet, the caches are incomplete until then
+        self._sliced_parses: Set[asyncio.Task[None]] = set()
+        # gateway event names the websocket may drop before decoding them
+        self._allowed_events: Optional[FrozenSet[str]] = None
+        self._ignored_events: FrozenSet[str] = frozenset()
+        # shared by the view and modal stores for their timeouts
+        self._timer_wheel: utils.TimerWheel = utils.TimerWheel()
+        # checked before the view store, and kept across reconnects as routes are static
+        self._component_router: ComponentRouter = ComponentRouter()
+        self._chunk_scheduler: ChunkScheduler = ChunkScheduler(self)
+        # set once the caches were restored from a previous process, which makes the
+        # sessions it saved safe to resume, see Client._load_sessions
+        self._cache_restored: bool = False
+        # shards resuming a session saved by a previous process, which never got READY
+        self._stored_resumes: Set[Optional[int]] = set()
+        # the sessions the snapshot the caches were restored from was taken in
+        self._snapshot_sessions: Dict[Optional[int], GatewaySession] = {}
+        # lookups of members by ID, merged into fewer REQUEST_GUILD_MEMBERS
+        self._member_batcher: MemberBatcher = MemberBatcher(self)
+        # set by the client, guilds are then chunked on their first message or interaction
+        self._chunk_lazily: bool = False
 
         if activity is not None:
             if not isinstance(activity, BaseActivity):
@@ -228,6 +804,9 @@ class ConnectionState:
             member_cache_flags._verify_intents(intents)
 
         self.member_cache_flags: MemberCacheFlags = member_cache_flags
+        self._cache_backends: Dict[str, CacheBackend] = self._resolve_cache_backends(
+            cache_backends or {}
+        )
         self._activity: Optional[ActivityPayload] = raw_activity
         self._status: Optional[str] = raw_status
         self._intents: Intents = intents
@@ -252,6 +831,65 @@ class ConnectionState:
 
         self.clear()
 
+    def _resolve_cache_backends(self, backends: Dict[str, CacheBackend]) -> Dict[str, CacheBackend]:
+        unknown = set(backends).difference(CACHE_KINDS)
+        if unknown:
+            raise ValueError(
+                f"Unknown cache kinds {', '.join(sorted(unknown))}, "
+                f"expected one of {', '.join(CACHE_KINDS)}"
+            )
+
+        for kind, backend in backends.items():
+            if not isinstance(backend, CacheBackend):
+                raise TypeError(
+                    f"cache backend for {kind} must be CacheBackend not {type(backend)!r}"
+                )
+
+        if "members" in backends and self.member_cache_flags.columnar:
+            raise ValueError(
+                "MemberCacheFlags.columnar cannot be used with a members cache backend"
+            )
+
+        default = DictBackend()
+        resolved = {kind: default for kind in CACHE_KINDS}
+        # the private channels were always an LRU of 128
+        resolved["private_channels"] = LRUBackend(128)
+        resolved.update(backends)
+        return resolved
+
+    def _new_cache(
+        self, kind: str, on_evict: Optional[Callable[[int, Any], None]] = None
+    ) -> MutableMapping[int, Any]:
+        return self._cache_backends[kind].create(on_evict)
+
+    def memory_report(self, top: int = 10) -> Dict[str, Any]:
+        return memory.report(self, top)
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        def of(cache: Any) -> Dict[str, Any]:
+            stats = getattr(cache, "stats", None)
+            return {"size": len(cache)} if stats is None else stats()
+
+        result = {
+            "users": of(self._users),
+            "guilds": of(self._guilds),
+            "emojis": of(self._emojis),
+            "stickers": of(self._stickers),
+            "private_channels": of(self._private_channels),
+            "messages": {
+                "size": len(self._messages) if self._messages is not None else 0,
+                "maxsize": self.max_messages,
+            },
+        }
+        # the caches of every guild are added up
+        for kind in ("members", "channels", "threads"):
+            total: Dict[str, Any] = {"size": 0}
+            for guild in self._guilds.values():
+                for key, value in of(getattr(guild, f"_{kind}")).items():
+                    total[key] = value if key == "maxsize" else total.get(key, 0) + value
+            result[kind] = total
+        return result
+
     def clear(self, *, views: bool = True, modals: bool = True) -> None:
         self.user: Optional[ClientUser] = None
         # Originally, this code used WeakValueDictionary to maintain references to the
@@ -266,10 +904,23 @@ class ConnectionState:
         # references now using a regular dictionary with eviction being done
         # using __del__. Testing this for memory leaks led to no discernible leaks,
         # though more testing will have to be done.
-        self._users: Dict[int, User] = {}
-        self._emojis: Dict[int, Emoji] = {}
-        self._stickers: Dict[int, GuildSticker] = {}
-        self._guilds: Dict[int, Guild] = {}
+        self._users: MutableMapping[int, User] = self._new_cache("users")
+        # set when the users cache can evict users, the users of cached members are then
+        # pinned once per member so that they stay cached
+        self._pin_users: bool = hasattr(self._users, "pin")
+        self._emojis: MutableMapping[int, Emoji] = self._new_cache("emojis")
+        self._stickers: MutableMapping[int, GuildSticker] = self._new_cache("stickers")
+        self._guilds: MutableMapping[int, Guild] = self._new_cache("guilds", self._evict_guild)
+        # the guilds waiting to be chunked are gone
+        self._chunk_scheduler.clear()
+        # members may have joined while disconnected
+        self._member_batcher.clear()
+        # guilds restored from a snapshot that the gateway did not send again yet
+        self._restored_guilds: Dict[int, Guild] = {}
+        # guild channel, thread and scheduled event IDs mapped to the ID of their guild,
+        # so that they can be looked up without going through every guild
+        self._channel_guild_ids: Dict[int, int] = {}
+        self._scheduled_event_guild_ids: Dict[int, int] = {}
         # TODO: Why aren't the above and stuff below application_commands declared in __init__?
         self._application_commands = set()
         # Thought about making these two weakref.WeakValueDictionary's, but the bot could theoretically be holding on
@@ -283,14 +934,39 @@ class ConnectionState:
 
         self._voice_clients: Dict[int, VoiceProtocol] = {}
 
-        # LRU of max size 128
-        self._private_channels: OrderedDict[int, PrivateChannel] = OrderedDict()
+        # an LRU of 128 unless configured otherwise
+        self._private_channels: MutableMapping[int, PrivateChannel] = self._new_cache(
+            "private_channels", self._evict_private_channel
+        )
         # extra dict to look up private channels by user id
         self._private_channels_by_user: Dict[int, DMChannel] = {}
         if self.max_messages is not None:
-            self._messages: Optional[Deque[Message]] = deque(maxlen=self.max_messages)
+            self._messages: Optional[MessageCache] = MessageCache(self.max_messages)
         else:
-            self._messages: Optional[Deque[Message]] = None
+            self._messages: Optional[MessageCache] = None
+
+    def set_event_filter(
+        self,
+        *,
+        allowed_events: Optional[Iterable[str]] = None,
+        ignored_events: Optional[Iterable[str]] = None,
+    ) -> None:
+        if allowed_events is not None and ignored_events is not None:
+            raise TypeError("allowed_events and ignored_events are mutually exclusive")
+
+        self._allowed_events = (
+            None if allowed_events is None else frozenset(e.upper() for e in allowed_events)
+        )
+        self._ignored_events = frozenset(e.upper() for e in ignored_events or ())
+
+    @property
+    def _filters_events(self) -> bool:
+        return self._allowed_events is not None or bool(self._ignored_events)
+
+    def _is_event_wanted(self, event: str) -> bool:
+        if self._allowed_events is not None:
+            return event in self._allowed_events
+        return event not in self._ignored_events
 
     def process_chunk_requests(
         self, guild_id: int, nonce: Optional[str], members: List[Member], complete: bool
@@ -306,6 +982,39 @@ class ConnectionState:
         for key in removed:
             del self._chunk_requests[key]
 
+    def _should_slice(self, *payloads: List[Any]) -> bool:
+        return (
+            self._parse_slice_budget is not None
+            and sum(len(payload) for payload in payloads) > PARSE_SLICE_THRESHOLD
+        )
+
+    def _parse_in_slices(self, coro: Coroutine[Any, Any, None]) -> None:
+        self._parse_task = task = asyncio.create_task(coro, name="nextcord: sliced parse")
+        self._sliced_parses.add(task)
+        task.add_done_callback(self._sliced_parses.discard)
+
+    async def _wait_for_sliced_parses(self) -> None:
+        # new parses may start while waiting, as other shards keep reading
+        while self._sliced_parses:
+            await asyncio.wait(set(self._sliced_parses))
+
+    async def _run_sliced(self, items: Iterable[Any], func: Callable[[Any], Any]) -> None:
+        def run(batch: List[Any]) -> None:
+            for item in batch:
+                func(item)
+
+        await self._run_in_batches(list(items), run)
+
+    async def _run_in_batches(self, items: List[Any], func: Callable[[List[Any]], Any]) -> None:
+        # yields to the event loop whenever the current slice has used up its budget
+        budget: float = self._parse_slice_budget  # type: ignore
+        deadline = time.perf_counter() + budget
+        for start in range(0, len(items), 16):
+            func(items[start : start + 16])
+            if time.perf_counter() >= deadline:
+                await asyncio.sleep(0)
+                deadline = time.perf_counter() + budget
+
     def call_handlers(self, key: str, *args: Any, **kwargs: Any) -> None:
         try:
             func = self.handlers[key]
@@ -416,18 +1125,116 @@ class ConnectionState:
         return self._guilds.get(guild_id)  # type: ignore
 
     def _add_guild(self, guild: Guild) -> None:
+        if self._pin_users:
+            replaced = self._guilds.get(guild.id)
+            if replaced is not None and replaced is not guild:
+                self._unpin_members(replaced)
         self._guilds[guild.id] = guild
 
     def _remove_guild(self, guild: Guild) -> None:
-        self._guilds.pop(guild.id, None)
-
+        # restored guilds that were not added again never pinned their members
+        if self._guilds.pop(guild.id, None) is guild:
+            self._unpin_members(guild)
+        self._unindex_guild(guild)
+
+    def _evict_guild(self, guild_id: int, guild: Guild) -> None:
+        self._unpin_members(guild)
+        self._unindex_guild(guild)
+
+    def _unpin_members(self, guild: Guild) -> None:
+        if self._pin_users:
+            unpin = self._users.unpin  # type: ignore
+            for user_id in guild._members:
+                unpin(user_id)
+
+    def _unindex_guild(self, guild: Guild) -> None:
+        # removes what the guild added to the other caches and indexes
         for emoji in guild.emojis:
             self._emojis.pop(emoji.id, None)
 
         for sticker in guild.stickers:
             self._stickers.pop(sticker.id, None)
 
-        del guild
+        for channel_id in guild._channels:
+            self._channel_guild_ids.pop(channel_id, None)
+
+        for thread_id in guild._threads:
+            self._channel_guild_ids.pop(thread_id, None)
+
+        for event_id in guild._scheduled_events:
+            self._scheduled_event_guild_ids.pop(event_id, None)
+
+    def _add_restored_guild(self, guild: Guild) -> None:
+        self._add_guild(guild)
+        self._restored_guilds[guild.id] = guild
+        if self._pin_users:
+            for user_id in guild._members:
+                self._users.pin(user_id)  # type: ignore
+        for emoji in guild.emojis:
+            self._emojis[emoji.id] = emoji
+
+        for sticker in guild.stickers:
+            self._stickers[sticker.id] = sticker
+
+        for channel_id in guild._channels:
+            self._index_channel(guild.id, channel_id)
+
+        for thread_id in guild._threads:
+            self._index_channel(guild.id, thread_id)
+
+        for event_id in guild._scheduled_events:
+            self._index_scheduled_event(guild.id, event_id)
+
+    def _reconcile_restored_guilds(self, data) -> None:
+        # Restored guilds of this shard that READY does not list were left while offline,
+        # the others are kept for lookups until their GUILD_CREATE replaces them.
+        listed = {int(guild_data["id"]) for guild_data in data["guilds"]}
+        shard_id = data.get("__shard_id__")
+        for guild_id, guild in list(self._restored_guilds.items()):
+            if guild_id in listed:
+                self._add_restored_guild(guild)
+            elif shard_id is None or guild.shard_id == shard_id:
+                del self._restored_guilds[guild_id]
+                self._remove_guild(guild)
+
+    def _add_ready_guild(self, data: GuildPayload) -> None:
+        if int(data["id"]) not in self._restored_guilds:
+            self._add_guild_from_data(data)
+
+    def dump_snapshot(self, sessions: List[GatewaySession]) -> List[bytes]:
+        return snapshot.dump(self, sessions)
+
+    def load_snapshot(self, path: str) -> bool:
+        meta = snapshot.load(self, path)
+        if meta is None:
+            return False
+
+        shard_ids = list(getattr(self, "shard_ids", ())) or None
+        if meta["shard_count"] != self.shard_count or meta["shard_ids"] != shard_ids:
+            # the guilds would not match the shards that are launched
+            _log.warning("Ignoring the cache snapshot %s, it was taken with other shards.", path)
+            self.clear()
+            return False
+
+        if self.application_id is None:
+            self.application_id = meta["application_id"]
+        self._snapshot_sessions = {
+            session.shard_id: session for session in map(GatewaySession.from_dict, meta["sessions"])
+        }
+        self._cache_restored = True
+        return True
+
+    def _index_channel(self, guild_id: int, channel_id: int) -> None:
+        self._channel_guild_ids[channel_id] = guild_id
+
+    def _unindex_channel(self, channel_id: int) -> None:
+        self._channel_guild_ids.pop(channel_id, None)
+
+    def _index_scheduled_event(self, guild_id: int, event_id: int) -> None:
+        self._scheduled_event_guild_ids[event_id] = guild_id
+
+    def _unindex_scheduled_event(self, event_id: int) -> None:
+        self._scheduled_event_guild_ids.pop(event_id, None)
 
     @property
     def emojis(self) -> List[Emoji]:
@@ -450,28 +1257,15 @@ class ConnectionState:
         return list(self._private_channels.values())
 
     def _get_private_channel(self, channel_id: Optional[int]) -> Optional[PrivateChannel]:
-        try:
-            # the keys of self._private_channels are ints
-            value = self._private_channels[channel_id]  # type: ignore
-        except KeyError:
-            return None
-        else:
-            self._private_channels.move_to_end(channel_id)  # type: ignore
-            return value
+        # the keys of self._private_channels are ints
+        return self._private_channels.get(channel_id)  # type: ignore
 
     def _get_private_channel_by_user(self, user_id: Optional[int]) -> Optional[DMChannel]:
         # the keys of self._private_channels are ints
         return self._private_channels_by_user.get(user_id)  # type: ignore
 
     def _add_private_channel(self, channel: PrivateChannel) -> None:
-        channel_id = channel.id
-        self._private_channels[channel_id] = channel
-
-        if len(self._private_channels) > 128:
-            _, to_remove = self._private_channels.popitem(last=False)
-            if isinstance(to_remove, DMChannel) and to_remove.recipient:
-                self._private_channels_by_user.pop(to_remove.recipient.id, None)
-
+        self._private_channels[channel.id] = channel
         if isinstance(channel, DMChannel) and channel.recipient:
             self._private_channels_by_user[channel.recipient.id] = channel
 
@@ -483,31 +1277,39 @@ class ConnectionState:
 
     def _remove_private_channel(self, channel: PrivateChannel) -> None:
         self._private_channels.pop(channel.id, None)
+        self._evict_private_channel(channel.id, channel)
+
+    def _evict_private_channel(self, channel_id: int, channel: PrivateChannel) -> None:
         if isinstance(channel, DMChannel):
             recipient = channel.recipient
             if recipient is not None:
                 self._private_channels_by_user.pop(recipient.id, None)
 
     def _get_message(self, msg_id: Optional[int]) -> Optional[Message]:
-        return (
-            utils.find(lambda m: m.id == msg_id, reversed(self._messages))
-            if self._messages
-            else None
-        )
+        return self._messages.get(msg_id) if self._messages else None
 
     def _add_guild_from_data(self, data: GuildPayload) -> Guild:
         guild = Guild(data=data, state=self)
         self._add_guild(guild)
         return guild
 
-    def _guild_needs_chunking(self, guild: Guild) -> bool:
+    def _guild_needs_chunking(self, guild: Guild, *, lazily: bool = False) -> bool:
         # If presences are enabled then we get back the old guild.large behaviour
         return (
-            self._chunk_guilds
+            (self._chunk_lazily if lazily else self._chunk_guilds)
             and not guild.chunked
             and not (self._intents.presences and not guild.large)
         )
 
+    def _note_guild_activity(self, guild: Guild) -> None:
+        # guilds with recent activity are chunked first, lazily chunked guilds on their first
+        scheduler = self._chunk_scheduler
+        if scheduler.is_scheduled(guild.id):
+            scheduler.touch(guild)
+        elif self._guild_needs_chunking(guild, lazily=True):
+            scheduler.schedule(guild)
+            scheduler.touch(guild)
+
     def _get_guild_channel(
         self, data: MessagePayload
     ) -> Tuple[Union[Channel, Thread], Optional[Guild]]:
@@ -1181,6 +1983,10 @@ class ConnectionState:
         presences: bool,
     ) -> List[Member]:
         guild_id = guild.id
+        if user_ids and query is None and not presences:
+            # concurrent lookups by ID are sent together
+            return await self._member_batcher.query(guild_id, user_ids, cache=cache)
+
         ws = self._get_websocket(guild_id)
         if ws is None:  # pyright: ignore[reportUnnecessaryComparison]
             raise RuntimeError("Somehow do not have a websocket for this guild_id")
@@ -1222,23 +2028,15 @@ class ConnectionState:
                     break
                 else:
                     if self._guild_needs_chunking(guild):
-                        future = await self.chunk_guild(guild, wait=False)
-                        states.append((guild, future))
+                        # the scheduler times out and logs each guild on its own
+                        states.append((guild, self._chunk_scheduler.schedule(guild)))
                     elif guild.unavailable is False:
                         self.dispatch("guild_available", guild)
                     else:
                         self.dispatch("guild_join", guild)
 
             for guild, future in states:
-                try:
-                    await asyncio.wait_for(future, timeout=5.0)
-                except asyncio.TimeoutError:
-                    _log.warning(
-                        "Shard ID %s timed out waiting for chunks for guild_id %s.",
-                        guild.shard_id,
-                        guild.id,
-                    )
-
+                await future
                 if guild.unavailable is False:
                     self.dispatch("guild_available", guild)
                 else:
@@ -1263,7 +2061,16 @@ class ConnectionState:
             self._ready_task.cancel()
 
         self._ready_state = asyncio.Queue()
+        self._stored_resumes.clear()
+        # restored guilds and their users stay cached until the guilds are replaced
+        users, restored = self._users, self._restored_guilds
         self.clear(views=False)
+        if restored:
+            self._restored_guilds = restored
+            # the users of the members of restored guilds are pinned before they are cached
+            self._reconcile_restored_guilds(data)
+            self._users.update(users.items())
+
         self.user = ClientUser(state=self, data=data["user"])
         self.store_user(data["user"])
 
@@ -1277,17 +2084,35 @@ class ConnectionState:
                 # flags will always be present here
                 self.application_flags = ApplicationFlags._from_value(application["flags"])
 
+        if self._should_slice(data["guilds"]):
+            self._parse_in_slices(self._parse_ready_guilds(data))
+            return
+
         for guild_data in data["guilds"]:
-            self._add_guild_from_data(guild_data)
+            self._add_ready_guild(guild_data)
+
+        self._ready_guilds_parsed(data)
 
+    async def _parse_ready_guilds(self, data) -> None:
+        await self._run_sliced(data["guilds"], self._add_ready_guild)
+        self._ready_guilds_parsed(data)
+
+    def _ready_guilds_parsed(self, data) -> None:
         self.dispatch("connect")
         self._ready_task = asyncio.create_task(self._delay_ready())
 
     def parse_resumed(self, data) -> None:
         self.dispatch("resumed")
+        if self._stored_resumes:
+            # the session was saved by a previous process, so this is the first ready
+            self._stored_resumes.clear()
+            self.call_handlers("ready")
+            self.dispatch("ready")
 
     def parse_message_create(self, data) -> None:
-        channel, _ = self._get_guild_channel(data)
+        channel, guild = self._get_guild_channel(data)
+        if guild is not None:
+            self._note_guild_activity(guild)
         # channel would be the correct type here
         message = Message(channel=channel, data=data, state=self)  # type: ignore
         self.dispatch("message", message)
@@ -1304,23 +2129,15 @@ class ConnectionState:
         self.dispatch("raw_message_delete", raw)
         if self._messages is not None and found is not None:
             self.dispatch("message_delete", found)
-            self._messages.remove(found)
+            self._messages.pop(found.id)
 
     def parse_message_delete_bulk(self, data) -> None:
         raw = RawBulkMessageDeleteEvent(data)
-        if self._messages:
-            found_messages = [
-                message for message in self._messages if message.id in raw.message_ids
-            ]
-        else:
-            found_messages = []
+        found_messages = self._messages.pop_many(raw.message_ids) if self._messages else []
         raw.cached_messages = found_messages
         self.dispatch("raw_bulk_message_delete", raw)
         if found_messages:
             self.dispatch("bulk_message_delete", found_messages)
-            for msg in found_messages:
-                # self._messages won't be None here
-                self._messages.remove(msg)  # type: ignore
 
     def parse_message_update(self, data) -> None:
         raw = RawMessageUpdateEvent(data)
@@ -1417,10 +2234,15 @@ class ConnectionState:
 
     def parse_interaction_create(self, data) -> None:
         interaction = self._get_client().get_interaction(data=data)
+        if interaction.guild_id is not None:
+            guild = self._get_guild(interaction.guild_id)
+            if guild is not None:
+                self._note_guild_activity(guild)
         if data["type"] == 3:  # interaction component
             custom_id = interaction.data["custom_id"]  # type: ignore
             component_type = interaction.data["component_type"]  # type: ignore
-            self._view_store.dispatch(component_type, custom_id, interaction)
+            if not self._component_router.dispatch(component_type, custom_id, interaction):
+                self._view_store.dispatch(component_type, custom_id, interaction)
         if data["type"] == 5:  # modal submit
             custom_id = interaction.data["custom_id"]  # type: ignore
             # key exists if type is 5 etc
@@ -1613,7 +2435,7 @@ class ConnectionState:
         except KeyError:
             # If not provided, then the entire guild is being synced
             # So all previous thread data should be overwritten
-            previous_threads = guild._threads.copy()
+            previous_threads = dict(guild._threads.items())
             guild._clear_threads()
         else:
             previous_threads = guild._filter_threads(channel_ids)
@@ -1703,6 +2525,7 @@ class ConnectionState:
             return
 
         member = Member(guild=guild, data=data, state=self)
+        self._member_batcher.forget(guild.id, member.id)
         if self.member_cache_flags.joined:
             guild._add_member(member)
 
@@ -1799,6 +2622,12 @@ class ConnectionState:
         self.dispatch("guild_stickers_update", guild, before_stickers, guild.stickers)
 
     def _get_create_guild(self, data):
+        restored = self._restored_guilds.pop(int(data["id"]), None)
+        if restored is not None:
+            # replaced as a whole, as the snapshot may have members that left since
+            self._remove_guild(restored)
+            return self._add_guild_from_data(data)
+
         if data.get("unavailable") is False:
             # GUILD_CREATE with unavailable in the response
             # usually means that the guild has become available
@@ -1829,11 +2658,7 @@ class ConnectionState:
         return request.get_future()
 
     async def _chunk_and_dispatch(self, guild, unavailable) -> None:
-        try:
-            await asyncio.wait_for(self.chunk_guild(guild), timeout=60.0)
-        except asyncio.TimeoutError:
-            _log.info("Somehow timed out waiting for chunks.")
-
+        await self._chunk_scheduler.schedule(guild)
         if unavailable is False:
             self.dispatch("guild_available", guild)
         else:
@@ -1845,8 +2670,26 @@ class ConnectionState:
             # joined a guild with unavailable == True so..
             return
 
+        if self._should_slice(data.get("members", []), data.get("presences", [])):
+            self._parse_in_slices(self._parse_guild_create_sliced(data, unavailable))
+            return
+
         guild = self._get_create_guild(data)
+        self._guild_created(guild, unavailable)
 
+    async def _parse_guild_create_sliced(self, data, unavailable) -> None:
+        # everything but the members and presences is parsed at once
+        data = dict(data)
+        members = data.pop("members", [])
+        presences = data.pop("presences", [])
+        guild = self._get_create_guild(data)
+
+        await self._run_in_batches(members, guild._add_members_from_data)
+        await self._run_in_batches(presences, guild._update_presences)
+        # guild_available and guild_join are only dispatched once the guild is complete
+        self._guild_created(guild, unavailable)
+
+    def _guild_created(self, guild: Guild, unavailable: Optional[bool]) -> None:
         try:
             # Notify the on_ready state, if any, that this guild is complete.
             self._ready_state.put_nowait(guild)
@@ -1893,9 +2736,7 @@ class ConnectionState:
 
         # do a cleanup of the messages cache
         if self._messages is not None:
-            self._messages: Optional[Deque[Message]] = deque(
-                (msg for msg in self._messages if msg.guild != guild), maxlen=self.max_messages
-            )
+            self._messages.remove_guild(guild)
 
         self._remove_guild(guild)
         self.dispatch("guild_remove", guild)
@@ -1969,12 +2810,28 @@ class ConnectionState:
             )
 
     def parse_guild_members_chunk(self, data) -> None:
+        if self._should_slice(data.get("members", []), data.get("presences", [])):
+            self._parse_in_slices(self._parse_guild_members_chunk_sliced(data))
+            return
+
         guild_id = int(data["guild_id"])
         guild = self._get_guild(guild_id)
-        presences = data.get("presences", [])
-
         # the guild won't be None here
         members = [Member(guild=guild, data=member, state=self) for member in data.get("members", [])]  # type: ignore
+        self._process_members_chunk(data, guild_id, members)
+
+    async def _parse_guild_members_chunk_sliced(self, data) -> None:
+        guild_id = int(data["guild_id"])
+        guild = self._get_guild(guild_id)
+        members: List[Member] = []
+        await self._run_sliced(
+            data.get("members", []),
+            lambda member: members.append(Member(guild=guild, data=member, state=self)),  # type: ignore
+        )
+        self._process_members_chunk(data, guild_id, members)
+
+    def _process_members_chunk(self, data, guild_id: int, members: List[Member]) -> None:
+        presences = data.get("presences", [])
         _log.debug("Processed a chunk for %s members in guild ID %s.", len(members), guild_id)
 
         if presences:
@@ -2220,19 +3077,13 @@ class ConnectionState:
         if pm is not None:
             return pm
 
-        for guild in self.guilds:
-            channel = guild._resolve_channel(id)
-            if channel is not None:
-                return channel
-
-        return None
+        # the guild is looked up again, so stale index entries resolve to None
+        guild = self._guilds.get(self._channel_guild_ids.get(id))  # type: ignore
+        return guild and guild._resolve_channel(id)
 
     def get_scheduled_event(self, id: int) -> Optional[ScheduledEvent]:
-        for guild in self.guilds:
-            if event := guild.get_scheduled_event(id):
-                return event
-
-        return None
+        guild = self._guilds.get(self._scheduled_event_guild_ids.get(id))  # type: ignore
+        return guild and guild.get_scheduled_event(id)
 
     def create_message(
         self,
@@ -2405,9 +3256,7 @@ class AutoShardedConnectionState(ConnectionState):
 
     async def _delay_ready(self) -> None:
         await self.shards_launched.wait()
-        processed = []
-        max_concurrency = len(self.shard_ids) * 2
-        current_bucket = []
+        processed: Dict[int, List[Tuple[Guild, Optional[Future[bool]]]]] = {}
         while True:
             # this snippet of code is basically waiting N seconds
             # until the last GUILD_CREATE was sent
@@ -2418,57 +3267,23 @@ class AutoShardedConnectionState(ConnectionState):
             except asyncio.TimeoutError:
                 break
             else:
+                future = None
                 if self._guild_needs_chunking(guild):
                     _log.debug(
                         "Guild ID %d requires chunking, will be done in the background.", guild.id
                     )
-                    if len(current_bucket) >= max_concurrency:
-                        try:
-                            await utils.sane_wait_for(
-                                current_bucket, timeout=max_concurrency * 70.0
-                            )
-                        except asyncio.TimeoutError:
-                            fmt = "Shard ID %s failed to wait for chunks from a sub-bucket with length %d"
-                            _log.warning(fmt, guild.shard_id, len(current_bucket))
-                        finally:
-                            current_bucket = []
-
                     # Chunk the guild in the background while we wait for GUILD_CREATE streaming
-                    future = asyncio.ensure_future(self.chunk_guild(guild))
-                    current_bucket.append(future)
-                else:
-                    future = self.loop.create_future()
-                    future.set_result([])
-
-                processed.append((guild, future))
-
-        processed: list[tuple[Guild, Future]]
-        key: Callable[[tuple[Guild, Future[list[Member]]]], int] = lambda g: g[0].shard_id
-        guilds = sorted(processed, key=key)
-        for shard_id, info in itertools.groupby(guilds, key=key):
-            children: Tuple[Guild]
-            futures: Tuple[Future]
-            # zip with `*` should, and will, return 2 tuples since every element is 2 length
-            # but pyright believes otherwise.
-            children, futures = zip(*info)  # type: ignore
-            # 110 reqs/minute w/ 1 req/guild plus some buffer
-            timeout = 61 * (len(children) / 110)
-            try:
-                await utils.sane_wait_for(futures, timeout=timeout)
-            except asyncio.TimeoutError:
-                _log.warning(
-                    "Shard ID %s failed to wait for chunks (timeout=%.2f) for %d guilds",
-                    shard_id,
-                    timeout,
-                    len(guilds),
-                )
-            for guild in children:
-                if guild.unavailable is False:
-                    self.dispatch("guild_available", guild)
-                else:
-                    self.dispatch("guild_join", guild)
+                    future = self._chunk_scheduler.schedule(guild)
+
+                processed.setdefault(guild.shard_id, []).append((guild, future))
 
-            self.dispatch("shard_ready", shard_id)
+        # the shards are chunked in parallel, each is ready once its own guilds are
+        await asyncio.gather(
+            *(
+                self._dispatch_shard_ready(shard_id, guilds)
+                for shard_id, guilds in sorted(processed.items())
+            )
+        )
 
         # remove the state
         # AttributeError if already been deleted somehow
@@ -2484,6 +3299,21 @@ class AutoShardedConnectionState(ConnectionState):
         self.call_handlers("ready")
         self.dispatch("ready")
 
+    async def _dispatch_shard_ready(
+        self, shard_id: int, guilds: List[Tuple[Guild, Optional[Future[bool]]]]
+    ) -> None:
+        for _, future in guilds:
+            if future is not None:
+                await future
+
+        for guild, _ in guilds:
+            if guild.unavailable is False:
+                self.dispatch("guild_available", guild)
+            else:
+                self.dispatch("guild_join", guild)
+
+        self.dispatch("shard_ready", shard_id)
+
     def parse_ready(self, data) -> None:
         if not hasattr(self, "_ready_state"):
             self._ready_state = asyncio.Queue()
@@ -2491,6 +3321,8 @@ class AutoShardedConnectionState(ConnectionState):
         self.user = user = ClientUser(state=self, data=data["user"])
         # self._users is a list of Users, we're setting a ClientUser
         self._users[user.id] = user  # type: ignore
+        if self._restored_guilds:
+            self._reconcile_restored_guilds(data)
 
         if self.application_id is None:
             try:
@@ -2501,18 +3333,41 @@ class AutoShardedConnectionState(ConnectionState):
                 self.application_id = utils.get_as_snowflake(application, "id")
                 self.application_flags = ApplicationFlags._from_value(application["flags"])
 
+        if self._should_slice(data["guilds"]):
+            self._parse_in_slices(self._parse_ready_guilds(data))
+            return
+
         for guild_data in data["guilds"]:
-            self._add_guild_from_data(guild_data)
+            self._add_ready_guild(guild_data)
 
+        self._ready_guilds_parsed(data)
+
+    def _ready_guilds_parsed(self, data) -> None:
         if self._messages:
             self._update_message_references()
 
         self.dispatch("connect")
         self.dispatch("shard_connect", data["__shard_id__"])
+        self._stored_resumes.discard(data["__shard_id__"])
 
         if self._ready_task is None:
             self._ready_task = asyncio.create_task(self._delay_ready())
 
     def parse_resumed(self, data) -> None:
+        shard_id = data["__shard_id__"]
         self.dispatch("resumed")
-        self.dispatch("shard_resumed", data["__shard_id__"])
+        self.dispatch("shard_resumed", shard_id)
+        if shard_id not in self._stored_resumes:
+            return
+
+        # the session was saved by a previous process, so the shard is ready now
+        self._stored_resumes.discard(shard_id)
+        self.dispatch("shard_ready", shard_id)
+        # shards that failed to resume identify instead, and _delay_ready dispatches ready
+        if (
+            not self._stored_resumes
+            and self._ready_task is None
+            and not self._get_client().is_ready()
+        ):
+            self.call_handlers("ready")
+            self.dispatch("ready")
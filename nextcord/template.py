@@ -29,6 +29,8 @@ class _FriendlyHttpAttributeErrorHelper:
 
 
 class _PartialTemplateState:
+    _pin_users = False
+
     def __init__(self, *, state) -> None:
         self.__state = state
         self.http = _FriendlyHttpAttributeErrorHelper()
@@ -52,6 +54,21 @@ class _PartialTemplateState:
     def store_emoji(self, guild, packet):
         return None
 
+    def _new_cache(self, kind, on_evict=None):
+        return {}
+
+    def _index_channel(self, guild_id, channel_id):
+        return None
+
+    def _unindex_channel(self, channel_id):
+        return None
+
+    def _index_scheduled_event(self, guild_id, event_id):
+        return None
+
+    def _unindex_scheduled_event(self, event_id):
+        return None
+
     def _get_voice_client(self, id):
         return None
 
@@ -13,7 +13,7 @@ from .enums import ChannelType, try_enum
 from .errors import ClientException
 from .flags import ChannelFlags
 from .mixins import Hashable, PinsMixin
-from .utils import MISSING, get_as_snowflake, parse_time
+from .utils import MISSING, get_as_snowflake, lazy_slot_property, parse_time
 
 __all__ = (
     "Thread",
@@ -134,8 +134,8 @@ class Thread(Messageable, Hashable, PinsMixin):
         "invitable",
         "archiver_id",
         "auto_archive_duration",
-        "archive_timestamp",
-        "create_timestamp",
+        "_archive_timestamp",
+        "_create_timestamp",
         "flags",
         "applied_tag_ids",
     )
@@ -163,7 +163,7 @@ class Thread(Messageable, Hashable, PinsMixin):
         self.parent_id = int(data["parent_id"])
         self.owner_id = int(data["owner_id"])
         self.name = data["name"]
-        self._type = try_enum(ChannelType, data["type"])
+        self._type = data["type"]
         self.last_message_id = get_as_snowflake(data, "last_message_id")
         self.slowmode_delay = data.get("rate_limit_per_user", 0)
         self.message_count = data["message_count"]
@@ -184,10 +184,18 @@ class Thread(Messageable, Hashable, PinsMixin):
         self.archived = data["archived"]
         self.archiver_id = get_as_snowflake(data, "archiver_id")
         self.auto_archive_duration = data["auto_archive_duration"]
-        self.archive_timestamp = parse_time(data["archive_timestamp"])
+        self._archive_timestamp = data["archive_timestamp"]
         self.locked = data.get("locked", False)
         self.invitable = data.get("invitable", True)
-        self.create_timestamp = parse_time(data.get("create_timestamp"))
+        self._create_timestamp = data.get("create_timestamp")
+
+    @lazy_slot_property("_archive_timestamp")
+    def archive_timestamp(self, value: str) -> datetime:
+        return parse_time(value)
+
+    @lazy_slot_property("_create_timestamp")
+    def create_timestamp(self, value: str) -> Optional[datetime]:
+        return parse_time(value)
 
     def _update(self, data) -> None:
         with contextlib.suppress(KeyError):
@@ -209,10 +217,10 @@ class Thread(Messageable, Hashable, PinsMixin):
         """
         return self.create_timestamp
 
-    @property
-    def type(self) -> ChannelType:
+    @lazy_slot_property("_type")
+    def type(self, value: int) -> ChannelType:
         """:class:`ChannelType`: The channel's Discord type."""
-        return self._type
+        return try_enum(ChannelType, value)
 
     @property
     def parent(self) -> Optional[Union[TextChannel, ForumChannel]]:
@@ -340,7 +348,7 @@ class Thread(Messageable, Hashable, PinsMixin):
         A private thread is only viewable by those that have been explicitly
         invited or have :attr:`~.Permissions.manage_threads`.
         """
-        return self._type is ChannelType.private_thread
+        return self.type is ChannelType.private_thread
 
     def is_news(self) -> bool:
         """:class:`bool`: Whether the thread is a news thread.
@@ -348,7 +356,7 @@ class Thread(Messageable, Hashable, PinsMixin):
         A news thread is a thread that has a parent that is a news channel,
         i.e. :meth:`.TextChannel.is_news` is ``True``.
         """
-        return self._type is ChannelType.news_thread
+        return self.type is ChannelType.news_thread
 
     def is_nsfw(self) -> bool:
         """:class:`bool`: Whether the thread is NSFW or not.
@@ -823,7 +831,7 @@ class ThreadMember(Hashable):
     __slots__ = (
         "id",
         "thread_id",
-        "joined_at",
+        "_joined_at",
         "flags",
         "_state",
         "parent",
@@ -851,9 +859,13 @@ class ThreadMember(Hashable):
         except KeyError:
             self.thread_id = self.parent.id
 
-        self.joined_at = parse_time(data["join_timestamp"])
+        self._joined_at = data["join_timestamp"]
         self.flags = data["flags"]
 
+    @lazy_slot_property("_joined_at")
+    def joined_at(self, value: str) -> datetime:
+        return parse_time(value)
+
     @property
     def thread(self) -> Thread:
         """:class:`Thread`: The thread this member belongs to."""
@@ -12,6 +12,7 @@ Bot UI Kit helper for the Discord API
 from .button import *
 from .item import *
 from .modal import *
+from .router import *
 from .select import *
 from .text_input import *
 from .view import *
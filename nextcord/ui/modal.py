@@ -31,6 +31,7 @@ if TYPE_CHECKING:
         ModalSubmitComponentInteractionData,
         ModalSubmitInteractionData,
     )
+    from ..utils import TimerWheel
 
 
 def _walk_component_interaction_data(
@@ -102,27 +103,9 @@ class Modal:
         self.id: str = os.urandom(16).hex()
         self.__cancel_callback: Optional[Callable[[Modal], None]] = None
         self.__timeout_expiry: Optional[float] = None
-        self.__timeout_task: Optional[asyncio.Task[None]] = None
         self.__background_tasks: Set[asyncio.Task[None]] = set()
         self.__stopped: asyncio.Future[bool] = loop.create_future()
 
-    async def __timeout_task_impl(self) -> None:
-        while True:
-            # Guard just in case someone changes the value of the timeout at runtime
-            if self.timeout is None:
-                return None
-
-            if self.__timeout_expiry is None:
-                return self._dispatch_timeout()
-
-            # Check if we've elapsed our currently set timeout
-            now = time.monotonic()
-            if now >= self.__timeout_expiry:
-                return self._dispatch_timeout()
-
-            # Wait N seconds to see if timeout data has been refreshed
-            await asyncio.sleep(self.__timeout_expiry - now)
-
     def to_components(self) -> List[ActionRowPayload]:
         def key(item: Item) -> int:
             return item._rendered_row or 0
@@ -278,14 +261,10 @@ class Modal:
             return await self.on_error(e, interaction)
 
     def _start_listening_from_store(self, store: ModalStore) -> None:
+        # the store times the modal out, see ModalStore._check_timeout
         self.__cancel_callback = partial(store.remove_modal)
         if self.timeout:
-            loop = asyncio.get_running_loop()
-            if self.__timeout_task is not None:
-                self.__timeout_task.cancel()
-
             self.__timeout_expiry = time.monotonic() + self.timeout
-            self.__timeout_task = loop.create_task(self.__timeout_task_impl())
 
     def _dispatch_timeout(self) -> None:
         if self.__stopped.done():
@@ -296,6 +275,10 @@ class Modal:
         task.add_done_callback(self.__background_tasks.discard)
         self.__stopped.set_result(True)
 
+        if self.__cancel_callback:
+            self.__cancel_callback(self)
+            self.__cancel_callback = None
+
     def _dispatch(self, interaction: Interaction) -> None:
         if self.__stopped.done():
             return
@@ -335,10 +318,6 @@ class Modal:
             self.__stopped.set_result(False)
 
         self.__timeout_expiry = None
-        if self.__timeout_task is not None:
-            self.__timeout_task.cancel()
-            self.__timeout_task = None
-
         if self.__cancel_callback:
             self.__cancel_callback(self)
             self.__cancel_callback = None
@@ -382,7 +361,10 @@ class ModalStore:
     def __init__(self, state: ConnectionState) -> None:
         # (user_id, custom_id): Modal  # noqa: ERA001
         self._modals: Dict[Tuple[int | None, str], Modal] = {}
+        # modal.id: keys of the modal in _modals
+        self._modal_keys: Dict[str, Set[Tuple[int | None, str]]] = {}
         self._state: ConnectionState = state
+        self._timer_wheel: TimerWheel = state._timer_wheel
 
     @property
     def persistent_modals(self) -> List[Modal]:
@@ -395,30 +377,40 @@ class ModalStore:
         # fmt: on
         return list(modals.values())
 
-    def __verify_integrity(self) -> None:
-        to_remove: List[Tuple[int | None, str]] = []
-        for k, modal in self._modals.items():
-            if modal.is_finished():
-                to_remove.append(k)
-
-        for k in to_remove:
-            del self._modals[k]
-
     def add_modal(self, modal: Modal, user_id: Optional[int] = None) -> None:
-        self.__verify_integrity()
-
         modal._start_listening_from_store(self)
-        self._modals[(user_id, modal.custom_id)] = modal
+        key = (user_id, modal.custom_id)
+        previous = self._modals.get(key)
+        if previous is not None and previous is not modal:
+            self._modal_keys[previous.id].discard(key)
+        self._modals[key] = modal
+        self._modal_keys.setdefault(modal.id, set()).add(key)
+
+        expiry = modal._expires_at
+        if expiry is not None:
+            self._timer_wheel.schedule(modal.id, expiry, partial(self._check_timeout, modal))
 
     def remove_modal(self, modal: Modal) -> None:
-        _modals = self._modals.copy()
-        for key, value in _modals.items():
-            if value is modal:
+        for key in self._modal_keys.pop(modal.id, ()):
+            if self._modals.get(key) is modal:
                 del self._modals[key]
 
-    def dispatch(self, custom_id: str, interaction: Interaction[ClientT]) -> None:
-        self.__verify_integrity()
+        self._timer_wheel.cancel(modal.id)
+
+    def _check_timeout(self, modal: Modal) -> None:
+        # Guard just in case someone changes the value of the timeout at runtime
+        if modal.timeout is None or modal.id not in self._modal_keys:
+            return
+
+        expiry = modal._expires_at
+        if expiry is not None and time.monotonic() < expiry:
+            # a submission refreshed the timeout
+            self._timer_wheel.schedule(modal.id, expiry, partial(self._check_timeout, modal))
+            return
 
+        modal._dispatch_timeout()
+
+    def dispatch(self, custom_id: str, interaction: Interaction[ClientT]) -> None:
         key = (interaction.user.id, custom_id)  # type: ignore
         # Fallback to None user_id searches in case a persistent modal
         # was added without an associated message_id
@@ -427,3 +419,16 @@ class ModalStore:
             return
 
         modal._dispatch(interaction)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of modals, registered keys and pending timeouts in the
+        store, and the approximate size in bytes of its own containers.
+        """
+        memory = sys.getsizeof(self._modals) + sys.getsizeof(self._modal_keys)
+        memory += sum(sys.getsizeof(keys) for keys in self._modal_keys.values())
+        return {
+            "modals": len(self._modal_keys),
+            "keys": len(self._modals),
+            "pending_timeouts": sum(modal_id in self._timer_wheel for modal_id in self._modal_keys),
+            "memory": memory,
+        }
@@ -0,0 +1,287 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import re
+import sys
+import traceback
+from string import Formatter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+)
+
+__all__ = ("ComponentRouter",)
+
+if TYPE_CHECKING:
+    from ..enums import ComponentType
+    from ..interactions import ClientT, Interaction
+
+    RouteCallback = Callable[..., Coroutine[Any, Any, Any]]
+
+
+# format spec of a parameter: (regex it matches, converter applied to the match)
+_CONVERTERS: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    "": (".+?", str),
+    "str": (".+?", str),
+    "int": ("-?[0-9]+", int),
+}
+
+
+class _Route:
+    __slots__ = (
+        "template",
+        "prefix",
+        "literal",
+        "pattern",
+        "converters",
+        "component_type",
+        "callback",
+        "auto_defer",
+    )
+
+    def __init__(
+        self,
+        template: str,
+        callback: RouteCallback,
+        *,
+        component_type: Optional[ComponentType],
+        auto_defer: bool,
+    ) -> None:
+        self.template: str = template
+        self.callback: RouteCallback = callback
+        self.component_type: Optional[int] = None if component_type is None else int(component_type)
+        self.auto_defer: bool = auto_defer
+        self.converters: Dict[str, Callable[[str], Any]] = {}
+
+        prefix: Optional[str] = None
+        literals: List[str] = []
+        regex: List[str] = []
+        for literal, name, spec, conversion in Formatter().parse(template):
+            literals.append(literal)
+            regex.append(re.escape(literal))
+            if name is None:
+                continue
+
+            if prefix is None:
+                prefix = "".join(literals)
+            if not name.isidentifier():
+                raise ValueError(f"invalid parameter name {name!r} in template {template!r}")
+            if name in self.converters:
+                raise ValueError(f"duplicate parameter {name!r} in template {template!r}")
+            if conversion is not None or spec not in _CONVERTERS:
+                raise ValueError(f"unsupported format for {name!r} in template {template!r}")
+
+            pattern, self.converters[name] = _CONVERTERS[spec]
+            regex.append(f"(?P<{name}>{pattern})")
+
+        # the custom_id that a template without parameters matches
+        self.literal: str = "".join(literals)
+        self.prefix: str = self.literal if prefix is None else prefix
+        self.pattern: Optional[Pattern[str]] = (
+            re.compile("".join(regex), re.DOTALL) if self.converters else None
+        )
+
+    def match(self, custom_id: str) -> Optional[Dict[str, Any]]:
+        if self.pattern is None:
+            return {} if custom_id == self.literal else None
+
+        match = self.pattern.fullmatch(custom_id)
+        if match is None:
+            return None
+
+        converters = self.converters
+        return {name: converters[name](value) for name, value in match.groupdict().items()}
+
+
+class ComponentRouter:
+    """Dispatches component interactions to callbacks by their ``custom_id``,
+    without keeping a :class:`View` for each message the components are on.
+
+    Routes are registered with ``custom_id`` templates such as ``role:{role_id:int}:{action}``.
+    A parameter matches one or more characters, or an optionally negative integer that
+    is converted to :class:`int` when written as ``{name:int}``. Literal braces are written
+    as ``{{`` and ``}}``. The callback receives the interaction and the parameters as
+    keyword arguments.
+
+    Templates are indexed by the text before their first parameter, so finding the
+    route for a ``custom_id`` only tries the templates that share its prefix, longest
+    prefix first. Routes with the same prefix are tried in the order they were added.
+
+    The router of a client is checked before its views, see :meth:`Client.add_component_route`.
+
+    .. versionadded:: 3.0
+    """
+
+    def __init__(self) -> None:
+        self._routes: Dict[str, List[_Route]] = {}
+        """prefix: routes with that prefix"""
+        self._templates: Dict[str, _Route] = {}
+        """template: route"""
+        # distinct prefix lengths, longest first
+        self._prefix_lengths: List[int] = []
+        self._background_tasks: Set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def __contains__(self, template: str) -> bool:
+        return template in self._templates
+
+    @property
+    def templates(self) -> List[str]:
+        """List[:class:`str`]: The templates of the routes, in the order they were added."""
+        return list(self._templates)
+
+    def add_route(
+        self,
+        template: str,
+        callback: RouteCallback,
+        *,
+        component_type: Optional[ComponentType] = None,
+        auto_defer: bool = True,
+    ) -> None:
+        """Adds a route, replacing any route with the same template.
+
+        Parameters
+        ----------
+        template: :class:`str`
+            The ``custom_id`` template to route.
+        callback
+            The coroutine to call with the interaction and the parameters of the template.
+        component_type: Optional[:class:`ComponentType`]
+            The type of component to route. If ``None`` then all component types are routed.
+        auto_defer: :class:`bool`
+            Whether or not to defer the interaction when the callback completes without
+            responding to it.
+
+        Raises
+        ------
+        TypeError
+            The callback is not a coroutine function.
+        ValueError
+            The template is malformed.
+        """
+        if not asyncio.iscoroutinefunction(callback):
+            raise TypeError("Route callback must be a coroutine function")
+
+        route = _Route(template, callback, component_type=component_type, auto_defer=auto_defer)
+        if template in self._templates:
+            self.remove_route(template)
+
+        self._templates[template] = route
+        routes = self._routes.setdefault(route.prefix, [])
+        routes.append(route)
+        if len(route.prefix) not in self._prefix_lengths:
+            self._prefix_lengths.append(len(route.prefix))
+            self._prefix_lengths.sort(reverse=True)
+
+    def remove_route(self, template: str) -> None:
+        """Removes the route of a template, if there is one.
+
+        Parameters
+        ----------
+        template: :class:`str`
+            The template of the route to remove.
+        """
+        route = self._templates.pop(template, None)
+        if route is None:
+            return
+
+        routes = self._routes[route.prefix]
+        routes.remove(route)
+        if routes:
+            return
+
+        del self._routes[route.prefix]
+        length = len(route.prefix)
+        if not any(len(prefix) == length for prefix in self._routes):
+            self._prefix_lengths.remove(length)
+
+    def route(
+        self,
+        template: str,
+        *,
+        component_type: Optional[ComponentType] = None,
+        auto_defer: bool = True,
+    ) -> Callable[[RouteCallback], RouteCallback]:
+        """A decorator that adds the decorated coroutine as a route,
+        see :meth:`add_route` for the parameters.
+        """
+
+        def decorator(func: RouteCallback) -> RouteCallback:
+            self.add_route(template, func, component_type=component_type, auto_defer=auto_defer)
+            return func
+
+        return decorator
+
+    def _resolve(
+        self, component_type: int, custom_id: str
+    ) -> Optional[Tuple[_Route, Dict[str, Any]]]:
+        routes = self._routes
+        for length in self._prefix_lengths:
+            candidates = routes.get(custom_id[:length])
+            if candidates is None:
+                continue
+
+            for route in candidates:
+                if route.component_type is not None and route.component_type != component_type:
+                    continue
+
+                params = route.match(custom_id)
+                if params is not None:
+                    return route, params
+
+        return None
+
+    def dispatch(
+        self, component_type: int, custom_id: str, interaction: Interaction[ClientT]
+    ) -> bool:
+        """Runs the route matching the component interaction, returns whether one did."""
+        if not self._templates:
+            return False
+
+        resolved = self._resolve(component_type, custom_id)
+        if resolved is None:
+            return False
+
+        route, params = resolved
+        task = asyncio.create_task(
+            self._run(route, interaction, params), name=f"discord-ui-route-dispatch-{custom_id}"
+        )
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return True
+
+    async def _run(
+        self, route: _Route, interaction: Interaction[ClientT], params: Dict[str, Any]
+    ) -> None:
+        try:
+            await route.callback(interaction, **params)
+            if (
+                route.auto_defer
+                and not interaction.response._responded
+                and not interaction.is_expired()
+            ):
+                await interaction.response.defer()
+        except Exception as e:
+            print(  # noqa: T201
+                f"Ignoring exception in component route {route.template!r}:", file=sys.stderr
+            )
+            traceback.print_exception(e.__class__, e, e.__traceback__, file=sys.stderr)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of routes and prefixes in the router."""
+        return {
+            "routes": len(self._templates),
+            "prefixes": len(self._routes),
+        }
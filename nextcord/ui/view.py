@@ -42,6 +42,7 @@ if TYPE_CHECKING:
     from ..message import Message
     from ..state import ConnectionState
     from ..types.components import ActionRow as ActionRowPayload, Component as ComponentPayload
+    from ..utils import TimerWheel
 
 _log = logging.getLogger(__name__)
 
@@ -187,30 +188,12 @@ class View:
         self.id: str = os.urandom(16).hex()
         self.__cancel_callback: Optional[Callable[[View], None]] = None
         self.__timeout_expiry: Optional[float] = None
-        self.__timeout_task: Optional[asyncio.Task[None]] = None
         self.__background_tasks: Set[asyncio.Task[None]] = set()
         self.__stopped: asyncio.Future[bool] = loop.create_future()
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} timeout={self.timeout} children={len(self.children)}>"
 
-    async def __timeout_task_impl(self) -> None:
-        while True:
-            # Guard just in case someone changes the value of the timeout at runtime
-            if self.timeout is None:
-                return None
-
-            if self.__timeout_expiry is None:
-                return self._dispatch_timeout()
-
-            # Check if we've elapsed our currently set timeout
-            now = time.monotonic()
-            if now >= self.__timeout_expiry:
-                return self._dispatch_timeout()
-
-            # Wait N seconds to see if timeout data has been refreshed
-            await asyncio.sleep(self.__timeout_expiry - now)
-
     def to_components(self) -> List[ActionRowPayload]:
         def key(item: Item) -> int:
             return item._rendered_row or 0
@@ -394,14 +377,10 @@ class View:
             return await self.on_error(e, item, interaction)
 
     def _start_listening_from_store(self, store: ViewStore) -> None:
-        self.__cancel_callback = partial(store.remove_view)
+        # the store times the view out, see ViewStore._check_timeout
+        self.__cancel_callback = partial(store.forget_view)
         if self.timeout:
-            loop = asyncio.get_running_loop()
-            if self.__timeout_task is not None:
-                self.__timeout_task.cancel()
-
             self.__timeout_expiry = time.monotonic() + self.timeout
-            self.__timeout_task = loop.create_task(self.__timeout_task_impl())
 
     def _dispatch_timeout(self) -> None:
         if self.__stopped.done():
@@ -412,6 +391,10 @@ class View:
         task.add_done_callback(self.__background_tasks.discard)
         self.__stopped.set_result(True)
 
+        if self.__cancel_callback:
+            self.__cancel_callback(self)
+            self.__cancel_callback = None
+
     def _dispatch_item(self, item: Item, interaction: Interaction) -> None:
         if self.__stopped.done():
             return
@@ -452,10 +435,6 @@ class View:
             self.__stopped.set_result(False)
 
         self.__timeout_expiry = None
-        if self.__timeout_task is not None:
-            self.__timeout_task.cancel()
-            self.__timeout_task = None
-
         if self.__cancel_callback:
             self.__cancel_callback(self)
             self.__cancel_callback = None
@@ -497,49 +476,101 @@ class ViewStore:
         """(component_type, message_id, custom_id): (View, Item)"""
         self._synced_message_views: Dict[int, View] = {}
         """message_id: View"""
+        self._registered_views: Dict[str, View] = {}
+        """view.id: View"""
+        self._view_keys: Dict[str, Set[Tuple[int, Optional[int], str]]] = {}
+        """view.id: keys of the view in _views"""
+        self._view_messages: Dict[str, Dict[int, None]] = {}
+        """view.id: message_ids of the view in _synced_message_views, in the order they were added"""
         self._state: ConnectionState = state
+        self._timer_wheel: TimerWheel = state._timer_wheel
 
     def all_views(self) -> List[View]:
-        return [v for (v, _) in self._views.values()]
+        return [v for v in self._registered_views.values() if self._view_keys[v.id]]
 
     def views(self, persistent: bool = True) -> List[View]:
         views = self.all_views()
         return [v for v in views if v.is_persistent() ^ (not persistent)]
 
-    def __verify_integrity(self) -> None:
-        to_remove: List[Tuple[int, Optional[int], str]] = []
-        for k, (view, _) in self._views.items():
-            if view.is_finished():
-                to_remove.append(k)
-
-        for k in to_remove:
-            del self._views[k]
-
     def add_view(self, view: View, message_id: Optional[int] = None) -> None:
-        self.__verify_integrity()
-
         view._start_listening_from_store(self)
+        self._registered_views[view.id] = view
+        keys = self._view_keys.setdefault(view.id, set())
         for item in view.children:
             if item.is_dispatchable():
-                self._views[(item.type.value, message_id, item.custom_id)] = (view, item)  # type: ignore
+                key = (item.type.value, message_id, item.custom_id)  # type: ignore
+                previous = self._views.get(key)
+                if previous is not None and previous[0] is not view:
+                    self._view_keys[previous[0].id].discard(key)
+                self._views[key] = (view, item)
+                keys.add(key)
 
         if message_id is not None:
+            previous_view = self._synced_message_views.get(message_id)
+            if previous_view is not None and previous_view is not view:
+                self._view_messages[previous_view.id].pop(message_id, None)
             self._synced_message_views[message_id] = view
+            self._view_messages.setdefault(view.id, {})[message_id] = None
+
+        expiry = view._expires_at
+        if expiry is not None:
+            self._timer_wheel.schedule(view.id, expiry, partial(self._check_timeout, view))
 
     def remove_view(self, view: View, message_id: Optional[int] = None) -> None:
-        for item in view.children:
-            if item.is_dispatchable():
-                self._views.pop((item.type.value, message_id, item.custom_id), None)  # type: ignore
+        keys = self._view_keys.get(view.id)
+        if keys is None:
+            return
 
-        for key, value in self._synced_message_views.items():
-            if value.id == view.id:
-                del self._synced_message_views[key]
-                break
+        for key in [k for k in keys if k[1] == message_id]:
+            keys.discard(key)
+            if self._views.get(key, (None,))[0] is view:
+                del self._views[key]
+
+        # a single message stops being tracked, the given one or else the first one of the view
+        messages = self._view_messages.get(view.id, {})
+        tracked_id = message_id if message_id in messages else next(iter(messages), None)
+        if tracked_id is not None:
+            del messages[tracked_id]
+            if self._synced_message_views.get(tracked_id) is view:
+                del self._synced_message_views[tracked_id]
+
+        if not keys and not messages:
+            self._unregister(view)
+
+    def forget_view(self, view: View) -> None:
+        """Removes every entry of a view, used once the view has finished."""
+        for key in self._view_keys.get(view.id, ()):
+            if self._views.get(key, (None,))[0] is view:
+                del self._views[key]
+
+        for message_id in self._view_messages.get(view.id, ()):
+            if self._synced_message_views.get(message_id) is view:
+                del self._synced_message_views[message_id]
+
+        self._unregister(view)
+
+    def _unregister(self, view: View) -> None:
+        self._registered_views.pop(view.id, None)
+        self._view_keys.pop(view.id, None)
+        self._view_messages.pop(view.id, None)
+        self._timer_wheel.cancel(view.id)
+
+    def _check_timeout(self, view: View) -> None:
+        # Guard just in case someone changes the value of the timeout at runtime
+        if view.timeout is None or view.id not in self._registered_views:
+            return
+
+        expiry = view._expires_at
+        if expiry is not None and time.monotonic() < expiry:
+            # an interaction refreshed the timeout
+            self._timer_wheel.schedule(view.id, expiry, partial(self._check_timeout, view))
+            return
+
+        view._dispatch_timeout()
 
     def dispatch(
         self, component_type: int, custom_id: str, interaction: Interaction[ClientT]
     ) -> None:
-        self.__verify_integrity()
         message_id: Optional[int] = interaction.message and interaction.message.id
         key = (component_type, message_id, custom_id)
         # Fallback to None message_id searches in case a persistent view
@@ -556,9 +587,34 @@ class ViewStore:
         return message_id in self._synced_message_views
 
     def remove_message_tracking(self, message_id: int) -> Optional[View]:
-        return self._synced_message_views.pop(message_id, None)
+        view = self._synced_message_views.pop(message_id, None)
+        if view is not None:
+            self._view_messages.get(view.id, {}).pop(message_id, None)
+        return view
 
     def update_from_message(self, message_id: int, components: List[ComponentPayload]) -> None:
         # pre-req: is_message_tracked == true
         view = self._synced_message_views[message_id]
         view.refresh([_component_factory(d) for d in components])
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of views, dispatchable items, tracked messages and pending
+        timeouts in the store, and the approximate size in bytes of its own containers.
+        """
+        containers = (
+            self._views,
+            self._synced_message_views,
+            self._registered_views,
+            self._view_keys,
+            self._view_messages,
+        )
+        memory = sum(sys.getsizeof(c) for c in containers)
+        memory += sum(sys.getsizeof(keys) for keys in self._view_keys.values())
+        memory += sum(sys.getsizeof(ids) for ids in self._view_messages.values())
+        return {
+            "views": len(self._registered_views),
+            "items": len(self._views),
+            "tracked_messages": len(self._synced_message_views),
+            "pending_timeouts": sum(view_id in self._timer_wheel for view_id in self._view_keys),
+            "memory": memory,
+        }
@@ -11,12 +11,15 @@ import datetime
 import functools
 import inspect
 import json
+import logging
+import math
 import re
 import sys
+import time
 import unicodedata
 import warnings
 from base64 import b64encode
-from bisect import bisect_left
+from bisect import bisect_left, bisect_right
 from inspect import isawaitable as _isawaitable, signature as _signature
 from operator import attrgetter
 from typing import (
@@ -28,6 +31,7 @@ from typing import (
     Dict,
     ForwardRef,
     Generic,
+    Hashable,
     Iterable,
     Iterator,
     List,
@@ -103,6 +107,8 @@ __all__ = (
 
 DISCORD_EPOCH = 1420070400000
 
+_log = logging.getLogger(__name__)
+
 
 class _MissingSentinel:
     def __eq__(self, other: Any) -> bool:
@@ -185,6 +191,31 @@ class CachedSlotProperty(Generic[T, T_co]):
             return value
 
 
+class LazySlotProperty(CachedSlotProperty[T, T_co]):
+    # The slot holds the raw value from the payload, such as an ISO 8601 timestamp
+    # or the value of an enum, until the property is first read and decodes it.
+    def __init__(self, name: str, function: Callable[[T, Any], T_co]) -> None:
+        super().__init__(name, function)  # type: ignore
+
+    def __get__(self, instance: Optional[T], owner: Type[T]) -> Any:
+        if instance is None:
+            return self
+
+        value = getattr(instance, self.name)
+        if value.__class__ in _RAW_SLOT_TYPES:
+            value = self.function(instance, value)  # type: ignore
+            setattr(instance, self.name, value)
+        return value
+
+    def __set__(self, instance: T, value: Any) -> None:
+        # either a raw value or one that was already decoded
+        setattr(instance, self.name, value)
+
+
+# the types of raw values a LazySlotProperty decodes, anything else was decoded already
+_RAW_SLOT_TYPES = (str, int)
+
+
 class classproperty(Generic[T_co]):
     def __init__(self, fget: Callable[[Any], T_co]) -> None:
         self.fget = fget
@@ -205,6 +236,17 @@ def cached_slot_property(
     return decorator
 
 
+def lazy_slot_property(
+    name: str,
+) -> Callable[[Callable[[T, Any], T_co]], LazySlotProperty[T, T_co]]:
+    # The decorated function receives the raw value, never None, and returns it
+    # decoded. Values that are already decoded can be assigned to the property.
+    def decorator(func: Callable[[T, Any], T_co]) -> LazySlotProperty[T, T_co]:
+        return LazySlotProperty(name, func)
+
+    return decorator
+
+
 class SequenceProxy(Sequence[T_co], Generic[T_co]):
     """Read-only proxy of a Sequence."""
 
@@ -666,6 +708,141 @@ class SnowflakeList(array.array):  # pyright: ignore[reportMissingTypeArgument]
         return i != len(self) and self[i] == element
 
 
+class TimerWheel:
+    """Internal hierarchical timer wheel for deadlines on the :func:`time.monotonic` clock.
+
+    This should have the following characteristics:
+
+    - O(1) scheduling, rescheduling and cancelling of a timer
+    - A single event loop callback per ``resolution`` seconds while any timer
+      is pending, which fires all timers that became due since the last one
+    - Timers never fire early, and at most about one ``resolution`` late
+
+    Timers are identified by a hashable key, scheduling an existing key moves it.
+    Each level of the wheel has ``slots`` buckets that are ``slots`` times wider
+    than those of the level below, timers are moved down a level as they get close.
+    """
+
+    __slots__ = (
+        "resolution",
+        "_slots",
+        "_spans",
+        "_widths",
+        "_wheels",
+        "_timers",
+        "_tick",
+        "_handle",
+    )
+
+    def __init__(self, *, resolution: float = 0.25, slots: int = 64, levels: int = 4) -> None:
+        self.resolution: float = resolution
+        self._slots: int = slots
+        # the number of ticks that each level covers
+        self._spans: List[int] = [slots ** (level + 1) for level in range(levels)]
+        # the number of ticks that each bucket of a level covers
+        self._widths: List[int] = [slots**level for level in range(levels)]
+        self._wheels: List[List[Dict[Hashable, Callable[[], Any]]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        # key: (due tick, bucket the timer is currently in)
+        self._timers: Dict[Hashable, Tuple[int, Dict[Hashable, Callable[[], Any]]]] = {}
+        self._tick: int = 0
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def schedule(self, key: Hashable, deadline: float, callback: Callable[[], Any]) -> None:
+        """Calls ``callback`` once :func:`time.monotonic` reaches ``deadline``,
+        replacing any timer that was scheduled under the same key.
+        """
+        entry = self._timers.pop(key, None)
+        if entry is not None:
+            del entry[1][key]
+        elif not self._timers:
+            # the wheel was idle, so its tick may be far behind
+            self._tick = int(time.monotonic() / self.resolution)
+
+        due = max(math.ceil(deadline / self.resolution), self._tick + 1)
+        self._insert(key, due, callback)
+        if self._handle is None:
+            self._arm()
+
+    def cancel(self, key: Hashable) -> bool:
+        entry = self._timers.pop(key, None)
+        if entry is None:
+            return False
+
+        del entry[1][key]
+        return True
+
+    def _insert(self, key: Hashable, due: int, callback: Callable[[], Any]) -> None:
+        level = bisect_right(self._spans, due - self._tick)
+        if level == len(self._spans):
+            # further out than the wheel reaches, park it in the furthest bucket
+            # and it will be placed again once that bucket is cascaded
+            level -= 1
+            position = self._tick + self._spans[-1] - 1
+        else:
+            position = due
+
+        bucket = self._wheels[level][(position // self._widths[level]) % self._slots]
+        bucket[key] = callback
+        self._timers[key] = (due, bucket)
+
+    def _arm(self) -> None:
+        delay = (self._tick + 1) * self.resolution - time.monotonic()
+        self._handle = asyncio.get_running_loop().call_later(max(delay, 0.0), self._advance)
+
+    def _cascade(self, tick: int) -> None:
+        # the highest level goes first, so its timers can be placed in
+        # the buckets of lower levels that are about to be cascaded
+        levels = [level for level in range(1, len(self._widths)) if tick % self._widths[level] == 0]
+        for level in reversed(levels):
+            wheel = self._wheels[level]
+            index = (tick // self._widths[level]) % self._slots
+            bucket = wheel[index]
+            if not bucket:
+                continue
+
+            wheel[index] = {}
+            for key, callback in bucket.items():
+                self._insert(key, self._timers[key][0], callback)
+
+    def _advance(self) -> None:
+        self._handle = None
+        target = int(time.monotonic() / self.resolution)
+        wheel = self._wheels[0]
+        while self._tick < target and self._timers:
+            self._tick += 1
+            if self._tick % self._slots == 0:
+                self._cascade(self._tick)
+
+            index = self._tick % self._slots
+            bucket = wheel[index]
+            if not bucket:
+                continue
+
+            wheel[index] = {}
+            for key, callback in list(bucket.items()):
+                entry = self._timers.get(key)
+                if entry is None or entry[1] is not bucket:
+                    # cancelled or rescheduled by an earlier callback
+                    continue
+
+                del self._timers[key]
+                try:
+                    callback()
+                except Exception:
+                    _log.exception("Ignoring exception in timer callback %r", callback)
+
+        if self._timers:
+            self._arm()
+
+
 _IS_ASCII = re.compile(r"^[\x00-\x7f]+$")
 
 
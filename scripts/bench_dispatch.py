@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: MIT
+"""Measures the cost of Bot.dispatch for events without handlers, with listeners run
+in a task each and with listeners run inline, and with many pending wait_for calls.
+
+Run from the root of the repository with ``python scripts/bench_dispatch.py``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import nextcord
+from nextcord.ext import commands
+
+
+async def listener(*_: Any) -> None:
+    pass
+
+
+async def drain() -> None:
+    current = asyncio.current_task()
+    while any(task is not current for task in asyncio.all_tasks()):
+        await asyncio.sleep(0)
+
+
+async def bench(inline: bool, events: int, waiters: int) -> None:
+    bot = commands.Bot(intents=nextcord.Intents.none(), inline_dispatch=inline)
+    bot.add_listener(listener, "on_typing")
+    bot.add_listener(listener, "on_typing")
+    mode = "inline" if inline else "tasks"
+
+    start = time.perf_counter()
+    for _ in range(events):
+        bot.dispatch("presence_update", None, None)
+    elapsed = time.perf_counter() - start
+    print(f"  {mode:>6}: event without handlers {elapsed / events * 1e9:6.0f} ns")
+
+    start = time.perf_counter()
+    for _ in range(events):
+        bot.dispatch("typing", None, None, None)
+    await drain()
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {mode:>6}: event with 2 listeners {elapsed / events * 1e6:7.2f} us, including running them"
+    )
+
+    pending = [
+        asyncio.create_task(
+            bot.wait_for("reaction_add", check=lambda r, _, i=i: r == i, timeout=60)
+        )
+        for i in range(waiters)
+    ]
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    for i in range(events):
+        bot.dispatch("reaction_add", -i, None)
+    elapsed = time.perf_counter() - start
+    print(f"  {mode:>6}: event with {waiters} waiters {elapsed / events * 1e6:7.2f} us")
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--waiters", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    print(f"{args.events} events")
+    for inline in (False, True):
+        asyncio.run(bench(inline, args.events, args.waiters))
+
+
+if __name__ == "__main__":
+    main()
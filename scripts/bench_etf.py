@@ -0,0 +1,181 @@
+# SPDX-License-Identifier: MIT
+"""Compares decoding gateway payloads from ETF with nextcord.etf against JSON.
+
+Run from the root of the repository with ``python scripts/bench_etf.py``.
+orjson and erlpack are measured too when they are installed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nextcord import etf
+
+
+def snowflake() -> int:
+    return random.getrandbits(62)
+
+
+def member(i: int) -> Dict[str, Any]:
+    return {
+        "user": {
+            "id": snowflake(),
+            "username": f"user{i}",
+            "global_name": None,
+            "avatar": "a" * 32 if i % 3 else None,
+            "discriminator": "0",
+            "public_flags": 0,
+            "bot": False,
+        },
+        "roles": [snowflake() for _ in range(i % 5)],
+        "joined_at": "2021-01-01T00:00:00.000000+00:00",
+        "nick": None,
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+        "pending": False,
+    }
+
+
+def guild(members: int) -> Dict[str, Any]:
+    guild_id = snowflake()
+    return {
+        "id": guild_id,
+        "name": "guild",
+        "icon": None,
+        "owner_id": snowflake(),
+        "member_count": members,
+        "large": members > 250,
+        "roles": [
+            {
+                "id": snowflake(),
+                "name": f"role{i}",
+                "color": 0,
+                "permissions": "1071698660929",
+                "position": i,
+                "managed": False,
+                "hoist": False,
+                "mentionable": False,
+            }
+            for i in range(30)
+        ],
+        "channels": [
+            {
+                "id": snowflake(),
+                "guild_id": guild_id,
+                "type": 0,
+                "name": f"channel{i}",
+                "position": i,
+                "topic": None,
+                "nsfw": False,
+                "parent_id": snowflake(),
+                "permission_overwrites": [
+                    {"id": snowflake(), "type": 0, "allow": "1024", "deny": "0"}
+                ],
+                "rate_limit_per_user": 0,
+                "last_message_id": snowflake(),
+            }
+            for i in range(60)
+        ],
+        "members": [member(i) for i in range(members)],
+        "presences": [],
+        "voice_states": [],
+        "emojis": [],
+        "features": ["COMMUNITY"],
+        "threads": [],
+    }
+
+
+def stringify(obj: Any) -> Any:
+    # JSON payloads send snowflakes as strings
+    if isinstance(obj, dict):
+        return {
+            key: str(value) if key.endswith("id") and isinstance(value, int) else stringify(value)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, list):
+        return [str(item) if isinstance(item, int) else stringify(item) for item in obj]
+    return obj
+
+
+def best_of(func: Callable[[bytes], Any], data: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=2500, help="guilds in the READY payload")
+    parser.add_argument("--members", type=int, default=5000, help="members in GUILD_CREATE")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    random.seed(0)
+    payloads = {
+        f"READY ({args.guilds} guilds)": {
+            "t": "READY",
+            "s": 1,
+            "op": 0,
+            "d": {
+                "v": 10,
+                "user": member(0)["user"],
+                "session_id": "session",
+                "resume_gateway_url": "wss://gateway.discord.gg",
+                "guilds": [{"id": snowflake(), "unavailable": True} for _ in range(args.guilds)],
+                "_trace": ["gateway"],
+            },
+        },
+        f"GUILD_CREATE ({args.members} members)": {
+            "t": "GUILD_CREATE",
+            "s": 2,
+            "op": 0,
+            "d": guild(args.members),
+        },
+    }
+
+    decoders: List[tuple[str, str, Callable[[bytes], Any]]] = [
+        ("json", "json", json.loads),
+        ("nextcord.etf", "etf", etf.unpack),
+    ]
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        decoders.insert(1, ("orjson", "json", orjson.loads))
+    try:
+        import erlpack
+    except ImportError:
+        pass
+    else:
+        decoders.append(("erlpack", "etf", erlpack.unpack))
+
+    for name, payload in payloads.items():
+        encoded = {
+            "json": json.dumps(stringify(payload), separators=(",", ":")).encode(),
+            "etf": etf.pack(payload),
+        }
+        sizes = ", ".join(
+            f"{encoding} {len(data) / 1000:.0f} kB ({len(zlib.compress(data)) / 1000:.0f} kB zlib)"
+            for encoding, data in encoded.items()
+        )
+        print(f"{name}: {sizes}")
+        for decoder, encoding, func in decoders:
+            elapsed = best_of(func, encoded[encoding], args.repeat)
+            print(f"  {decoder:>13}: {elapsed:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
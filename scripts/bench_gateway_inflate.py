@@ -0,0 +1,206 @@
+# SPDX-License-Identifier: MIT
+"""Compares decompressing and decoding a replay of gateway payloads sent uncompressed,
+with zlib-stream and with zstd-stream transport compression.
+
+The replay is a large GUILD_CREATE, split over several websocket frames as Discord
+does, followed by many small MESSAGE_CREATE payloads. zstd-stream is skipped when
+the zstandard library is not installed.
+
+The zlib-stream replay is also run through the receive path from before inbound
+frames skipped the str round-trip and the buffer copies. It reports the time taken
+with and without decoding the JSON, and the most memory allocated at once while
+inflating each frame, as traced by tracemalloc.
+
+Run from the root of the repository with ``python scripts/bench_gateway_inflate.py``.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nextcord import gateway, utils
+
+# the largest websocket frame Discord is assumed to send
+FRAME_SIZE = 1 << 16
+
+
+def user(user_id: int) -> Dict[str, Any]:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id}",
+        "discriminator": "0",
+        "avatar": "a" * 32,
+        "global_name": None,
+    }
+
+
+def payloads(members: int, messages: int) -> List[bytes]:
+    guild_create = {
+        "t": "GUILD_CREATE",
+        "s": 1,
+        "op": 0,
+        "d": {
+            "id": "1",
+            "members": [
+                {
+                    "user": user(10**17 + i),
+                    "roles": [str(10**17 + j) for j in range(3)],
+                    "joined_at": "2021-01-01T00:00:00+00:00",
+                    "nick": None,
+                }
+                for i in range(members)
+            ],
+        },
+    }
+    result = [utils.to_json(guild_create).encode()]
+    for i in range(messages):
+        message_create = {
+            "t": "MESSAGE_CREATE",
+            "s": i + 2,
+            "op": 0,
+            "d": {"id": str(10**18 + i), "content": "hello " * 20, "author": user(10**17 + i)},
+        }
+        result.append(utils.to_json(message_create).encode())
+    return result
+
+
+def frames(compressed: bytes) -> List[bytes]:
+    return [compressed[i : i + FRAME_SIZE] for i in range(0, len(compressed), FRAME_SIZE)]
+
+
+def zlib_stream(payloads: List[bytes]) -> List[bytes]:
+    compressor = zlib.compressobj()
+    result = []
+    for payload in payloads:
+        result.extend(frames(compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)))
+    return result
+
+
+def zstd_stream(payloads: List[bytes]) -> List[bytes]:
+    import zstandard
+
+    compressor = zstandard.ZstdCompressor().compressobj()
+    # one zstd frame for the whole connection, flushed after every payload
+    return [
+        compressor.compress(payload) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        for payload in payloads
+    ]
+
+
+class PreviousZlibStreamDecompressor:
+    # how DiscordWebSocket.received_message inflated zlib-stream frames before: every
+    # frame was copied into the buffer, and the payload decoded to a str for the JSON decoder
+
+    def __init__(self) -> None:
+        self._zlib = zlib.decompressobj()
+        self._buffer = bytearray()
+
+    def decompress(self, data: bytes, /) -> Optional[str]:
+        self._buffer.extend(data)
+        if len(data) < 4 or data[-4:] != b"\x00\x00\xff\xff":
+            return None
+        msg = self._zlib.decompress(self._buffer).decode("utf-8")
+        self._buffer = bytearray()
+        return msg
+
+
+def replay(frames: List[bytes], decompressor: Optional[Any]) -> int:
+    decoded = 0
+    for frame in frames:
+        data = frame if decompressor is None else decompressor.decompress(frame)
+        if data is not None:
+            utils.from_json(data)
+            decoded += 1
+    return decoded
+
+
+def best_of(
+    repeat: int,
+    paths: Dict[str, Tuple[List[bytes], Callable[[], Any]]],
+    func: Callable[[List[bytes], Any], int] = replay,
+) -> Dict[str, float]:
+    best = dict.fromkeys(paths, float("inf"))
+    for _ in range(repeat):
+        # interleaved, so that every path sees the same noise from the machine
+        for name, (frames, new_decompressor) in paths.items():
+            # a new connection every time
+            decompressor = new_decompressor()
+            start = time.perf_counter()
+            func(frames, decompressor)
+            best[name] = min(best[name], time.perf_counter() - start)
+    return best
+
+
+def inflate(frames: List[bytes], decompressor: Any) -> int:
+    return sum(decompressor.decompress(frame) is not None for frame in frames)
+
+
+def allocated(frames: List[bytes], decompressor: Any) -> Tuple[int, int]:
+    # the most memory held at once while inflating each frame, added up over the
+    # replay, and for the frame that needed the most
+    total = largest = 0
+    tracemalloc.start()
+    try:
+        for frame in frames:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            data = decompressor.decompress(frame)
+            del data
+            peak = tracemalloc.get_traced_memory()[1] - before
+            total += peak
+            largest = max(largest, peak)
+    finally:
+        tracemalloc.stop()
+    return total, largest
+
+
+def run(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=20_000, help="members in GUILD_CREATE")
+    parser.add_argument("--messages", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    replayed = payloads(args.members, args.messages)
+    size = sum(map(len, replayed))
+    transports: Dict[str, Any] = {"none": (replayed, lambda: None)}
+    transports["zlib-stream"] = (zlib_stream(replayed), gateway._ZlibStreamDecompressor)
+    if gateway.has_zstd:
+        transports["zstd-stream"] = (zstd_stream(replayed), gateway._ZstdStreamDecompressor)
+
+    print(f"{len(replayed)} payloads, {size / 1e6:.1f} MB of JSON")
+    for (name, (sent, new_decompressor)), elapsed in zip(
+        transports.items(), best_of(args.repeat, transports).values()
+    ):
+        assert replay(sent, new_decompressor()) == len(replayed)
+        wire = sum(map(len, sent))
+        print(
+            f"  {name:12} {wire / 1e6:6.2f} MB on the wire, {len(sent):5} frames,"
+            f" {elapsed * 1e3:7.1f} ms"
+        )
+
+    sent = transports["zlib-stream"][0]
+    paths = {
+        "previous": (sent, PreviousZlibStreamDecompressor),
+        "current": (sent, gateway._ZlibStreamDecompressor),
+    }
+    elapsed = best_of(args.repeat, paths)
+    inflating = best_of(args.repeat, paths, inflate)
+    print(f"zlib-stream receive path, {'orjson' if utils.HAS_ORJSON else 'json'} decoder")
+    for name, (_, new_decompressor) in paths.items():
+        total, largest = allocated(sent, new_decompressor())
+        print(
+            f"  {name:12} {elapsed[name] * 1e3:7.1f} ms, inflating {inflating[name] * 1e3:6.1f} ms,"
+            f" {total / 1e6:6.1f} MB in total and {largest / 1e6:5.1f} MB at most per frame"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,134 @@
+# SPDX-License-Identifier: MIT
+"""Compares the memory used and the lookup times of members kept in a dict, the
+default, with members kept in columns with MemberCacheFlags.columnar.
+
+Each store is measured in its own process, so that memory freed by one does not
+hide the memory used by the other.
+
+Run from the root of the repository with ``python scripts/bench_member_store.py``.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import nextcord
+
+GUILD_ID = 1 << 30
+LOOKUPS = 200_000
+
+
+def rss() -> int:
+    # resident pages of this process, Linux only
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * 4096
+
+
+def user_id(index: int) -> int:
+    return (1 << 40) + index * 7919
+
+
+def member(index: int) -> Dict[str, Any]:
+    return {
+        "user": {
+            "id": str(user_id(index)),
+            "username": f"user{index}",
+            "discriminator": "0",
+            "avatar": "a" * 32 if index % 2 else None,
+            "global_name": None,
+        },
+        "roles": [str(GUILD_ID + 1 + (index + k) % 19) for k in range(index % 4)],
+        "joined_at": f"2023-05-01T12:{index % 60:02}:00.{index % 1_000_000:06}+00:00",
+        "nick": f"nick{index}" if index % 5 == 0 else None,
+        "flags": 0,
+        "deaf": False,
+        "mute": False,
+    }
+
+
+def measure(store: str, members: int) -> None:
+    flags = nextcord.MemberCacheFlags(columnar=store == "columnar")
+    client = nextcord.Client(intents=nextcord.Intents.all(), member_cache_flags=flags)
+    state = client._connection
+    state.dispatch = lambda *_: None
+    guild = state._add_guild_from_data(  # type: ignore
+        {
+            "id": str(GUILD_ID),
+            "name": "guild",
+            "member_count": members,
+            "roles": [
+                {
+                    "id": str(GUILD_ID + i),
+                    "name": f"role{i}",
+                    "permissions": "0",
+                    "position": i,
+                    "color": 0,
+                    "hoist": False,
+                    "managed": False,
+                    "mentionable": False,
+                }
+                for i in range(20)
+            ],
+            "channels": [],
+            "members": [],
+        }
+    )
+
+    gc.collect()
+    before = rss()
+    for index in range(members):
+        guild._add_member(nextcord.Member(data=member(index), guild=guild, state=state))  # type: ignore
+    gc.collect()
+    used = rss() - before
+
+    ids = [user_id(random.randrange(members)) for _ in range(LOOKUPS)]
+    start = time.perf_counter()
+    for id in ids:
+        guild.get_member(id)
+    lookup = (time.perf_counter() - start) / LOOKUPS * 1e9
+
+    start = time.perf_counter()
+    listed = len(guild.members)
+    listing = time.perf_counter() - start
+
+    start = time.perf_counter()
+    role_members = len(guild.get_role(GUILD_ID + 1).members)  # type: ignore
+    role_listing = time.perf_counter() - start
+
+    assert listed == members
+    assert role_members
+    print(
+        f"  {store:8} {used / 1e6:6.0f} MB, {used / members:5.0f} B/member,"
+        f" get_member {lookup:4.0f} ns, Guild.members {listing:.2f} s,"
+        f" Role.members {role_listing:.2f} s"
+    )
+
+
+def run(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=500_000)
+    parser.add_argument("--store", choices=("dict", "columnar"), help="only measure this store")
+    args = parser.parse_args(argv)
+
+    if args.store is not None:
+        measure(args.store, args.members)
+        return
+
+    print(f"{args.members} members")
+    for store in ("dict", "columnar"):
+        subprocess.run(
+            [sys.executable, __file__, "--store", store, "--members", str(args.members)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,126 @@
+# SPDX-License-Identifier: MIT
+"""Compares warm-starting the caches from a snapshot written by
+Client.save_cache_snapshot with building them from GUILD_CREATE payloads.
+
+Run from the root of the repository with ``python scripts/bench_snapshot.py``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import nextcord
+
+
+def user(user_id: int) -> Dict[str, Any]:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id}",
+        "discriminator": "0",
+        "avatar": "a" * 32 if user_id % 2 else None,
+        "global_name": None,
+    }
+
+
+def guild(guild_id: int, members: int) -> Dict[str, Any]:
+    return {
+        "id": str(guild_id),
+        "name": f"guild{guild_id}",
+        "member_count": members,
+        "large": True,
+        "owner_id": str(guild_id + 100),
+        "roles": [
+            {
+                "id": str(guild_id + i),
+                "name": f"role{i}",
+                "permissions": "8" if i else "0",
+                "position": i,
+                "color": 0,
+                "hoist": False,
+                "managed": False,
+                "mentionable": False,
+            }
+            for i in range(20)
+        ],
+        "channels": [
+            {
+                "id": str(guild_id + 20 + i),
+                "type": 0,
+                "name": f"channel{i}",
+                "position": i,
+                "permission_overwrites": [
+                    {"id": str(guild_id + 1), "type": 0, "allow": "1024", "deny": "0"}
+                ],
+            }
+            for i in range(50)
+        ],
+        "members": [
+            {
+                "user": user(guild_id + 100 + i),
+                "roles": [str(guild_id + 1 + i % 19)],
+                "joined_at": "2023-05-01T12:00:00.123000+00:00",
+                "nick": None if i % 4 else f"nick{i}",
+                "deaf": False,
+                "mute": False,
+                "flags": 0,
+                "premium_since": None,
+            }
+            for i in range(members)
+        ],
+        "presences": [],
+    }
+
+
+def new_client() -> nextcord.Client:
+    client = nextcord.Client(intents=nextcord.Intents.all())
+    state = client._connection
+    state.dispatch = lambda *_: None
+    state.user = nextcord.ClientUser(
+        state=state, data={**user(1), "bot": True, "verified": True, "mfa_enabled": False}
+    )
+    return client
+
+
+async def main(guilds: int, members: int) -> None:
+    payloads = [guild((i + 1) << 32, members) for i in range(guilds)]
+    client = new_client()
+    start = time.perf_counter()
+    for payload in payloads:
+        client._connection._add_guild_from_data(payload)  # type: ignore
+    print(f"  from GUILD_CREATE payloads: {time.perf_counter() - start:.2f} s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cache.snapshot")
+        start = time.perf_counter()
+        size = await client.save_cache_snapshot(path)
+        print(f"  save snapshot: {time.perf_counter() - start:.2f} s, {size / 1e6:.1f} MB")
+        del client
+
+        client = new_client()
+        start = time.perf_counter()
+        assert await client.load_cache_snapshot(path)
+        print(f"  load snapshot: {time.perf_counter() - start:.2f} s")
+
+    assert sum(len(guild.members) for guild in client.guilds) == guilds * members
+
+
+def run(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=10)
+    parser.add_argument("--members", type=int, default=20_000, help="members in each guild")
+    args = parser.parse_args(argv)
+
+    print(f"{args.guilds} guilds of {args.members} members")
+    asyncio.run(main(args.guilds, args.members))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,199 @@
+# SPDX-License-Identifier: MIT
+"""Compares the timer wheel used for view and modal timeouts with a
+:meth:`asyncio.loop.call_later` handle per timeout, then views timed out by the
+wheel with views timed out by a task each, as they were before the wheel.
+
+The views are refreshed once, as an interaction with each of them would, and the
+work done when the stale deadlines come due is measured as CPU time, since the
+loop is otherwise idle while it waits.
+
+Run from the root of the repository with ``python scripts/bench_timer_wheel.py``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import nextcord
+from nextcord.ui import Button, View
+from nextcord.ui.view import ViewStore
+from nextcord.utils import TimerWheel
+
+
+def noop() -> None:
+    pass
+
+
+async def bench_call_later(deadlines: Sequence[float]) -> Dict[str, float]:
+    loop = asyncio.get_running_loop()
+    offset = loop.time() - time.monotonic()
+    results = {}
+
+    start = time.perf_counter()
+    handles = [loop.call_at(deadline + offset, noop) for deadline in deadlines]
+    results["schedule"] = time.perf_counter() - start
+    results["loop timers"] = len(loop._scheduled)  # type: ignore
+
+    # every interaction with a view restarts its timeout
+    start = time.perf_counter()
+    for i, deadline in enumerate(deadlines):
+        handles[i].cancel()
+        handles[i] = loop.call_at(deadline + 60 + offset, noop)
+    results["reschedule"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for handle in handles:
+        handle.cancel()
+    results["cancel"] = time.perf_counter() - start
+    return results
+
+
+async def bench_wheel(deadlines: Sequence[float]) -> Dict[str, float]:
+    loop = asyncio.get_running_loop()
+    wheel = TimerWheel()
+    results = {}
+
+    start = time.perf_counter()
+    for key, deadline in enumerate(deadlines):
+        wheel.schedule(key, deadline, noop)
+    results["schedule"] = time.perf_counter() - start
+    results["loop timers"] = len(loop._scheduled)  # type: ignore
+
+    start = time.perf_counter()
+    for key, deadline in enumerate(deadlines):
+        wheel.schedule(key, deadline + 60, noop)
+    results["reschedule"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in range(len(deadlines)):
+        wheel.cancel(key)
+    results["cancel"] = time.perf_counter() - start
+    return results
+
+
+class TaskTimeoutView(View):
+    # times itself out with a task sleeping until its expiry, as views did before the wheel
+
+    def _start_listening_from_store(self, store: ViewStore) -> None:
+        super()._start_listening_from_store(store)
+        self.expiry = time.monotonic() + self.timeout  # type: ignore
+        self.task = asyncio.create_task(self.timeout_task())
+
+    @property
+    def _expires_at(self) -> Optional[float]:
+        # keeps the store from scheduling the view on the wheel
+        return None
+
+    async def timeout_task(self) -> None:
+        while True:
+            now = time.monotonic()
+            if now >= self.expiry:
+                return self._dispatch_timeout()
+            await asyncio.sleep(self.expiry - now)
+
+    def refresh_timeout(self) -> None:
+        self.expiry = time.monotonic() + self.timeout  # type: ignore
+
+    def stop(self) -> None:
+        super().stop()
+        self.task.cancel()
+
+
+class WheelView(View):
+    def refresh_timeout(self) -> None:
+        # what an interaction with the view does, see View._scheduled_task
+        self._View__timeout_expiry = time.monotonic() + self.timeout  # type: ignore
+
+
+async def bench_views(view_type: type, count: int, timeout: float) -> Dict[str, float]:
+    loop = asyncio.get_running_loop()
+    client = nextcord.Client(loop=loop)
+    store = client._connection._view_store
+    results = {}
+
+    first = time.monotonic()
+    start = time.perf_counter()
+    views: List[View] = []
+    for i in range(count):
+        view = view_type(timeout=timeout)
+        view.add_item(Button(custom_id=f"button-{i}"))
+        store.add_view(view, message_id=i)
+        views.append(view)
+    # let the tasks start sleeping
+    await asyncio.sleep(0)
+    results["add"] = time.perf_counter() - start
+    added = time.monotonic()
+    if added - first + 1 >= timeout:
+        raise SystemExit(f"adding the views took {added - first:.1f} s, raise --timeout")
+
+    # refreshed after the last view was added, but before the first one times out
+    await asyncio.sleep(1)
+    results["tasks"] = len(asyncio.all_tasks())
+    results["loop timers"] = len(loop._scheduled)  # type: ignore
+    start = time.perf_counter()
+    for view in views:
+        view.refresh_timeout()  # type: ignore
+    results["refresh"] = time.perf_counter() - start
+
+    # the stale deadlines come due and are moved to the refreshed ones,
+    # the wheel fires up to a tick late
+    start = time.process_time()
+    await asyncio.sleep(added + timeout + 0.5 - time.monotonic())
+    results["re-arm"] = time.process_time() - start
+    assert not any(view.is_finished() for view in views)
+
+    start = time.perf_counter()
+    for view in views:
+        view.stop()
+    await asyncio.sleep(0)
+    results["stop"] = time.perf_counter() - start
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timers", type=int, default=200_000)
+    parser.add_argument("--views", type=int, default=100_000)
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=15.0,
+        help="timeout of the views, longer than adding them takes",
+    )
+    args = parser.parse_args(argv)
+
+    random.seed(0)
+    now = time.monotonic()
+    # view timeouts are usually between a minute and an hour
+    deadlines = [now + random.uniform(60, 3600) for _ in range(args.timers)]
+
+    print(f"{args.timers} timers")
+    for name, bench in (("call_later", bench_call_later), ("TimerWheel", bench_wheel)):
+        results = asyncio.run(bench(deadlines))
+        timings = ", ".join(
+            f"{op} {results[op] / args.timers * 1e9:.0f} ns"
+            for op in ("schedule", "reschedule", "cancel")
+        )
+        print(f"  {name:>10}: {timings}, {results['loop timers']:.0f} loop timers")
+
+    print(f"{args.views} views")
+    for name, view_type in (("tasks", TaskTimeoutView), ("TimerWheel", WheelView)):
+        results = asyncio.run(bench_views(view_type, args.views, args.timeout))
+        timings = ", ".join(
+            f"{op} {results[op]:.2f} s" for op in ("add", "refresh", "re-arm", "stop")
+        )
+        print(
+            f"  {name:>10}: {timings}, {results['tasks']:.0f} tasks,"
+            f" {results['loop timers']:.0f} loop timers"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import nextcord
+from nextcord import cache as cache_module
+from nextcord.cache import LRUBackend, LRUCache, TTLBackend, TTLCache
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def test_lru_evicts_least_recently_used():
+    evicted = []
+    cache = LRUCache(2, lambda key, value: evicted.append((key, value)))
+    cache[1] = "a"
+    cache[2] = "b"
+    assert cache.get(1) == "a"
+    cache[3] = "c"
+
+    assert evicted == [(2, "b")]
+    assert 2 not in cache
+    assert list(cache) == [1, 3]
+    assert len(cache) == 2
+
+
+def test_lru_iteration_does_not_mark_used():
+    cache = LRUCache(2)
+    cache[1] = "a"
+    cache[2] = "b"
+    assert list(cache.values()) == ["a", "b"]
+    assert list(cache.items()) == [(1, "a"), (2, "b")]
+    cache[3] = "c"
+    assert list(cache) == [2, 3]
+
+
+def test_lru_stats():
+    cache = LRUCache(1)
+    cache[1] = "a"
+    assert cache[1] == "a"
+    assert cache.get(2) is None
+    with pytest.raises(KeyError):
+        cache[2]
+    cache[2] = "b"
+
+    assert cache.stats() == {
+        "size": 1,
+        "maxsize": 1,
+        "pinned": 0,
+        "hits": 1,
+        "misses": 2,
+        "evictions": 1,
+    }
+
+
+def test_deleting_is_not_evicting():
+    evicted = []
+    cache = LRUCache(2, lambda key, _: evicted.append(key))
+    cache[1] = "a"
+    del cache[1]
+    assert cache.pop(1, None) is None
+    with pytest.raises(KeyError):
+        del cache[1]
+    assert evicted == []
+    assert cache.stats()["evictions"] == 0
+
+
+def test_ttl_expires(clock):
+    evicted = []
+    cache = TTLCache(10, on_evict=lambda key, _: evicted.append(key))
+    cache[1] = "a"
+    clock.now = 5
+    cache[2] = "b"
+    assert cache.get(1) == "a"
+
+    clock.now = 10
+    assert 1 not in cache
+    assert cache.get(1) is None
+    assert evicted == [1]
+    assert list(cache) == [2]
+
+    clock.now = 15
+    assert len(cache) == 0
+    assert evicted == [1, 2]
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_is_refreshed_when_stored(clock):
+    cache = TTLCache(10)
+    cache[1] = "a"
+    clock.now = 8
+    cache[1] = "b"
+    clock.now = 12
+    assert cache[1] == "b"
+
+
+@pytest.mark.usefixtures("clock")
+def test_ttl_maxsize():
+    evicted = []
+    cache = TTLCache(10, 2, lambda key, _: evicted.append(key))
+    for key in range(3):
+        cache[key] = str(key)
+    assert evicted == [0]
+    assert list(cache.items()) == [(1, "1"), (2, "2")]
+
+
+def test_backends():
+    assert isinstance(LRUBackend(5).create(), LRUCache)
+    cache = TTLBackend(1.5, maxsize=5).create()
+    assert isinstance(cache, TTLCache)
+    assert (cache.ttl, cache.maxsize) == (1.5, 5)
+
+    with pytest.raises(ValueError, match="maxsize"):
+        LRUBackend(0)
+    with pytest.raises(ValueError, match="ttl"):
+        TTLBackend(0)
+    with pytest.raises(ValueError, match="maxsize"):
+        TTLBackend(1, maxsize=0)
+
+
+def test_client_cache_backends():
+    client = nextcord.Client(
+        intents=nextcord.Intents.all(),
+        cache_backends={"users": LRUBackend(2)},
+        loop=asyncio.new_event_loop(),
+    )
+    state = client._connection
+    for user_id in range(1, 4):
+        state.store_user({"id": str(user_id), "username": "user", "discriminator": "0", "avatar": None})  # type: ignore
+
+    assert client.get_user(1) is None
+    assert client.get_user(3) is not None
+    stats = client.cache_stats()["users"]
+    assert (stats["size"], stats["maxsize"], stats["evictions"]) == (2, 2, 1)
+    client.loop.close()
+
+
+def test_pinned_entries_are_kept():
+    evicted = []
+    cache = LRUCache(1, lambda key, _: evicted.append(key))
+    cache[1] = "a"
+    cache.pin(1)
+    cache[2] = "b"
+    cache[3] = "c"
+
+    assert evicted == [2]
+    assert cache[1] == "a"
+    assert sorted(cache) == [1, 3]
+    assert cache.stats()["pinned"] == 1
+
+
+def test_pins_are_counted():
+    cache = LRUCache(1)
+    cache[1] = "a"
+    cache.pin(1)
+    cache.pin(1)
+    cache.unpin(1)
+    cache[2] = "b"
+    assert 1 in cache
+
+    # unpinned entities are evictable again, as the most recently used one
+    cache.unpin(1)
+    assert list(cache) == [1]
+    assert cache.stats()["pinned"] == 0
+    # unpinning what was never pinned does nothing
+    cache.unpin(1)
+    cache.unpin(5)
+    assert list(cache) == [1]
+
+
+def test_pin_before_store():
+    cache = LRUCache(1)
+    cache.pin(1)
+    cache[1] = "a"
+    cache[2] = "b"
+    cache[1] = "c"
+    assert cache[1] == "c"
+    assert cache[2] == "b"
+    assert cache.stats()["pinned"] == 1
+
+    assert cache.pop(1) == "c"
+    assert 1 not in cache
+
+
+def test_pinned_entries_do_not_expire(clock):
+    cache = TTLCache(10, 1)
+    cache[1] = "a"
+    cache.pin(1)
+    cache[2] = "b"
+    clock.now = 20
+    assert cache.get(1) == "a"
+    assert list(cache) == [1]
+
+    cache.unpin(1)
+    clock.now = 29
+    assert cache.get(1) == "a"
+    clock.now = 30
+    assert cache.get(1) is None
+
+
+def test_users_of_members_are_pinned():
+    client = nextcord.Client(
+        intents=nextcord.Intents.all(),
+        cache_backends={"users": LRUBackend(1)},
+        loop=asyncio.new_event_loop(),
+    )
+    state = client._connection
+    state.dispatch = lambda *_: None
+
+    def user(user_id):
+        return {"id": str(user_id), "username": "user", "discriminator": "0", "avatar": None}
+
+    guild = state._add_guild_from_data(  # type: ignore
+        {
+            "id": "1000",
+            "name": "guild",
+            "member_count": 3,
+            "roles": [],
+            "channels": [],
+            "members": [
+                {
+                    "user": user(user_id),
+                    "roles": [],
+                    "joined_at": None,
+                    "deaf": False,
+                    "mute": False,
+                }
+                for user_id in range(1, 4)
+            ],
+        }
+    )
+    for user_id in range(10, 13):
+        state.store_user(user(user_id))  # type: ignore
+
+    assert all(client.get_user(member.id) is member._user for member in guild.members)
+    assert client.get_user(10) is None
+    stats = client.cache_stats()["users"]
+    assert (stats["size"], stats["pinned"]) == (4, 3)
+
+    state._remove_guild(guild)
+    assert client.cache_stats()["users"]["pinned"] == 0
+    assert len(state._users) == 1
+    client.loop.close()
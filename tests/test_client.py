@@ -0,0 +1,137 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import nextcord
+from nextcord import client as client_module
+
+
+def eager_task_factory(loop, coro, **_):
+    # runs the coroutine right away, as asyncio.eager_task_factory does on Python 3.12+
+    future = loop.create_future()
+    try:
+        coro.send(None)
+    except StopIteration as exc:
+        future.set_result(exc.value)
+    else:
+        pytest.fail("the handlers were expected to complete without suspending")
+    return future
+
+
+def test_inline_handlers_run_after_the_parser(monkeypatch):
+    monkeypatch.setattr(client_module, "_eager_task_factory", eager_task_factory)
+
+    async def main():
+        client = nextcord.Client(inline_dispatch=True)
+        cache = {1}
+        cached = []
+
+        @client.event
+        async def on_raw_message_delete(message_id):
+            cached.append(message_id in cache)
+
+        def parse_message_delete(message_id):
+            client.dispatch("raw_message_delete", message_id)
+            cache.discard(message_id)
+
+        client._parse_inline(parse_message_delete, 1)
+        assert cached == [False]
+
+        # events dispatched outside of a parser still run right away
+        cache.add(1)
+        client.dispatch("raw_message_delete", 1)
+        assert cached == [False, True]
+
+    asyncio.run(main())
+
+
+def raw_event(**attrs):
+    return SimpleNamespace(**attrs)
+
+
+def test_keyed_waiters_resolve_on_matching_events():
+    async def main():
+        client = nextcord.Client()
+        task = asyncio.ensure_future(client.wait_for("raw_typing", channel_id=1, author_id=2))
+        await asyncio.sleep(0)
+
+        client.dispatch("raw_typing", raw_event(channel_id=1, user_id=3))
+        client.dispatch("raw_typing", raw_event(channel_id=4, user_id=2))
+        await asyncio.sleep(0)
+        assert not task.done()
+
+        match = raw_event(channel_id=1, user_id=2)
+        client.dispatch("raw_typing", match)
+        assert await task is match
+        assert client._keyed_listeners == {}
+
+    asyncio.run(main())
+
+
+def test_keyed_waiters_with_a_check():
+    async def main():
+        client = nextcord.Client()
+        task = asyncio.ensure_future(
+            client.wait_for(
+                "raw_reaction_add", message_id=5, check=lambda payload: payload.emoji == "b"
+            )
+        )
+        await asyncio.sleep(0)
+
+        client.dispatch("raw_reaction_add", raw_event(message_id=5, emoji="a"))
+        client.dispatch("raw_reaction_add", raw_event(message_id=6, emoji="b"))
+        await asyncio.sleep(0)
+        assert not task.done()
+
+        client.dispatch("raw_reaction_add", raw_event(message_id=5, emoji="b"))
+        assert (await task).emoji == "b"
+
+    asyncio.run(main())
+
+
+def test_keys_of_events_with_several_arguments():
+    async def main():
+        client = nextcord.Client()
+        task = asyncio.ensure_future(client.wait_for("reaction_add", message_id=5, author_id=2))
+        interaction = asyncio.ensure_future(client.wait_for("interaction", custom_id="confirm"))
+        await asyncio.sleep(0)
+
+        # the reaction comes first, the user who added it second
+        reaction = raw_event(message=raw_event(id=5))
+        client.dispatch("reaction_add", reaction, raw_event(id=3))
+        client.dispatch("interaction", raw_event(data={"custom_id": "cancel"}))
+        await asyncio.sleep(0)
+        assert not task.done()
+        assert not interaction.done()
+
+        user = raw_event(id=2)
+        client.dispatch("reaction_add", reaction, user)
+        client.dispatch("interaction", raw_event(data={"custom_id": "confirm"}))
+        assert await task == (reaction, user)
+        assert (await interaction).data == {"custom_id": "confirm"}
+
+    asyncio.run(main())
+
+
+def test_unresolved_keyed_waiters_are_removed():
+    async def main():
+        client = nextcord.Client()
+        with pytest.raises(asyncio.TimeoutError):
+            await client.wait_for("raw_typing", channel_id=1, timeout=0.01)
+        assert client._keyed_listeners == {}
+
+        task = asyncio.ensure_future(client.wait_for("raw_typing", channel_id=1))
+        other = asyncio.ensure_future(client.wait_for("raw_typing", channel_id=1))
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.sleep(0)
+        assert len(client._keyed_listeners["raw_typing"][("channel_id",)][(1,)]) == 1
+
+        other.cancel()
+        await asyncio.sleep(0)
+        assert client._keyed_listeners == {}
+
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+# SPDX-License-Identifier: MIT
+
+import enum
+
+from nextcord import enums
+from nextcord.enums import ChannelType, IntEnum, UnknownEnumValue, try_enum
+
+
+def test_known_values():
+    assert try_enum(ChannelType, 0) is ChannelType.text
+    assert try_enum(ChannelType, 0) is ChannelType.text
+    assert try_enum(ChannelType, ChannelType.voice) is ChannelType.voice
+
+
+def test_unknown_values_are_proxied_once():
+    value = try_enum(ChannelType, 9999)
+    assert isinstance(value, UnknownEnumValue)
+    assert value.value == 9999
+    assert value.name == "unknown_9999"
+    assert try_enum(ChannelType, 9999) is value
+
+
+def test_unknown_values_are_bounded():
+    class Color(IntEnum):
+        red = 1
+
+    for value in range(2, 2 + enums._MAX_UNKNOWN_VALUES * 2):
+        try_enum(Color, value)
+
+    table = enums._enum_values[Color]
+    assert len(table) == 1 + enums._MAX_UNKNOWN_VALUES
+    # values past the limit are still proxied, just not remembered
+    assert try_enum(Color, 10_000).value == 10_000
+    assert try_enum(Color, 1) is Color.red
+
+
+def test_unhashable_values():
+    value = try_enum(ChannelType, [1])
+    assert isinstance(value, UnknownEnumValue)
+    assert value.value == [1]
+
+
+def test_missing_hook():
+    class Mode(enum.Enum):
+        fast = "fast"
+
+        @classmethod
+        def _missing_(cls, value):
+            if isinstance(value, str) and value.lower() == "fast":
+                return cls.fast
+            return None
+
+    assert try_enum(Mode, "FAST") is Mode.fast
+    assert try_enum(Mode, "FAST") is Mode.fast
+    assert isinstance(try_enum(Mode, "slow"), UnknownEnumValue)
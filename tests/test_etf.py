@@ -0,0 +1,62 @@
+# SPDX-License-Identifier: MIT
+
+import zlib
+
+import pytest
+
+from nextcord import etf
+
+PAYLOAD = {
+    "op": 0,
+    "s": 42,
+    "t": "MESSAGE_CREATE",
+    "d": {
+        "id": 1234567890123456789,
+        "content": "héllo wörld",
+        "tts": False,
+        "pinned": True,
+        "edited_timestamp": None,
+        "nonce": -5,
+        "position": 70000,
+        "offset": -(2**40),
+        "ratio": 0.5,
+        "mentions": [],
+        "embeds": [{"title": "", "fields": [{"inline": True}]}],
+    },
+}
+
+
+def test_round_trip():
+    assert etf.unpack(etf.pack(PAYLOAD)) == PAYLOAD
+
+
+def test_tuples_are_encoded_as_lists():
+    assert etf.unpack(etf.pack({"a": (1, 2)})) == {"a": [1, 2]}
+
+
+def test_compressed_terms():
+    packed = etf.pack(PAYLOAD)
+    # 131, COMPRESSED, uncompressed size, zlib data
+    body = packed[1:]
+    compressed = b"\x83P" + len(body).to_bytes(4, "big") + zlib.compress(body)
+    assert etf.unpack(compressed) == PAYLOAD
+
+
+def test_matches_erlpack():
+    erlpack = pytest.importorskip("erlpack")
+    # both send str as binaries and None as the nil atom, as Discord does
+    assert etf.unpack(erlpack.pack(PAYLOAD)) == PAYLOAD
+    assert erlpack.unpack(etf.pack({"a": "b", "n": None, "x": [1, 2**62]})) == {
+        b"a": b"b",
+        b"n": None,
+        b"x": [1, 2**62],
+    }
+
+
+def test_invalid_payloads():
+    with pytest.raises(ValueError, match="version"):
+        etf.unpack(b"\x82j")
+    with pytest.raises(TypeError):
+        etf.pack({"a": object()})
+    with pytest.raises(ValueError, match="too large"):
+        etf.pack(2 ** (8 * 256))
@@ -0,0 +1,148 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import random
+
+import pytest
+
+from nextcord import EventPool
+
+
+class Recorder:
+    def __init__(self):
+        self.started = []
+        self.finished = []
+        self.running = {}
+        self.most_running = {}
+
+    def job(self, name, group, delay=0.0):
+        async def run():
+            self.started.append(name)
+            self.running[group] = running = self.running.get(group, 0) + 1
+            self.most_running[group] = max(self.most_running.get(group, 0), running)
+            await asyncio.sleep(delay)
+            self.running[group] -= 1
+            self.finished.append(name)
+
+        return run
+
+
+async def drain(pool):
+    while pool._queued or any(pool._running.values()):
+        await asyncio.sleep(0.001)
+
+
+def test_events_with_the_same_key_run_in_order():
+    async def main():
+        random.seed(0)
+        pool = EventPool(workers=8, ordering="channel")
+        recorder = Recorder()
+        for i in range(40):
+            channel = i % 3
+            pool.submit(
+                "message", channel, recorder.job((channel, i), channel, random.random() / 100)
+            )
+        await drain(pool)
+        pool.close()
+
+        for channel in range(3):
+            in_channel = [i for key, i in recorder.finished if key == channel]
+            assert in_channel == sorted(in_channel)
+            assert recorder.most_running[channel] == 1
+
+    asyncio.run(main())
+
+
+def test_concurrency_limit_per_event():
+    async def main():
+        pool = EventPool(workers=8, concurrency={"message": 2})
+        recorder = Recorder()
+        for i in range(10):
+            pool.submit("message", None, recorder.job(i, "message", 0.005))
+            pool.submit("typing", None, recorder.job(-i, "typing", 0.005))
+        await drain(pool)
+        pool.close()
+
+        assert recorder.most_running["message"] == 2
+        assert recorder.most_running["typing"] > 2
+        assert pool.stats()["events"]["message"]["handled"] == 10
+
+    asyncio.run(main())
+
+
+async def fill(pool, recorder):
+    blocker = asyncio.Event()
+
+    async def block():
+        await blocker.wait()
+
+    pool.submit("ready", None, block)
+    await asyncio.sleep(0)
+    # the only worker is busy, so the next handlers stay queued
+    for name in ("message", "typing"):
+        pool.submit(name, None, recorder.job(name, name))
+    assert pool.is_full()
+    return blocker
+
+
+def test_overflow_drop_oldest():
+    async def main():
+        pool = EventPool(workers=1, max_queue=2, overflow="drop_oldest")
+        recorder = Recorder()
+        blocker = await fill(pool, recorder)
+
+        assert pool.submit("presence_update", None, recorder.job("presence_update", "presence"))
+        blocker.set()
+        await drain(pool)
+        pool.close()
+
+        assert recorder.finished == ["typing", "presence_update"]
+        assert pool.stats()["events"]["message"]["dropped"] == 1
+
+    asyncio.run(main())
+
+
+def test_overflow_shed():
+    async def main():
+        pool = EventPool(workers=1, max_queue=2, overflow="shed", shed_events=["typing"])
+        recorder = Recorder()
+        blocker = await fill(pool, recorder)
+
+        assert not pool.submit("typing", None, recorder.job("shed", "typing"))
+        assert pool.submit("message", None, recorder.job("kept", "message"))
+        blocker.set()
+        await drain(pool)
+        pool.close()
+
+        assert recorder.finished == ["message", "typing", "kept"]
+        assert pool.stats()["events"]["typing"]["dropped"] == 1
+
+    asyncio.run(main())
+
+
+def test_overflow_block_waits_for_capacity():
+    async def main():
+        pool = EventPool(workers=1, max_queue=2)
+        recorder = Recorder()
+        blocker = await fill(pool, recorder)
+
+        waiter = asyncio.create_task(pool.wait_for_capacity())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        blocker.set()
+        await asyncio.wait_for(waiter, 1)
+        await drain(pool)
+        pool.close()
+        assert recorder.finished == ["message", "typing"]
+
+    asyncio.run(main())
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError, match="workers"):
+        EventPool(workers=0)
+    with pytest.raises(ValueError, match="ordering"):
+        EventPool(ordering="user")  # type: ignore
+    with pytest.raises(ValueError, match="overflow"):
+        EventPool(overflow="drop")  # type: ignore
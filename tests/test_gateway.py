@@ -0,0 +1,261 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import logging
+import time
+import zlib
+
+import pytest
+
+import nextcord
+from nextcord import gateway
+from nextcord.gateway import DiscordWebSocket, HeartbeatScheduler
+
+
+def block_loop(seconds):
+    time.sleep(seconds)
+
+
+def test_watchdog_warns_while_loop_is_blocked(caplog):
+    async def main():
+        scheduler = HeartbeatScheduler(
+            asyncio.get_running_loop(), watchdog_interval=0.05, block_threshold=0.3
+        )
+        handler = object()
+        scheduler.register(handler)  # type: ignore
+        await asyncio.sleep(0.1)
+        block_loop(1.0)
+        await asyncio.sleep(0)
+        scheduler.unregister(handler)  # type: ignore
+        return scheduler
+
+    with caplog.at_level(logging.WARNING, logger="nextcord.gateway"):
+        scheduler = asyncio.run(main())
+
+    blocked = [record for record in caplog.records if "has been blocked" in record.getMessage()]
+    # reported every block_threshold seconds while blocked, with the stack of the loop
+    assert len(blocked) >= 2
+    assert all("block_loop" in record.getMessage() for record in blocked)
+    assert scheduler._watchdog_thread is None
+
+
+@pytest.fixture()
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def make_ws(client, *, compress=None, encoding="json"):
+    # the attributes DiscordWebSocket.from_client sets, without a socket
+    ws = DiscordWebSocket(None, loop=client.loop, compress=compress, encoding=encoding)  # type: ignore
+    state = client._connection
+    ws._connection = state
+    ws.shard_id = None
+    ws.parsed = parsed = []
+    ws._discord_parsers = {
+        event: (lambda data, event=event: parsed.append((event, data)))
+        for event in ("MESSAGE_CREATE", "TYPING_START", "GUILD_CREATE", "READY")
+    }
+    ws._filter_events = state._filters_events and encoding == "json"
+    ws._filter_decoded = state._filters_events and encoding == "etf"
+    return ws
+
+
+def dumps(payload):
+    # Discord sends compact JSON
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def dispatch(event, seq, data):
+    return dumps({"t": event, "s": seq, "op": 0, "d": data})
+
+
+def test_unwanted_events_are_dropped_before_decoding(loop):
+    client = nextcord.Client(ignored_events=["TYPING_START", "GUILD_CREATE"], loop=loop)
+    ws = make_ws(client)
+    decoded = []
+    decode = ws._decode
+    ws._decode = lambda msg: decoded.append(msg) or decode(msg)
+
+    loop.run_until_complete(ws.received_message(dispatch("MESSAGE_CREATE", 1, {"id": "1"})))
+    loop.run_until_complete(ws.received_message(dispatch("TYPING_START", 2, {"t": "x"})))
+    assert ws.sequence == 2
+    assert len(decoded) == 1
+    assert ws.parsed == [("MESSAGE_CREATE", {"id": "1"})]
+
+    # required events are never dropped, even when ignored
+    loop.run_until_complete(ws.received_message(dispatch("GUILD_CREATE", 3, {"id": "2"})))
+    assert ws.sequence == 3
+    assert ws.parsed[-1] == ("GUILD_CREATE", {"id": "2"})
+
+
+def test_allowed_events(loop):
+    client = nextcord.Client(allowed_events=["MESSAGE_CREATE"], loop=loop)
+    ws = make_ws(client)
+
+    for seq, event in enumerate(("TYPING_START", "READY", "MESSAGE_CREATE", "TYPING_START"), 1):
+        loop.run_until_complete(
+            ws.received_message(
+                dispatch(event, seq, {"session_id": "a", "resume_gateway_url": "wss://a"})
+            )
+        )
+    assert [event for event, _ in ws.parsed] == ["READY", "MESSAGE_CREATE"]
+    # the sequence advanced past the dropped dispatches, for RESUME
+    assert ws.sequence == 4
+
+
+def test_filter_only_reads_the_envelope(loop):
+    client = nextcord.Client(ignored_events=["TYPING_START"], loop=loop)
+    ws = make_ws(client)
+
+    # a nested "t" that looks like an ignored event does not drop the payload
+    payload = dispatch("MESSAGE_CREATE", 1, {"t": "TYPING_START", "s": 99})
+    loop.run_until_complete(ws.received_message(payload))
+    assert ws.parsed == [("MESSAGE_CREATE", {"t": "TYPING_START", "s": 99})]
+    assert ws.sequence == 1
+
+    # "d" first, the envelope cannot be scanned so the payload is decoded as usual
+    payload = dumps({"d": {}, "t": "TYPING_START", "s": 2, "op": 0})
+    assert not ws._drop_unwanted(payload)
+    # and filtered once decoded
+    loop.run_until_complete(ws.received_message(payload))
+    assert ws.sequence == 2
+
+
+def test_events_waited_for_are_not_dropped(loop):
+    client = nextcord.Client(ignored_events=["TYPING_START"], loop=loop)
+    ws = make_ws(client)
+    future = ws.wait_for("TYPING_START", lambda _: True)
+
+    loop.run_until_complete(ws.received_message(dispatch("TYPING_START", 1, {"id": "1"})))
+    assert future.result() == {"id": "1"}
+
+
+def zlib_messages(payloads, size):
+    # every payload is flushed, then cut into websocket messages of at most size bytes
+    compressor = zlib.compressobj()
+    messages = []
+    for payload in payloads:
+        data = compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        messages.extend(data[i : i + size] for i in range(0, len(data), size))
+    return messages
+
+
+def zstd_messages(payloads):
+    # the whole connection is one zstd frame, flushed after every payload
+    zstandard = pytest.importorskip("zstandard")
+    compressor = zstandard.ZstdCompressor().compressobj()
+    return [
+        compressor.compress(payload) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        for payload in payloads
+    ]
+
+
+def compressed_payloads():
+    members = [{"user": {"id": str(i), "username": f"user{i}"}} for i in range(5000)]
+    return [
+        dispatch("GUILD_CREATE", 1, {"id": "1", "members": members}),
+        dispatch("MESSAGE_CREATE", 2, {"id": "2", "content": "hello"}),
+        dispatch("MESSAGE_CREATE", 3, {"id": "3", "content": "hello again"}),
+    ]
+
+
+def receive(loop, ws, messages):
+    for message in messages:
+        loop.run_until_complete(ws.received_message(message))
+    return [(event, data["id"]) for event, data in ws.parsed]
+
+
+def test_zlib_stream_payloads_split_over_messages(loop):
+    client = nextcord.Client(loop=loop)
+    ws = make_ws(client, compress="zlib-stream")
+    payloads = compressed_payloads()
+    messages = zlib_messages(payloads, 1000)
+    assert len(messages) > len(payloads)
+
+    assert receive(loop, ws, messages) == [
+        ("GUILD_CREATE", "1"),
+        ("MESSAGE_CREATE", "2"),
+        ("MESSAGE_CREATE", "3"),
+    ]
+    assert len(ws.parsed[0][1]["members"]) == 5000
+    assert ws.sequence == 3
+    assert not ws._decompressor._buffer
+
+
+def test_zstd_stream_payloads(loop):
+    messages = zstd_messages(compressed_payloads())
+    client = nextcord.Client(gateway_compression="zstd-stream", loop=loop)
+    ws = make_ws(client, compress="zstd-stream")
+
+    assert receive(loop, ws, messages) == [
+        ("GUILD_CREATE", "1"),
+        ("MESSAGE_CREATE", "2"),
+        ("MESSAGE_CREATE", "3"),
+    ]
+    assert len(ws.parsed[0][1]["members"]) == 5000
+    assert ws.sequence == 3
+
+
+def test_zstd_stream_with_event_filter(loop):
+    payloads = [
+        dispatch("TYPING_START", 1, {"id": "1"}),
+        dispatch("MESSAGE_CREATE", 2, {"id": "2"}),
+    ]
+    messages = zstd_messages(payloads)
+    client = nextcord.Client(
+        gateway_compression="zstd-stream", ignored_events=["TYPING_START"], loop=loop
+    )
+    ws = make_ws(client, compress="zstd-stream")
+
+    assert receive(loop, ws, messages) == [("MESSAGE_CREATE", "2")]
+    assert ws.sequence == 2
+
+
+def test_transport_compression_is_checked(monkeypatch):
+    with pytest.raises(ValueError, match="gateway_compression must be one of"):
+        gateway._check_transport_compression("gzip")
+    gateway._check_transport_compression(None)
+    gateway._check_transport_compression("zlib-stream")
+
+    monkeypatch.setattr(gateway, "has_zstd", False)
+    with pytest.raises(RuntimeError, match="zstandard library needed"):
+        gateway._check_transport_compression("zstd-stream")
+
+
+@pytest.mark.parametrize(
+    ("gateway", "format_gateway", "resume_url"),
+    [
+        ("wss://resume.discord.gg", True, "wss://resume.discord.gg"),
+        # a formatted URL cannot be formatted again
+        ("wss://gateway.discord.gg/?v=10&encoding=json", False, None),
+    ],
+)
+def test_resuming_keeps_the_resume_url(loop, monkeypatch, gateway, format_gateway, resume_url):
+    client = nextcord.Client(loop=loop)
+    connected = []
+
+    async def ws_connect(url):
+        connected.append(url)
+
+    async def skip(_ws):
+        pass
+
+    client.http.ws_connect = ws_connect
+    monkeypatch.setattr(DiscordWebSocket, "poll_event", skip)
+    monkeypatch.setattr(DiscordWebSocket, "resume", skip)
+    coro = DiscordWebSocket.from_client(
+        client,
+        gateway=gateway,
+        format_gateway=format_gateway,
+        session="a",
+        sequence=10,
+        resume=True,
+    )
+    ws = loop.run_until_complete(coro)
+
+    assert ws.resume_url == resume_url
+    assert connected == [ws.gateway]
+    assert connected[0].startswith(gateway)
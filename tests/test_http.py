@@ -0,0 +1,75 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from nextcord.http import Ratelimit
+
+
+async def start(ratelimit, count):
+    tasks = [asyncio.create_task(ratelimit.acquire()) for _ in range(count)]
+    await asyncio.sleep(0)
+    return tasks
+
+
+def test_release_wakes_one_waiter_per_free_slot():
+    async def main():
+        ratelimit = Ratelimit(asyncio.get_running_loop())
+        ratelimit.limit = ratelimit.remaining = 2
+        tasks = await start(ratelimit, 6)
+        assert sum(task.done() for task in tasks) == 2
+        assert len(ratelimit._waiters) == 4
+
+        ratelimit.release()
+        # the slot is handed to the first waiter, the others are not woken
+        assert ratelimit._in_flight == 2
+        assert [future.done() for future in ratelimit._waiters] == [False] * 3
+        await asyncio.sleep(0)
+        assert sum(task.done() for task in tasks) == 3
+
+        for _ in range(5):
+            ratelimit.release()
+        await asyncio.sleep(0)
+        assert all(task.done() for task in tasks)
+        assert ratelimit._in_flight == 0
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_passes_its_slot_on():
+    async def main():
+        ratelimit = Ratelimit(asyncio.get_running_loop())
+        first, second, third = await start(ratelimit, 3)
+        assert first.done()
+
+        ratelimit.release()
+        # the slot was handed to the second waiter, which is cancelled before it runs
+        second.cancel()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert second.cancelled()
+        assert third.done()
+        assert ratelimit._in_flight == 1
+
+    asyncio.run(main())
+
+
+def test_depleted_bucket_waits_for_the_window():
+    async def main():
+        loop = asyncio.get_running_loop()
+        ratelimit = Ratelimit(loop)
+        ratelimit.limit = 3
+        tasks = await start(ratelimit, 1)
+        ratelimit.remaining = 0
+        ratelimit.reset_at = loop.time() + 0.05
+        tasks += await start(ratelimit, 4)
+
+        ratelimit.release()
+        await asyncio.sleep(0)
+        # only one waiter sleeps the window out
+        assert not any(task.done() for task in tasks[1:])
+
+        await asyncio.sleep(0.1)
+        assert sum(task.done() for task in tasks[1:]) == 3
+        assert ratelimit._in_flight == 3
+
+    asyncio.run(main())
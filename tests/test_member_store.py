@@ -0,0 +1,263 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import datetime
+
+import pytest
+
+import nextcord
+from nextcord.member import Member
+from nextcord.member_store import _COMPACT_THRESHOLD, ColumnarMemberStore, _StoredMember
+
+GUILD_ID = 1 << 32
+ROLES = [GUILD_ID + 1, GUILD_ID + 2, GUILD_ID + 3]
+
+
+def user(user_id):
+    return {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "avatar": None}
+
+
+def member_data(user_id, *, roles=(), **fields):
+    return {
+        "user": user(user_id),
+        "roles": [str(role_id) for role_id in roles],
+        "joined_at": "2023-05-01T12:00:00+00:00",
+        "nick": None,
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+        **fields,
+    }
+
+
+def new_client(*, columnar=True):
+    client = nextcord.Client(
+        intents=nextcord.Intents.all(),
+        member_cache_flags=nextcord.MemberCacheFlags(columnar=columnar),
+        loop=asyncio.new_event_loop(),
+    )
+    client._connection.dispatch = lambda *_: None
+    return client
+
+
+def guild_payload(members=()):
+    return {
+        "id": str(GUILD_ID),
+        "name": "guild",
+        "member_count": len(members),
+        "owner_id": "10",
+        "roles": [
+            {"id": str(role_id), "name": f"role{role_id}", "permissions": "0", "position": index}
+            for index, role_id in enumerate([GUILD_ID, *ROLES])
+        ],
+        "members": list(members),
+        "presences": [],
+    }
+
+
+@pytest.fixture()
+def guild():
+    client = new_client()
+    yield client._connection._add_guild_from_data(guild_payload())
+    client.loop.close()
+
+
+def add(guild, user_id, **fields):
+    member = Member(data=member_data(user_id, **fields), guild=guild, state=guild._state)
+    guild._add_member(member)
+    return member
+
+
+def test_members_are_stored_in_columns(guild):
+    store = guild._members
+    assert isinstance(store, ColumnarMemberStore)
+    add(guild, 10, roles=ROLES[:2], nick="ten", avatar="a" * 32, pending=True, flags=2)
+    add(guild, 11, joined_at=None)
+
+    assert len(store) == 2
+    assert list(store) == [10, 11]
+    assert 10 in store
+    assert 12 not in store
+    assert store.get(12) is None
+
+    member = store[10]
+    assert isinstance(member, _StoredMember)
+    assert member._user is guild._state.get_user(10)
+    assert member.nick == "ten"
+    assert member._avatar == "a" * 32
+    assert member.pending is True
+    assert member._flags == 2
+    assert member.joined_at == datetime.datetime(2023, 5, 1, 12, tzinfo=datetime.timezone.utc)
+    assert [role.id for role in member.roles] == [GUILD_ID, *ROLES[:2]]
+    assert member.status is nextcord.Status.offline
+
+    other = store[11]
+    assert other.joined_at is None
+    assert other.nick is None
+    assert list(other._roles) == []
+    assert [member.id for member in store.values()] == [10, 11]
+
+
+def test_removed_members_leave_a_dead_row(guild):
+    store = guild._members
+    for user_id in (10, 11, 12):
+        add(guild, user_id, roles=ROLES[:1])
+    del store[11]
+
+    assert list(store) == [10, 12]
+    assert [member.id for member in store.values()] == [10, 12]
+    assert store._users[1] is None
+    assert (store._dead, store._dead_roles) == (1, 1)
+    with pytest.raises(KeyError):
+        store[11]
+
+    # added again in a new row
+    add(guild, 11)
+    assert store._index[11] == 3
+    assert [member.id for member in store.values()] == [10, 12, 11]
+
+
+def test_store_is_compacted_once_half_of_it_is_dead(guild):
+    store = guild._members
+    count = _COMPACT_THRESHOLD * 3
+    for user_id in range(1, count + 1):
+        add(guild, user_id, roles=ROLES[user_id % 3 :])
+
+    removed = range(1, count + 1, 3)
+    kept = [user_id for user_id in range(1, count + 1) if user_id % 3 != 1]
+    for user_id in removed:
+        del store[user_id]
+    assert store._dead == len(removed)
+
+    for user_id in kept[: len(kept) // 2]:
+        del store[user_id]
+    kept = kept[len(kept) // 2 :]
+
+    # compacted when more than half of the rows were dead
+    assert store._dead < _COMPACT_THRESHOLD
+    assert len(store._users) < count
+    assert len(store._role_ids) == sum(len(ROLES[user_id % 3 :]) for user_id in kept) + (
+        store._dead_roles
+    )
+    assert list(store) == kept
+    assert all(store._index[user_id] < len(store._users) for user_id in kept)
+    for user_id in kept:
+        member = store[user_id]
+        assert member.id == user_id
+        assert list(member._roles) == ROLES[user_id % 3 :]
+
+
+def test_roles_are_replaced_in_place_or_moved(guild):
+    store = guild._members
+    add(guild, 10, roles=ROLES[:2])
+    add(guild, 11, roles=ROLES[:1])
+
+    # as many roles as before, in the same slice
+    add(guild, 10, roles=ROLES[1:])
+    assert list(store._role_ids) == [ROLES[1], ROLES[2], ROLES[0]]
+    assert store._dead_roles == 0
+
+    # more roles than before, in a new slice at the end
+    add(guild, 11, roles=ROLES)
+    assert list(store._role_ids) == [ROLES[1], ROLES[2], ROLES[0], *ROLES]
+    assert store._role_start[1] == 3
+    assert store._dead_roles == 1
+    assert list(store[10]._roles) == ROLES[1:]
+    assert list(store[11]._roles) == ROLES
+
+
+def test_updates_to_stored_members_are_written_back(guild):
+    store = guild._members
+    add(guild, 10)
+
+    store[10]._update(member_data(10, roles=ROLES[:1], nick="changed"))
+    assert store[10].nick == "changed"
+    assert list(store[10]._roles) == ROLES[:1]
+
+    store[10]._update_from_message(member_data(10, nick="again", joined_at=None))
+    assert store[10].nick == "again"
+    assert store[10].joined_at is None
+
+    # a member that was removed is not added back by a stale copy
+    member = store[10]
+    del store[10]
+    member._update(member_data(10, nick="stale"))
+    assert 10 not in store
+
+
+def test_presences_are_kept_for_members_that_are_not_offline(guild):
+    store = guild._members
+    add(guild, 10)
+    presence = {
+        "user": {"id": "10"},
+        "status": "dnd",
+        "activities": [{"name": "a game", "type": 0}],
+        "client_status": {"desktop": "dnd"},
+    }
+
+    store[10]._presence_update(presence, {"id": "10"})
+    member = store[10]
+    assert member.status is nextcord.Status.dnd
+    assert member.desktop_status is nextcord.Status.dnd
+    assert [activity.name for activity in member.activities] == ["a game"]
+    assert list(store._presences) == [10]
+
+    store[10]._presence_update(
+        {"user": {"id": "10"}, "status": "offline", "activities": []}, {"id": "10"}
+    )
+    assert store[10].status is nextcord.Status.offline
+    assert store._presences == {}
+
+    store[10].status = nextcord.Status.idle
+    assert store[10].status is nextcord.Status.idle
+
+
+def test_boosts_and_timeouts_are_kept_apart(guild):
+    store = guild._members
+    add(
+        guild,
+        10,
+        premium_since="2023-06-01T00:00:00+00:00",
+        communication_disabled_until="2999-01-01T00:00:00+00:00",
+    )
+    add(guild, 11)
+
+    assert list(store._premium) == [10]
+    assert list(store._timeouts) == [10]
+    member = store[10]
+    assert member.premium_since == datetime.datetime(2023, 6, 1, tzinfo=datetime.timezone.utc)
+    assert member.communication_disabled_until is not None
+    assert store[11].premium_since is None
+
+    # cleared with the member update that ends them
+    store[10]._update(member_data(10))
+    assert store._premium == {}
+    assert store._timeouts == {}
+    assert store[10].communication_disabled_until is None
+
+    add(guild, 11, premium_since="2023-07-01T00:00:00+00:00")
+    del store[11]
+    assert store._premium == {}
+
+
+def test_snapshot_is_loaded_into_columns(tmp_path):
+    path = str(tmp_path / "cache.snapshot")
+    saved = new_client(columnar=False)
+    restored = new_client()
+    members = [member_data(10, roles=ROLES[:1], nick="ten"), member_data(11)]
+
+    async def main():
+        saved._connection._add_guild_from_data(guild_payload(members))
+        await saved.save_cache_snapshot(path)
+        assert await restored.load_cache_snapshot(path)
+
+    try:
+        saved.loop.run_until_complete(main())
+        guild = restored.get_guild(GUILD_ID)
+        assert isinstance(guild._members, ColumnarMemberStore)
+        assert [member.id for member in guild.members] == [10, 11]
+        assert guild.get_member(10).nick == "ten"
+        assert [member.id for member in guild.get_role(ROLES[0]).members] == [10]
+    finally:
+        saved.loop.close()
+        restored.loop.close()
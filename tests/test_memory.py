@@ -0,0 +1,133 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+import nextcord
+
+KINDS = [
+    "guilds",
+    "members",
+    "channels",
+    "threads",
+    "roles",
+    "voice_states",
+    "users",
+    "emojis",
+    "stickers",
+    "private_channels",
+    "messages",
+    "views",
+    "modals",
+    "application_commands",
+]
+
+
+def user(user_id):
+    return {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "avatar": None}
+
+
+def guild_payload(guild_id, member_ids):
+    return {
+        "id": str(guild_id),
+        "name": f"guild {guild_id}",
+        "member_count": len(member_ids),
+        "owner_id": str(member_ids[0]),
+        "roles": [
+            {"id": str(guild_id), "name": "@everyone", "permissions": "0", "position": 0},
+            {"id": str(guild_id + 1), "name": "mod", "permissions": "8", "position": 1},
+        ],
+        "channels": [
+            {
+                "id": str(guild_id + 2),
+                "type": 0,
+                "name": "general",
+                "position": 0,
+                "permission_overwrites": [],
+            }
+        ],
+        "members": [
+            {
+                "user": user(user_id),
+                "roles": [str(guild_id + 1)],
+                "joined_at": "2023-05-01T12:00:00+00:00",
+                "nick": f"nick{user_id}",
+                "deaf": False,
+                "mute": False,
+            }
+            for user_id in member_ids
+        ],
+        "presences": [],
+    }
+
+
+@pytest.fixture(params=[False, True], ids=["dict", "columnar"])
+def client(request):
+    client = nextcord.Client(
+        intents=nextcord.Intents.all(),
+        member_cache_flags=nextcord.MemberCacheFlags(columnar=request.param),
+        loop=asyncio.new_event_loop(),
+    )
+    yield client
+    client.loop.close()
+
+
+def add_guilds(client):
+    state = client._connection
+    # the second guild has the most members, and so uses the most memory
+    state._add_guild_from_data(guild_payload(1 << 32, [10, 11]))
+    state._add_guild_from_data(guild_payload(2 << 32, list(range(20, 60))))
+
+
+def test_report_counts_every_kind(client):
+    add_guilds(client)
+    report = client.memory_report()
+
+    assert list(report["kinds"]) == KINDS
+    counts = {kind: entry["count"] for kind, entry in report["kinds"].items()}
+    assert counts == {
+        **dict.fromkeys(KINDS, 0),
+        "guilds": 2,
+        "members": 42,
+        "channels": 2,
+        "roles": 4,
+        "users": 42,
+    }
+    assert all(entry["memory"] > 0 for kind, entry in report["kinds"].items() if counts[kind])
+    assert report["memory"] == sum(entry["memory"] for entry in report["kinds"].values())
+
+    heaviest, lightest = report["guilds"]
+    assert heaviest["memory"] > lightest["memory"]
+    assert heaviest == {
+        "id": 2 << 32,
+        "members": 40,
+        "channels": 1,
+        "threads": 0,
+        "roles": 2,
+        "voice_states": 0,
+        "emojis": 0,
+        "stickers": 0,
+        "memory": heaviest["memory"],
+    }
+    assert lightest["id"] == 1 << 32
+    assert lightest["members"] == 2
+
+
+def test_report_top_guilds(client):
+    add_guilds(client)
+
+    assert [guild["id"] for guild in client.memory_report(top=1)["guilds"]] == [2 << 32]
+    assert client.memory_report(top=0)["guilds"] == []
+    # the totals do not depend on how many guilds are listed
+    assert client.memory_report(top=0)["kinds"] == client.memory_report()["kinds"]
+
+
+def test_report_of_empty_caches(client):
+    report = client.memory_report()
+
+    assert list(report["kinds"]) == KINDS
+    assert all(entry["count"] == 0 for entry in report["kinds"].values())
+    for kind in ("guilds", "members", "channels", "threads", "roles", "voice_states"):
+        assert report["kinds"][kind]["memory"] == 0
+    assert report["guilds"] == []
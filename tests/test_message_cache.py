@@ -0,0 +1,40 @@
+# SPDX-License-Identifier: MIT
+
+from types import SimpleNamespace
+
+from nextcord.state import MessageCache
+
+
+def make_message(message_id, channel_id=1):
+    return SimpleNamespace(id=message_id, channel=SimpleNamespace(id=channel_id))
+
+
+def test_messages_stay_in_arrival_order():
+    cache = MessageCache(3)
+    messages = [make_message(i) for i in range(3)]
+    for message in messages:
+        cache.append(message)  # type: ignore
+
+    assert cache.get(0) is messages[0]
+    assert [m.id for m in cache] == [0, 1, 2]
+    assert [m.id for m in reversed(cache)] == [2, 1, 0]
+    assert cache[0] is messages[0]
+    assert cache[-1] is messages[2]
+
+
+def test_least_recently_used_message_is_evicted():
+    cache = MessageCache(3)
+    for i in range(3):
+        cache.append(make_message(i, channel_id=i % 2))  # type: ignore
+
+    cache.get(0)
+    cache.append(make_message(3))  # type: ignore
+
+    assert [m.id for m in cache] == [0, 2, 3]
+    assert cache.get(1) is None
+    assert [m.id for m in cache.channel_messages(1)] == [3]
+
+    assert [m.id for m in cache.pop_many([3, 0])] == [0, 3]
+    assert cache.pop(2) is not None
+    assert len(cache) == 0
+    assert not cache._recency
@@ -0,0 +1,216 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import nextcord
+from nextcord.ui import Button, ComponentRouter, View
+
+BUTTON = nextcord.ComponentType.button.value
+SELECT = nextcord.ComponentType.select.value
+
+
+class Response:
+    def __init__(self):
+        self._responded = False
+        self.deferred = False
+
+    async def defer(self):
+        self._responded = True
+        self.deferred = True
+
+
+def make_interaction():
+    return SimpleNamespace(response=Response(), is_expired=lambda: False)
+
+
+def resolve(router, custom_id, component_type=BUTTON):
+    resolved = router._resolve(component_type, custom_id)
+    return None if resolved is None else (resolved[0].template, resolved[1])
+
+
+async def noop(*_, **__):
+    pass
+
+
+@pytest.mark.parametrize(
+    ("template", "message"),
+    [
+        ("role:{0}", "invalid parameter name"),
+        ("role:{}", "invalid parameter name"),
+        ("role:{id}:{id}", "duplicate parameter"),
+        ("role:{id:float}", "unsupported format"),
+        ("role:{id!r}", "unsupported format"),
+    ],
+)
+def test_malformed_templates(template, message):
+    router = ComponentRouter()
+    with pytest.raises(ValueError, match=message):
+        router.add_route(template, noop)
+    assert len(router) == 0
+
+
+def test_unbalanced_braces():
+    with pytest.raises(ValueError):  # noqa: PT011 raised by string.Formatter
+        ComponentRouter().add_route("role:{id", noop)
+
+
+def test_callback_must_be_a_coroutine():
+    with pytest.raises(TypeError, match="coroutine function"):
+        ComponentRouter().add_route("role", lambda _: None)
+
+
+def test_parameters_are_converted():
+    router = ComponentRouter()
+    router.add_route("role:{role_id:int}:{action}", noop)
+
+    assert resolve(router, "role:123:add") == (
+        "role:{role_id:int}:{action}",
+        {"role_id": 123, "action": "add"},
+    )
+    assert resolve(router, "role:-5:remove:all")[1] == {"role_id": -5, "action": "remove:all"}
+    assert resolve(router, "role:abc:add") is None
+    assert resolve(router, "role:123:") is None
+    assert resolve(router, "other:123:add") is None
+
+
+def test_literal_templates():
+    router = ComponentRouter()
+    router.add_route("{{literal}}", noop)
+    router.add_route("close", noop)
+
+    assert resolve(router, "{literal}") == ("{{literal}}", {})
+    assert resolve(router, "close") == ("close", {})
+    assert resolve(router, "closed") is None
+
+
+def test_longest_prefix_first():
+    router = ComponentRouter()
+    router.add_route("ticket:{rest}", noop)
+    router.add_route("ticket:close:{id:int}", noop)
+    router.add_route("ticket:close:{reason}", noop)
+
+    assert resolve(router, "ticket:close:5") == ("ticket:close:{id:int}", {"id": 5})
+    # same prefix, tried in the order they were added
+    assert resolve(router, "ticket:close:spam") == ("ticket:close:{reason}", {"reason": "spam"})
+    assert resolve(router, "ticket:open") == ("ticket:{rest}", {"rest": "open"})
+
+
+def test_component_type_filter():
+    router = ComponentRouter()
+    router.add_route("menu:{id:int}", noop, component_type=nextcord.ComponentType.select)
+    router.add_route("menu:{rest}", noop)
+
+    assert resolve(router, "menu:1", SELECT) == ("menu:{id:int}", {"id": 1})
+    assert resolve(router, "menu:1", BUTTON) == ("menu:{rest}", {"rest": "1"})
+
+
+def test_remove_route_updates_prefixes():
+    router = ComponentRouter()
+    router.add_route("a:{x}", noop)
+    router.add_route("a:{x}:{y}", noop)
+    router.add_route("abc:{x}", noop)
+    assert router._prefix_lengths == [4, 2]
+
+    router.remove_route("a:{x}")
+    assert router._prefix_lengths == [4, 2]
+    router.remove_route("a:{x}:{y}")
+    assert router._prefix_lengths == [4]
+    assert resolve(router, "a:1") is None
+
+    router.remove_route("abc:{x}")
+    router.remove_route("missing")
+    assert router._prefix_lengths == []
+    assert router.stats() == {"routes": 0, "prefixes": 0}
+
+
+def test_adding_a_template_again_replaces_it():
+    async def first(*_, **__):
+        pass
+
+    router = ComponentRouter()
+    router.add_route("a:{x}", noop)
+    router.add_route("b:{x}", noop)
+    router.add_route("a:{x}", first)
+
+    assert router.templates == ["b:{x}", "a:{x}"]
+    assert router._routes["a:"][0].callback is first
+    assert len(router._routes["a:"]) == 1
+
+
+def test_auto_defer():
+    calls = []
+
+    async def respond(interaction, **params):
+        calls.append(params)
+        interaction.response._responded = True
+
+    async def main():
+        router = ComponentRouter()
+        router.route("defer:{id:int}")(noop)
+        router.route("respond:{id:int}")(respond)
+        router.route("manual:{id:int}", auto_defer=False)(noop)
+
+        interactions = [make_interaction() for _ in range(3)]
+        for custom_id, interaction in zip(("defer:1", "respond:2", "manual:3"), interactions):
+            assert router.dispatch(BUTTON, custom_id, interaction)  # type: ignore
+        assert not router.dispatch(BUTTON, "unknown", make_interaction())  # type: ignore
+        await asyncio.gather(*router._background_tasks)
+        return interactions
+
+    deferred, responded, manual = asyncio.run(main())
+    assert deferred.response.deferred
+    assert not responded.response.deferred
+    assert calls == [{"id": 2}]
+    assert not manual.response.deferred
+
+
+def test_router_is_checked_before_views():
+    loop = asyncio.new_event_loop()
+    client = nextcord.Client(loop=loop)
+    state = client._connection
+    state.dispatch = lambda *_: None
+    routed = []
+    clicked = []
+
+    async def on_route(_interaction, id):
+        routed.append(id)
+
+    async def main():
+        client.add_component_route("shared:{id:int}", on_route, auto_defer=False)
+
+        view = View(timeout=None, auto_defer=False)
+        for custom_id in ("shared:1", "view-only"):
+            button = Button(custom_id=custom_id)
+
+            async def callback(_interaction, custom_id=custom_id):
+                clicked.append(custom_id)
+
+            button.callback = callback
+            view.add_item(button)
+        state.store_view(view)
+
+        for custom_id in ("shared:1", "view-only"):
+            state.parse_interaction_create(
+                {
+                    "id": "10",
+                    "application_id": "20",
+                    "type": 3,
+                    "token": "token",
+                    "version": 1,
+                    "channel_id": "30",
+                    "user": {"id": "40", "username": "user", "discriminator": "0", "avatar": None},
+                    "data": {"custom_id": custom_id, "component_type": BUTTON},
+                }
+            )
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    try:
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
+    assert routed == [1]
+    assert clicked == ["view-only"]
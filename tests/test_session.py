@@ -0,0 +1,126 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+import nextcord
+from nextcord.session import FileSessionStore, GatewaySession, SessionStore
+from nextcord.user import ClientUser
+
+
+def session(session_id="a", *, shard_id=None, shard_count=None, sequence=10):
+    return GatewaySession(
+        shard_id=shard_id,
+        shard_count=shard_count,
+        session_id=session_id,
+        sequence=sequence,
+        resume_url="wss://resume.discord.gg",
+    )
+
+
+def test_file_session_store_round_trip(tmp_path):
+    store = FileSessionStore(tmp_path / "sessions.json")
+    saved = [session(shard_id=0, shard_count=2), session("b", shard_id=1, shard_count=2)]
+
+    async def main():
+        await store.save(saved)
+        return await store.load()
+
+    loaded = asyncio.run(main())
+    assert [item.to_dict() for item in loaded] == [item.to_dict() for item in saved]
+    # replaced through a temporary file, which is gone once it is written
+    assert [path.name for path in tmp_path.iterdir()] == ["sessions.json"]
+
+
+def test_file_session_store_without_a_file(tmp_path):
+    store = FileSessionStore(tmp_path / "sessions.json")
+    assert asyncio.run(store.load()) == []
+
+
+def test_file_session_store_ignores_malformed_files(tmp_path, caplog):
+    path = tmp_path / "sessions.json"
+    path.write_text('{"sessions": [', encoding="utf-8")
+    store = FileSessionStore(path)
+
+    with caplog.at_level(logging.WARNING, logger="nextcord.session"):
+        assert asyncio.run(store.load()) == []
+    assert "malformed session file" in caplog.text
+
+
+def test_session_store_interval():
+    with pytest.raises(ValueError, match="interval"):
+        SessionStore(interval=0)
+
+
+def load_sessions(tmp_path, saved, anchors, *, shard_count=None, restored=True):
+    store = FileSessionStore(tmp_path / "sessions.json")
+
+    async def main():
+        await store.save(saved)
+        client = nextcord.Client(session_store=store, shard_count=shard_count)
+        client._connection._cache_restored = restored
+        client._connection._snapshot_sessions = {anchor.shard_id: anchor for anchor in anchors}
+        return await client._load_sessions()
+
+    return asyncio.run(main())
+
+
+def test_sessions_resume_from_the_snapshot(tmp_path):
+    sessions = load_sessions(tmp_path, [session(sequence=50)], [session(sequence=10)])
+    # the events since the snapshot are replayed
+    assert list(sessions) == [None]
+    assert sessions[None].session_id == "a"
+    assert sessions[None].sequence == 10
+
+
+@pytest.mark.parametrize(
+    ("saved", "anchors", "restored"),
+    [
+        # the caches were not restored
+        ([session()], [session()], False),
+        # the snapshot was taken in an earlier session
+        ([session("b")], [session("a")], True),
+        # or without this shard
+        ([session(shard_id=1)], [session(shard_id=0)], True),
+    ],
+)
+def test_sessions_that_cannot_resume(tmp_path, saved, anchors, restored):
+    assert load_sessions(tmp_path, saved, anchors, restored=restored) == {}
+
+
+def test_sessions_of_another_shard_count_cannot_resume(tmp_path):
+    saved = [session(shard_id=0, shard_count=2)]
+    anchors = [session(shard_id=0, shard_count=2)]
+    assert list(load_sessions(tmp_path, saved, anchors, shard_count=2)) == [0]
+    assert load_sessions(tmp_path, saved, anchors, shard_count=3) == {}
+
+
+def test_checkpoints_can_be_resumed_after_a_crash(tmp_path):
+    store = FileSessionStore(tmp_path / "sessions.json", interval=0.05)
+    snapshot = str(tmp_path / "cache.snapshot")
+
+    async def main():
+        client = nextcord.Client(session_store=store, cache_snapshot=snapshot)
+        state = client._connection
+        state.user = ClientUser(
+            state=state, data={"id": "1", "username": "bot", "discriminator": "0", "avatar": None}
+        )
+        client.ws = SimpleNamespace(session_id="a", sequence=10, resume_url="wss://resume")
+        client._start_session_checkpoints()
+        await asyncio.sleep(0.1)
+        client.ws.sequence = 20
+        await asyncio.sleep(0.1)
+        # the process stops without closing the client
+        client._session_task.cancel()
+
+        restarted = nextcord.Client(session_store=store, cache_snapshot=snapshot)
+        await restarted._restore_cache_snapshot()
+        return await restarted._load_sessions()
+
+    sessions = asyncio.run(main())
+    assert sessions[None].session_id == "a"
+    assert sessions[None].sequence == 20
+    assert sessions[None].resume_url == "wss://resume"
@@ -0,0 +1,101 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+
+import nextcord
+
+
+class RecordingClient(nextcord.AutoShardedClient):
+    def __init__(self, max_concurrency, remaining=1000, **options):
+        super().__init__(loop=asyncio.new_event_loop(), **options)
+        self.limit = {
+            "total": 1000,
+            "remaining": remaining,
+            "reset_after": 60_000,
+            "max_concurrency": max_concurrency,
+        }
+        self.launches = []
+        self.identifying = set()
+        self.overlaps = []
+        self.launched = []
+
+        async def get_bot_gateway(**_):
+            return 6, "wss://gateway.invalid", self.limit
+
+        self.http.get_bot_gateway = get_bot_gateway
+
+    async def launch_shard(self, gateway, shard_id, *, initial=False, session=None):
+        # what DiscordWebSocket.from_client does before IDENTIFY
+        self.launches.append((shard_id, initial))
+        await self._connection.call_hooks("before_identify", shard_id, initial=initial)
+
+    async def before_identify_hook(self, shard_id, *, initial=False):
+        self.overlaps.append(sorted(self.identifying))
+        self.identifying.add(shard_id)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        self.identifying.discard(shard_id)
+
+    async def on_shard_launch(self, shard_id, launched, total):
+        self.launched.append((shard_id, launched, total))
+
+
+def run(client):
+    async def main():
+        await client.launch_shards()
+        await asyncio.sleep(0)
+
+    try:
+        client.loop.run_until_complete(main())
+    finally:
+        client.loop.close()
+
+
+def test_shards_launch_in_buckets():
+    client = RecordingClient(max_concurrency=2)
+    run(client)
+
+    assert sorted(client.launches) == [
+        (0, True),
+        (1, True),
+        (2, False),
+        (3, False),
+        (4, False),
+        (5, False),
+    ]
+    # shards of a bucket launch in order, one at a time
+    for bucket in (0, 1):
+        order = [shard_id for shard_id, _ in client.launches if shard_id % 2 == bucket]
+        assert order == sorted(order)
+    # the hook runs for both buckets at the same time, but never twice for one bucket
+    assert any(client.overlaps)
+    assert all(len(identifying) <= 1 for identifying in client.overlaps)
+    assert all(
+        shard_id % 2 != other % 2
+        for (shard_id, _), identifying in zip(client.launches, client.overlaps)
+        for other in identifying
+    )
+
+    assert sorted(shard_id for shard_id, _, _ in client.launched) == list(range(6))
+    assert [launched for _, launched, _ in client.launched] == list(range(1, 7))
+    assert {total for _, _, total in client.launched} == {6}
+    assert client._connection.shards_launched.is_set()
+
+
+def test_one_bucket_launches_sequentially():
+    client = RecordingClient(max_concurrency=1, shard_ids=[4, 1, 3], shard_count=6)
+    run(client)
+
+    assert client.launches == [(4, True), (1, False), (3, False)]
+    assert not any(client.overlaps)
+    assert client.shard_count == 6
+
+
+def test_few_session_starts_left(caplog):
+    client = RecordingClient(max_concurrency=1, remaining=2)
+    with caplog.at_level(logging.WARNING, logger="nextcord.shard"):
+        run(client)
+
+    assert "Only 2 of 1000 session starts remain" in caplog.text
+    assert len(client.launches) == 6
@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import nextcord
+
+GUILD_ID = 1 << 32
+
+
+def user(user_id):
+    return {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "avatar": None}
+
+
+def guild_payload():
+    return {
+        "id": str(GUILD_ID),
+        "name": "guild",
+        "member_count": 3,
+        "owner_id": "10",
+        "roles": [
+            {
+                "id": str(GUILD_ID + 1),
+                "name": "mod",
+                "permissions": "8",
+                "position": 1,
+                "color": 0,
+                "hoist": False,
+                "managed": False,
+                "mentionable": False,
+            }
+        ],
+        "channels": [
+            {
+                "id": str(GUILD_ID + 2),
+                "type": 0,
+                "name": "general",
+                "position": 0,
+                "permission_overwrites": [],
+            }
+        ],
+        "members": [
+            {
+                "user": user(10 + i),
+                "roles": [str(GUILD_ID + 1)] if i == 0 else [],
+                "joined_at": "2023-05-01T12:00:00+00:00",
+                "nick": None,
+                "deaf": False,
+                "mute": False,
+                "flags": 0,
+            }
+            for i in range(3)
+        ],
+        "presences": [],
+    }
+
+
+def new_client(**options):
+    client = nextcord.Client(intents=nextcord.Intents.all(), **options)
+    client._connection.dispatch = lambda *_: None
+    return client
+
+
+def test_snapshot_round_trip(tmp_path):
+    async def main():
+        path = str(tmp_path / "cache.snapshot")
+        client = new_client()
+        client._connection._add_guild_from_data(guild_payload())
+        assert await client.save_cache_snapshot(path) > 0
+
+        restored = new_client(cache_backends={"users": nextcord.LRUBackend(1)})
+        assert await restored.load_cache_snapshot(path)
+        guild = restored.get_guild(GUILD_ID)
+        assert guild is not None
+        assert [member.id for member in guild.members] == [10, 11, 12]
+        assert [member.id for member in guild.get_role(GUILD_ID + 1).members] == [10]
+        assert guild.get_channel(GUILD_ID + 2).name == "general"
+        # the users of cached members are kept regardless of the size of the users cache
+        assert all(restored.get_user(member.id) is member._user for member in guild.members)
+
+    asyncio.run(main())
+
+
+def test_missing_snapshot(tmp_path):
+    async def main():
+        client = new_client()
+        assert not await client.load_cache_snapshot(str(tmp_path / "missing"))
+
+    asyncio.run(main())
+
+
+def test_users_that_are_not_cached_stay_uncached(tmp_path):
+    async def main():
+        path = str(tmp_path / "cache.snapshot")
+        client = new_client()
+        data = guild_payload()
+        data["members"][2]["user"]["discriminator"] = "0000"
+        client._connection._add_guild_from_data(data)
+        assert client.get_user(12) is None
+        await client.save_cache_snapshot(path)
+
+        restored = new_client()
+        assert await restored.load_cache_snapshot(path)
+        member = restored.get_guild(GUILD_ID).get_member(12)
+        assert member is not None
+        assert member._user._stored is False
+        assert restored.get_user(12) is None
+        assert restored.get_user(11) is not None
+
+    asyncio.run(main())
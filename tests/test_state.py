@@ -0,0 +1,464 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import logging
+import time
+
+import pytest
+
+import nextcord
+from nextcord.gateway import DiscordWebSocket, GatewayRatelimiter
+from nextcord.member import Member
+from nextcord.state import PARSE_SLICE_THRESHOLD, ChunkScheduler, MemberBatcher
+
+
+@pytest.fixture()
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def make_client(loop, **options):
+    client = nextcord.Client(
+        intents=nextcord.Intents.all(), chunk_guilds_at_startup=False, loop=loop, **options
+    )
+    # a fraction of a microsecond, so that the parse yields after every batch
+    client._connection._parse_slice_budget = 1e-9
+    client.dispatched = dispatched = []
+    client._connection.dispatch = lambda event, *args: dispatched.append((event, *args))
+    return client
+
+
+def make_ws(client):
+    ws = DiscordWebSocket(None, loop=client.loop)  # type: ignore
+    ws._connection = client._connection
+    ws.shard_id = None
+    ws._discord_parsers = client._connection.parsers
+    return ws
+
+
+def user(user_id):
+    return {"id": str(user_id), "username": f"user {user_id}", "discriminator": "0", "avatar": None}
+
+
+def guild_create(guild_id, member_count):
+    members = [
+        {"user": user(user_id), "roles": [], "joined_at": None, "deaf": False, "mute": False}
+        for user_id in range(1, member_count + 1)
+    ]
+    presences = [
+        {"user": {"id": str(user_id)}, "status": "idle", "activities": [], "client_status": {}}
+        for user_id in range(1, member_count + 1, 2)
+    ]
+    data = {
+        "id": str(guild_id),
+        "name": f"guild {guild_id}",
+        "owner_id": "1",
+        "roles": [{"id": str(guild_id), "name": "@everyone", "permissions": "0", "position": 0}],
+        "member_count": member_count,
+        "members": members,
+        "presences": presences,
+    }
+    payload = {"t": "GUILD_CREATE", "s": guild_id, "op": 0, "d": data}
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def test_large_guild_create_is_parsed_in_slices(loop):
+    client = make_client(loop)
+    ws = make_ws(client)
+    sizes = []
+
+    async def watch():
+        # runs between the slices of the parse
+        while not client.dispatched:
+            guild = client.get_guild(100)
+            sizes.append(0 if guild is None else len(guild._members))
+            await asyncio.sleep(0)
+
+    async def main():
+        watcher = asyncio.create_task(watch())
+        await ws.received_message(guild_create(100, PARSE_SLICE_THRESHOLD * 2))
+        await watcher
+
+    loop.run_until_complete(main())
+
+    # the members were added over many iterations of the loop
+    partial = [size for size in sizes if 0 < size < PARSE_SLICE_THRESHOLD * 2]
+    assert len(partial) > 1
+    assert partial == sorted(partial)
+
+
+def test_guild_join_waits_for_the_last_slice(loop):
+    client = make_client(loop)
+    ws = make_ws(client)
+
+    async def main():
+        await ws.received_message(guild_create(100, PARSE_SLICE_THRESHOLD * 2))
+        assert client._connection._parse_task is None
+
+    loop.run_until_complete(main())
+
+    assert [event for event, *_ in client.dispatched] == ["guild_join"]
+    guild = client.dispatched[0][1]
+    assert len(guild._members) == PARSE_SLICE_THRESHOLD * 2
+    # presences were applied after every member was added
+    assert guild.get_member(1).status is nextcord.Status.idle
+    assert guild.get_member(PARSE_SLICE_THRESHOLD * 2 - 1).status is nextcord.Status.idle
+    assert guild.get_member(2).status is nextcord.Status.offline
+
+
+def test_events_after_a_sliced_guild_create_keep_their_order(loop):
+    client = make_client(loop)
+    ws = make_ws(client)
+
+    async def main():
+        # as the gateway reads them, one frame after the other
+        for data in (guild_create(100, PARSE_SLICE_THRESHOLD * 2), guild_create(200, 2)):
+            await ws.received_message(data)
+
+    loop.run_until_complete(main())
+
+    assert [(event, guild.id) for event, guild in client.dispatched] == [
+        ("guild_join", 100),
+        ("guild_join", 200),
+    ]
+
+
+def test_sliced_and_regular_guild_create_build_the_same_guild(loop):
+    sliced = make_client(loop)
+    regular = make_client(loop)
+    regular._connection._parse_slice_budget = None
+
+    async def main():
+        data = guild_create(100, PARSE_SLICE_THRESHOLD * 2)
+        await make_ws(sliced).received_message(data)
+        await make_ws(regular).received_message(data)
+
+    loop.run_until_complete(main())
+
+    def members(client):
+        guild = client.get_guild(100)
+        return [(member.id, member.name, member.status) for member in guild.members]
+
+    assert members(sliced) == members(regular)
+
+
+class FakeWebSocket:
+    def __init__(self, state):
+        self.state = state
+        self._rate_limiter = GatewayRatelimiter()
+        self.requested = []
+        self.user_ids = []
+        self.error = None
+
+    async def request_chunks(
+        self, guild_id, query=None, *, limit, user_ids=None, presences=False, nonce=None
+    ):
+        if self.error is not None:
+            raise self.error
+        self.requested.append((guild_id, nonce))
+        self.user_ids.append(user_ids)
+
+    def reset(self):
+        self.requested.clear()
+        self.user_ids.clear()
+
+    def answer(self, guild_id):
+        # the last chunk of the members of a requested guild
+        nonce = dict(self.requested)[guild_id]
+        self.state.process_chunk_requests(guild_id, nonce, [], True)
+
+
+def add_guilds(client, *guild_ids):
+    state = client._connection
+    # a member count without members, so that the guilds are not chunked
+    return [
+        state._add_guild_from_data({"id": str(guild_id), "name": "guild", "member_count": 10})
+        for guild_id in guild_ids
+    ]
+
+
+@pytest.fixture()
+def scheduling(loop):
+    client = make_client(loop)
+    client.ws = FakeWebSocket(client._connection)
+    return client
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def requested(client):
+    return [guild_id for guild_id, _ in client.ws.requested]
+
+
+def test_chunk_requests_are_capped_in_flight(loop, scheduling):
+    scheduler = ChunkScheduler(scheduling._connection, max_in_flight=2)
+    guilds = add_guilds(scheduling, 1, 2, 3, 4)
+
+    async def main():
+        futures = [scheduler.schedule(guild) for guild in guilds]
+        await settle()
+        assert requested(scheduling) == [1, 2]
+        assert scheduler.stats()["shards"][0]["in_flight"] == 2
+
+        # a completed request hands its slot to the next guild
+        scheduling.ws.answer(2)
+        await settle()
+        assert requested(scheduling) == [1, 2, 3]
+        assert futures[1].result() is True
+        assert not futures[0].done()
+
+        for guild_id in (1, 3):
+            scheduling.ws.answer(guild_id)
+        await settle()
+        scheduling.ws.answer(4)
+        assert await asyncio.gather(*futures) == [True] * 4
+        assert scheduler.stats() == {
+            "scheduled": 0,
+            "shards": {0: {"pending": 0, "in_flight": 0, "chunked": 4, "members": 0}},
+        }
+
+    loop.run_until_complete(main())
+
+
+def test_chunk_requests_wait_for_the_send_budget(loop, scheduling):
+    scheduler = ChunkScheduler(scheduling._connection, reserve=5)
+    limiter = scheduling.ws._rate_limiter
+    # the reserve is all that is left, until the window ends
+    limiter.per = 0.3
+    limiter.window = time.time()
+    limiter.remaining = 5
+    (guild,) = add_guilds(scheduling, 1)
+
+    async def main():
+        scheduler.schedule(guild)
+        await asyncio.sleep(0.1)
+        assert limiter.available() == 5
+        assert requested(scheduling) == []
+
+        await asyncio.sleep(limiter.reset_after() + 0.2)
+        assert limiter.available() == limiter.max
+        assert requested(scheduling) == [1]
+        scheduler.clear()
+
+    loop.run_until_complete(main())
+
+
+def test_touched_guilds_are_requested_first(loop, scheduling):
+    scheduler = ChunkScheduler(scheduling._connection, max_in_flight=1)
+    first, second, third = add_guilds(scheduling, 1, 2, 3)
+
+    async def main():
+        for guild in (first, second, third):
+            scheduler.schedule(guild)
+        await settle()
+        scheduler.touch(third)
+        # a guild that was already requested is not requested again
+        scheduler.touch(first)
+
+        for guild_id in (1, 3, 2):
+            scheduling.ws.answer(guild_id)
+            await settle()
+
+    loop.run_until_complete(main())
+
+    assert requested(scheduling) == [1, 3, 2]
+
+
+def test_chunk_requests_time_out_per_guild(loop, scheduling, caplog):
+    scheduler = ChunkScheduler(scheduling._connection, max_in_flight=1, timeout=0.05)
+    slow, fast = add_guilds(scheduling, 1, 2)
+
+    async def main():
+        futures = [scheduler.schedule(slow), scheduler.schedule(fast)]
+        assert await futures[0] is False
+        await settle()
+        # the slot of the guild that timed out is used by the next one
+        scheduling.ws.answer(2)
+        assert await futures[1] is True
+
+    with caplog.at_level(logging.WARNING, logger="nextcord.state"):
+        loop.run_until_complete(main())
+
+    assert requested(scheduling) == [1, 2]
+    assert "timed out waiting for chunks for guild_id 1" in caplog.text
+
+
+def test_chunk_progress_is_dispatched(loop, scheduling):
+    scheduler = ChunkScheduler(scheduling._connection, progress_interval=60.0)
+    guilds = add_guilds(scheduling, 1, 2, 3)
+
+    async def main():
+        futures = [scheduler.schedule(guild) for guild in guilds]
+        await settle()
+        for guild_id in (1, 2, 3):
+            scheduling.ws.answer(guild_id)
+        await asyncio.gather(*futures)
+
+    loop.run_until_complete(main())
+
+    # within the interval, only the last guild of the shard is reported
+    progress = [args for event, *args in scheduling.dispatched if event == "chunk_progress"]
+    assert len(progress) == 1
+    shard_id, chunked, remaining, rate = progress[0]
+    assert (shard_id, chunked, remaining) == (0, 3, 0)
+    assert rate == 0.0
+
+
+def test_clearing_the_chunk_scheduler_resolves_its_futures(loop, scheduling):
+    scheduler = ChunkScheduler(scheduling._connection, max_in_flight=1)
+    guilds = add_guilds(scheduling, 1, 2)
+
+    async def main():
+        futures = [scheduler.schedule(guild) for guild in guilds]
+        await settle()
+        scheduler.clear()
+        assert [future.result() for future in futures] == [False, False]
+        assert not scheduler.is_scheduled(1)
+        await settle()
+        # the worker and the request in flight were cancelled
+        assert requested(scheduling) == [1]
+        assert scheduler.stats() == {"scheduled": 0, "shards": {}}
+
+    loop.run_until_complete(main())
+
+
+def member_data(user_id):
+    return {"user": user(user_id), "roles": [], "joined_at": None, "deaf": False, "mute": False}
+
+
+def answer_lookups(client, *, missing=()):
+    # answers every request with the members that were asked for, but the missing ones
+    state = client._connection
+    for (guild_id, nonce), user_ids in zip(client.ws.requested, client.ws.user_ids):
+        guild = client.get_guild(guild_id)
+        members = [
+            Member(data=member_data(user_id), guild=guild, state=state)
+            for user_id in user_ids
+            if user_id not in missing
+        ]
+        state.process_chunk_requests(guild_id, nonce, members, True)
+
+
+def ids(members):
+    return [member.id for member in members]
+
+
+def test_member_lookups_in_a_window_are_merged(loop, scheduling):
+    batcher = MemberBatcher(scheduling._connection, window=0.05)
+    add_guilds(scheduling, 1)
+
+    async def main():
+        lookups = [
+            asyncio.create_task(batcher.query(1, user_ids, cache=False))
+            for user_ids in ([10, 11], [11, 12], [13])
+        ]
+        await settle()
+        assert scheduling.ws.requested == []
+        assert batcher.stats() == {"batches": 1, "waiting": 3, "missing": 0}
+
+        await asyncio.sleep(0.1)
+        assert scheduling.ws.user_ids == [[10, 11, 12, 13]]
+        answer_lookups(scheduling, missing={12})
+        return [ids(members) for members in await asyncio.gather(*lookups)]
+
+    # each lookup gets the members it asked for
+    assert loop.run_until_complete(main()) == [[10, 11], [11], [13]]
+
+
+def test_member_lookups_are_sent_in_requests_of_100(loop, scheduling):
+    batcher = MemberBatcher(scheduling._connection, window=60.0)
+    add_guilds(scheduling, 1)
+
+    async def main():
+        lookups = [
+            asyncio.create_task(batcher.query(1, user_ids, cache=False))
+            for user_ids in ([1, 2], list(range(2, 150)), [5])
+        ]
+        await settle()
+        # sent as soon as 100 IDs were waiting, without waiting for the window
+        assert [len(user_ids) for user_ids in scheduling.ws.user_ids] == [100, 49]
+        assert [user_id for chunk in scheduling.ws.user_ids for user_id in chunk] == list(
+            range(1, 150)
+        )
+        answer_lookups(scheduling)
+        results = await asyncio.gather(*lookups[:2])
+        assert [ids(members) for members in results] == [[1, 2], list(range(2, 150))]
+
+        # the lookup after the flush starts a new batch
+        assert batcher.stats()["waiting"] == 1
+        lookups[2].cancel()
+
+    loop.run_until_complete(main())
+
+
+def test_missing_members_are_not_requested_again(loop, scheduling):
+    batcher = MemberBatcher(scheduling._connection, window=0.0, ttl=0.2)
+    scheduling._connection._member_batcher = batcher
+    (guild,) = add_guilds(scheduling, 1)
+
+    async def lookup(user_ids):
+        task = asyncio.create_task(batcher.query(1, user_ids, cache=False))
+        await settle()
+        answer_lookups(scheduling, missing={2, 3})
+        scheduling.ws.reset()
+        return ids(await task)
+
+    async def main():
+        assert await lookup([1, 2, 3]) == [1]
+        assert batcher.stats()["missing"] == 2
+
+        # remembered as missing, so there is nothing to request
+        assert await batcher.query(1, [2, 3], cache=False) == []
+        assert scheduling.ws.requested == []
+
+        # a member that joins is no longer missing
+        scheduling._connection.parse_guild_member_add({"guild_id": "1", **member_data(2)})
+        task = asyncio.create_task(batcher.query(1, [2, 3], cache=False))
+        await settle()
+        assert scheduling.ws.user_ids == [[2]]
+        answer_lookups(scheduling)
+        assert ids(await task) == [2]
+        scheduling.ws.reset()
+
+        await asyncio.sleep(0.25)
+        assert await lookup([3]) == []
+        assert batcher.stats()["missing"] == 1
+
+    loop.run_until_complete(main())
+    assert guild.get_member(2) is not None
+
+
+def test_member_lookup_timeouts_reach_every_waiter(loop, scheduling, caplog):
+    state = scheduling._connection
+    batcher = MemberBatcher(state, window=0.0, timeout=0.05)
+    add_guilds(scheduling, 1)
+
+    async def main():
+        lookups = [batcher.query(1, [user_id], cache=False) for user_id in (1, 2)]
+        return await asyncio.gather(*lookups, return_exceptions=True)
+
+    with caplog.at_level(logging.WARNING, logger="nextcord.state"):
+        results = loop.run_until_complete(main())
+
+    assert [type(result) for result in results] == [asyncio.TimeoutError] * 2
+    assert "Timed out waiting for chunks for 2 user IDs" in caplog.text
+    assert state._chunk_requests == {}
+
+
+def test_member_lookup_errors_reach_every_waiter(loop, scheduling):
+    batcher = MemberBatcher(scheduling._connection, window=0.0)
+    add_guilds(scheduling, 1)
+    scheduling.ws.error = error = ConnectionResetError("closed")
+
+    async def main():
+        lookups = [batcher.query(1, [user_id], cache=False) for user_id in (1, 2)]
+        return await asyncio.gather(*lookups, return_exceptions=True)
+
+    assert loop.run_until_complete(main()) == [error, error]
+    assert batcher.stats() == {"batches": 0, "waiting": 0, "missing": 0}
@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+import nextcord
+from nextcord.template import Template
+from nextcord.user import ClientUser
+
+TEMPLATE = {
+    "code": "abc",
+    "usage_count": 0,
+    "name": "template",
+    "description": None,
+    "creator_id": "1",
+    "creator": {"id": "1", "username": "creator", "discriminator": "0", "avatar": None},
+    "created_at": "2020-01-01T00:00:00+00:00",
+    "updated_at": "2020-01-01T00:00:00+00:00",
+    "source_guild_id": "5",
+    "is_dirty": None,
+    "serialized_source_guild": {
+        "name": "guild",
+        "description": None,
+        "region": "us-west",
+        "verification_level": 0,
+        "default_message_notifications": 0,
+        "explicit_content_filter": 0,
+        "preferred_locale": "en-US",
+        "afk_timeout": 60,
+        "roles": [
+            {
+                "id": 0,
+                "name": "@everyone",
+                "permissions": "0",
+                "color": 0,
+                "hoist": False,
+                "mentionable": False,
+            }
+        ],
+        "channels": [
+            {
+                "id": 1,
+                "name": "general",
+                "type": 0,
+                "position": 0,
+                "permission_overwrites": [],
+                "parent_id": None,
+                "nsfw": False,
+                "rate_limit_per_user": 0,
+            }
+        ],
+        "afk_channel_id": None,
+        "system_channel_id": None,
+        "system_channel_flags": 0,
+        "icon_hash": None,
+    },
+}
+
+
+@pytest.fixture()
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def make_state(loop, **options):
+    state = nextcord.Client(loop=loop, **options)._connection
+    state.user = ClientUser(
+        state=state, data={"id": "2", "username": "bot", "discriminator": "0", "avatar": None}
+    )
+    return state
+
+
+def test_template_builds_source_guild(loop):
+    template = Template(state=make_state(loop), data=TEMPLATE)
+
+    guild = template.source_guild
+    assert guild.id == 5
+    assert guild.name == "guild"
+    assert [channel.name for channel in guild.channels] == ["general"]
+
+
+def test_template_with_bounded_caches(loop):
+    state = make_state(
+        loop, cache_backends={"users": nextcord.LRUBackend(10), "channels": nextcord.LRUBackend(10)}
+    )
+    template = Template(state=state, data=TEMPLATE)
+
+    # the source guild is not cached, so its caches do not use the backends of the client
+    assert type(template.source_guild._channels) is dict
+    assert len(template.source_guild.channels) == 1
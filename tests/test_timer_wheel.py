@@ -0,0 +1,76 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+import random
+import time
+
+from nextcord.utils import TimerWheel
+
+
+def test_timers_fire_in_time():
+    async def main():
+        random.seed(0)
+        # a small wheel, so that timers are cascaded and parked beyond its reach
+        wheel = TimerWheel(resolution=0.01, slots=4, levels=2)
+        start = time.monotonic()
+        deadlines = {}
+        fired = {}
+        for key in range(200):
+            deadlines[key] = start + random.uniform(0, 0.6)
+            wheel.schedule(
+                key, deadlines[key], lambda key=key: fired.setdefault(key, time.monotonic())
+            )
+
+        await asyncio.sleep(0.7)
+        assert fired.keys() == deadlines.keys()
+        assert all(fired[key] >= deadlines[key] for key in fired)
+        assert max(fired[key] - deadlines[key] for key in fired) < 0.1
+        assert not wheel
+        assert wheel._handle is None
+
+    asyncio.run(main())
+
+
+def test_reschedule_and_cancel():
+    async def main():
+        wheel = TimerWheel(resolution=0.01)
+        fired = []
+        now = time.monotonic()
+        wheel.schedule("moved", now + 0.02, lambda: fired.append("early"))
+        wheel.schedule("moved", now + 0.05, lambda: fired.append("moved"))
+        wheel.schedule("cancelled", now + 0.02, lambda: fired.append("cancelled"))
+        assert len(wheel) == 2
+        assert wheel.cancel("cancelled")
+        assert not wheel.cancel("cancelled")
+        assert "cancelled" not in wheel
+
+        await asyncio.sleep(0.03)
+        assert fired == []
+        await asyncio.sleep(0.05)
+        assert fired == ["moved"]
+
+    asyncio.run(main())
+
+
+def test_callbacks_can_change_the_wheel(caplog):
+    async def main():
+        wheel = TimerWheel(resolution=0.01)
+        fired = []
+        now = time.monotonic()
+
+        def first():
+            fired.append("first")
+            # due in the same tick, cancelled before it runs
+            wheel.cancel("second")
+            wheel.schedule("third", now, lambda: fired.append("third"))
+            raise RuntimeError("ignored")
+
+        wheel.schedule("first", now, first)
+        wheel.schedule("second", now, lambda: fired.append("second"))
+        await asyncio.sleep(0.05)
+        assert fired == ["first", "third"]
+
+    with caplog.at_level(logging.ERROR, logger="nextcord.utils"):
+        asyncio.run(main())
+    assert "Ignoring exception in timer callback" in caplog.text
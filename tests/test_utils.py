@@ -0,0 +1,45 @@
+# SPDX-License-Identifier: MIT
+
+import datetime
+
+from nextcord import utils
+
+
+class Event:
+    __slots__ = ("_start_time", "decodes")
+
+    def __init__(self, start_time):
+        self._start_time = start_time
+        self.decodes = 0
+
+    @utils.lazy_slot_property("_start_time")
+    def start_time(self, value):
+        self.decodes += 1
+        return utils.parse_time(value)
+
+
+def test_lazy_slot_property_decodes_once():
+    event = Event("2023-05-01T12:00:00+00:00")
+    assert event.decodes == 0
+
+    expected = datetime.datetime(2023, 5, 1, 12, tzinfo=datetime.timezone.utc)
+    assert event.start_time == expected
+    assert event.start_time == expected
+    assert event.decodes == 1
+    assert event._start_time == expected
+
+
+def test_lazy_slot_property_assignment():
+    event = Event(None)
+    assert event.start_time is None
+    assert event.decodes == 0
+
+    now = utils.utcnow()
+    event.start_time = now
+    assert event.start_time is now
+    assert event.decodes == 0
+
+    # raw values can be assigned too, and are decoded when read
+    event.start_time = "2023-05-01T12:00:00+00:00"
+    assert event.start_time.year == 2023
+    assert event.decodes == 1
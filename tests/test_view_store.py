@@ -0,0 +1,40 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from nextcord.ui import Button, View
+from nextcord.ui.view import ViewStore
+from nextcord.utils import TimerWheel
+
+
+class State:
+    def __init__(self):
+        self._timer_wheel = TimerWheel()
+
+
+def make_view():
+    view = View(timeout=None)
+    view.add_item(Button(custom_id="button"))
+    return view
+
+
+def test_remove_view_untracks_one_message():
+    async def main():
+        store = ViewStore(State())  # type: ignore
+        view = make_view()
+        for message_id in (1, 2, 3):
+            store.add_view(view, message_id)
+
+        store.remove_view(view, 2)
+        assert [store.is_message_tracked(i) for i in (1, 2, 3)] == [True, False, True]
+
+        # without a tracked message, the first message of the view stops being tracked
+        store.remove_view(view)
+        assert [store.is_message_tracked(i) for i in (1, 2, 3)] == [False, False, True]
+        assert store.all_views() == [view]
+
+        store.remove_view(view, 3)
+        store.remove_view(view, 1)
+        assert store.all_views() == []
+
+    asyncio.run(main())